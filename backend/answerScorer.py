@@ -0,0 +1,142 @@
+# backend/answerScorer.py
+# Local heuristic scorer for interview answers, in the same
+# score / feedback / strengths / improvements / hasExamples shape as the LLM.
+#
+# Features: length, overlap with the question's key terms, STAR structure
+# (situation, task, action, result), concrete examples, numbers, named
+# technologies and the share of filler words. It runs in well under a
+# millisecond, so it backs the LLM as a fallback far better than a
+# word-count guess, gives an instant preliminary score (mode "local"), and
+# lets mode "fast" skip the LLM for low-effort answers it can already judge.
+
+import os
+import re
+
+from atsScorer import stem, GENERIC
+from skillExtractor import matcher
+
+WORD    = re.compile(r"[a-z][a-z0-9+#']*")
+NUMBER  = re.compile(r"\d+(\.\d+)?\s*(%|x\b|k\b|ms\b|percent)?|\$\s*\d", re.IGNORECASE)
+FILLERS = re.compile(r"\b(um+|uh+|erm|like|basically|actually|literally|you know|kind of|sort of|i mean|"
+                     r"i guess|stuff|things|whatever)\b")
+NO_IDEA = re.compile(r"\b(i don'?t know|no idea|not sure|i have no experience|never (used|done|worked))\b")
+
+STAR = {
+    "situation": re.compile(r"\b(at my (last|previous|current)|in my (last|previous|current) (role|job|team)|"
+                            r"when i was|we were|we had|the situation|the context|the project|once,? )"),
+    "task":      re.compile(r"\b(my (task|goal|role|job|responsibility) was|i was (responsible|asked|tasked)|"
+                            r"needed to|had to|the goal was|the challenge was)\b"),
+    "action":    re.compile(r"\bi (built|implemented|designed|wrote|created|led|decided|introduced|set up|"
+                            r"proposed|refactored|migrated|organi[sz]ed|analy[sz]ed|talked|worked|added|used|"
+                            r"started|changed|automated|reduced|fixed)\b"),
+    "result":    re.compile(r"\b(as a result|resulted in|result was|which (led|meant|cut|reduced|improved)|"
+                            r"reduced|increased|improved|saved|cut|outcome|in the end|we delivered|we shipped)\b"),
+}
+EXAMPLE = re.compile(r"\b(for example|for instance|such as|in my (last|previous|current)|at my (last|previous)|"
+                     r"one time|once i|when i|i once|in one project)\b")
+
+# full: LLM scores, local scorer is the fallback | fast: low-effort answers skip
+# the LLM | local: never call the LLM (instant preliminary score)
+ANSWER_MODES        = ("full", "fast", "local")
+ANSWER_SCORING_MODE = os.getenv("ANSWER_SCORING_MODE", "full").lower()
+LOW_EFFORT_WORDS    = 20   # below this, or "I don't know" in a short answer, is low effort
+LOCAL_MAX_SCORE     = 9
+
+
+def answer_features(question, answer):
+    text = (answer or "").lower()
+    words = WORD.findall(text)
+    question_terms = {stem(w) for w in WORD.findall((question or "").lower()) if len(w) > 3 and w not in GENERIC}
+    answer_terms = {stem(w) for w in words}
+    return {
+        "words":      len(words),
+        "overlap":    len(question_terms & answer_terms) / len(question_terms) if question_terms else 0.5,
+        "star":       [part for part, pattern in STAR.items() if pattern.search(text)],
+        "example":    bool(EXAMPLE.search(text)),
+        "numbers":    len(NUMBER.findall(answer or "")),
+        "skills":     len({name for _, _, (kind, name, _) in matcher.find(answer or "") if kind == "technical"}),
+        "filler":     len(FILLERS.findall(text)) / len(words) if words else 0.0,
+        "no_idea":    bool(NO_IDEA.search(text)),
+    }
+
+
+def is_low_effort(answer):
+    """Too short, or a short "I don't know": the local score is as good as the LLM's"""
+    text = (answer or "").lower()
+    words = len(WORD.findall(text))
+    return words < LOW_EFFORT_WORDS or (words < 60 and bool(NO_IDEA.search(text)))
+
+
+def answer_mode(mode):
+    """Requested scoring mode, or ANSWER_SCORING_MODE when missing or unknown"""
+    mode = (mode or "").lower()
+    return mode if mode in ANSWER_MODES else ANSWER_SCORING_MODE
+
+
+def skips_llm(answer, mode):
+    return mode == "local" or (mode == "fast" and is_low_effort(answer))
+
+
+def score_answer_local(question, answer, round_num=None):
+    """Answer score dict in the LLM's shape, from text features alone"""
+    f = answer_features(question, answer)
+    hr = round_num not in (1, 2)
+    words = f["words"]
+
+    if words < 10:
+        length = 1.0
+    elif words < 30:
+        length = 2.5
+    elif words < 80:
+        length = 3.5
+    elif words < 150:
+        length = 4.5
+    else:
+        length = 5.0
+    relevance = 2.0 * min(f["overlap"] / 0.6, 1.0)
+    # HR answers are judged on STAR; technical ones also on concrete technologies
+    structure = (2.0 if hr else 1.0) * len(f["star"]) / 4
+    specifics = 0.75 * f["example"] + 0.75 * min(f["numbers"], 1) + (0 if hr else 0.5 * min(f["skills"], 2))
+    filler = 2.0 if f["filler"] > 0.1 else 1.0 if f["filler"] > 0.05 else 0.0
+
+    score = length + relevance + structure + specifics - filler
+    if f["no_idea"]:
+        score = min(score, 3)
+    # Only the LLM can tell whether the content is right, so 10 is left to it
+    score = max(0, min(LOCAL_MAX_SCORE, round(score)))
+
+    strengths, improvements, feedback = [], [], []
+    if f["overlap"] >= 0.5:
+        strengths.append("Addresses what the question asks")
+    else:
+        improvements.append("Answer the question directly before adding context")
+    if len(f["star"]) >= 3:
+        strengths.append("Clear situation, action and result structure")
+    elif hr:
+        missing = [p for p in STAR if p not in f["star"]]
+        improvements.append(f"Use the STAR method; the {', '.join(missing)} part{'s are' if len(missing) > 1 else ' is'} missing")
+    if f["example"] or f["numbers"]:
+        strengths.append("Backs the answer with a concrete example" + (" and numbers" if f["numbers"] else ""))
+    else:
+        improvements.append("Add a concrete example and quantify the result")
+    if not hr and f["skills"]:
+        strengths.append("Names specific technologies")
+    if f["filler"] > 0.05:
+        improvements.append("Cut filler words (like, basically, you know)")
+    if words < 30:
+        improvements.append("Expand the answer; it is too short to show depth")
+
+    feedback.append(f"{words} words, {len(f['star'])}/4 STAR elements, "
+                    f"{'with' if f['example'] or f['numbers'] else 'no'} concrete examples.")
+    if f["no_idea"]:
+        feedback.append("The answer says you don't know; explain how you would find out or reason it through.")
+    feedback.append("Scored locally from answer structure and content.")
+
+    return {
+        "score":        score,
+        "feedback":     feedback[:3],
+        "strengths":    (strengths or ["Attempted the question"])[:3],
+        "improvements": (improvements or ["Go one level deeper on trade-offs"])[:3],
+        "hasExamples":  bool(f["example"] or f["numbers"]),
+        "scoredBy":     "local",
+    }
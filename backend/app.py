@@ -1,28 +1,52 @@
 # backend/app.py - PRODUCTION READY (for Render)
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, g
 from flask_cors import CORS
 import json
-import re
-import traceback
+import asyncio
+import time
+import io
 import os
-from werkzeug.utils import secure_filename
-
-from huggingfaceService import extract_skills, generate_questions, call_huggingface, extract_json_from_text
+from werkzeug.wrappers import Request
+
+from huggingfaceService import stream_questions_async, hedge_stats as hf_hedge_stats
+from llmRouter import (
+    router, extract_skills_async, generate_questions_async, call_llm_async, call_llm_json_async
+)
+from geminiService import pool_stats as gemini_pool_stats
+from responseCache import response_cache
+from asyncRuntime import run_sync, iterate_sync
+from jobs import job_store, JobError
+from rateLimiter import RateLimitExceeded
+from jsonRepair import strip_text_fences
+from skillExtractor import skill_stats
+from questionBank import question_bank
+from resumeCache import resume_cache, read_resume
+from resumeSections import fit_resume
+from atsScorer import score_resume, LOCAL_ATS
+from answerScorer import score_answer_local, answer_mode, skips_llm
+from metrics import METRICS, CONTENT_TYPE, render as render_metrics, request_seconds, stage_seconds
+from logger import get_logger, start_request, request_id
+from promptBudget import (
+    fit, fit_fields, compact, allocate, estimate_tokens, input_budget, output_budget, JD_FOCUS
+)
 
 app = Flask(__name__)
+log = get_logger("app")
+
+CORS_ORIGINS = [
+    "https://prep-mate-ai-eight.vercel.app",
+    "https://*.vercel.app",
+    "http://localhost:3000",
+    "http://localhost:5173",
+    "http://localhost:5000",
+    "http://127.0.0.1:3000",
+    "http://127.0.0.1:5173",
+    "http://127.0.0.1:5000",
+]
 
 CORS(app, resources={
     r"/api/*": {
-        "origins": [
-            "https://prep-mate-ai-eight.vercel.app",
-            "https://*.vercel.app",
-            "http://localhost:3000",
-            "http://localhost:5173",
-            "http://localhost:5000",
-            "http://127.0.0.1:3000",
-            "http://127.0.0.1:5173",
-            "http://127.0.0.1:5000",
-        ],
+        "origins": CORS_ORIGINS,
         "methods": ["GET", "POST", "OPTIONS"],
         "allow_headers": ["Content-Type", "Authorization"],
         "supports_credentials": True,
@@ -30,14 +54,9 @@ CORS(app, resources={
     }
 })
 
-UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx', 'txt'}
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 
-if not os.path.exists(UPLOAD_FOLDER):
-    os.makedirs(UPLOAD_FOLDER)
-
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
 
 
@@ -54,138 +73,102 @@ def handle_preflight():
         return response, 200
 
 
+# ─── Metrics / Request IDs ────────────────────────────────────────────────────
+#
+#  Request latency per route for everything Flask serves (asgi.py times the
+#  routes it awaits itself). GET /metrics exposes all series from metrics.py.
+#  Every log record of a request carries its ID, echoed as X-Request-ID.
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    start_request(request.headers.get("X-Request-ID"))
+
+
+@app.after_request
+def record_request_latency(response):
+    start = g.get("request_start")
+    if start is not None:
+        route  = request.url_rule.rule if request.url_rule else "unmatched"
+        labels = (route, request.method, str(response.status_code))
+        if response.is_streamed:
+            # SSE: the body is still being generated, so time until the server closes it
+            response.call_on_close(lambda: request_seconds.observe(time.perf_counter() - start, *labels))
+        else:
+            request_seconds.observe(time.perf_counter() - start, *labels)
+        response.headers["X-Request-ID"] = request_id.get()
+    return response
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    if not METRICS:
+        return jsonify({"error": "Metrics are disabled"}), 404
+    return Response(render_metrics(), content_type=CONTENT_TYPE)
+
+
 # ─── Utilities ────────────────────────────────────────────────────────────────
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
-def clean_json_response(text):
-    text = re.sub(r'```json\s*', '', text)
-    text = re.sub(r'```\s*', '', text)
-    return text.strip()
+def respond(handler, background=False):
+    """Run an async route handler on the LLM event loop and jsonify its (body, status)"""
+    req = request._get_current_object()
+    if background and wants_job(req):
+        body, status = submit_route_job(handler, req)
+    else:
+        body, status = run_sync(handler(req))
+    return jsonify(body), status
 
 
-def repair_json(text):
-    """
-    Best-effort repair of truncated/malformed JSON.
-    1. Strip fences + leading prose.
-    2. Direct parse.
-    3. Extract outermost balanced { }.
-    4. Trim lines from bottom until parseable.
-    Returns None if all attempts fail.
-    """
-    text = re.sub(r'```json\s*', '', text)
-    text = re.sub(r'```\s*', '', text)
-    text = text.strip()
+# ─── Background Jobs ──────────────────────────────────────────────────────────
+#
+#  ?async=1 on the slow routes returns 202 + a job id at once; the handler runs
+#  in the job pool and the client polls GET /api/jobs/<id>.
 
-    brace_pos = text.find('{')
-    if brace_pos == -1:
-        return None
-    text = text[brace_pos:]
+def wants_job(req):
+    return req.args.get("async") == "1"
 
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        pass
-
-    depth = 0
-    end_pos = -1
-    in_string = False
-    escape_next = False
-    for i, ch in enumerate(text):
-        if escape_next:
-            escape_next = False
-            continue
-        if ch == '\\' and in_string:
-            escape_next = True
-            continue
-        if ch == '"':
-            in_string = not in_string
-            continue
-        if in_string:
-            continue
-        if ch == '{':
-            depth += 1
-        elif ch == '}':
-            depth -= 1
-            if depth == 0:
-                end_pos = i
-                break
 
-    if end_pos != -1:
-        try:
-            return json.loads(text[:end_pos + 1])
-        except json.JSONDecodeError:
-            pass
-
-    lines = text.splitlines()
-    for trim in range(len(lines)):
-        attempt = '\n'.join(lines[:len(lines) - trim]).rstrip().rstrip(',')
-        open_braces   = attempt.count('{') - attempt.count('}')
-        open_brackets = attempt.count('[') - attempt.count(']')
-        attempt += ']' * open_brackets + '}' * open_braces
-        try:
-            return json.loads(attempt)
-        except json.JSONDecodeError:
-            continue
+def detach_request(req):
+    """Copy a request onto an in-memory body so it outlives the HTTP response"""
+    body = req.get_data(cache=True)
+    environ = {k: v for k, v in req.environ.items() if not k.startswith(("werkzeug.", "asgi."))}
+    environ.update({"wsgi.input": io.BytesIO(body), "CONTENT_LENGTH": str(len(body))})
+    detached = Request(environ)
+    detached.max_content_length = req.max_content_length
+    return detached
 
-    return None
 
+async def run_route_job(handler, req):
+    result, status = await handler(req)
+    if status >= 400:
+        raise JobError(result.get("error", "Request failed"), status)
+    return result
 
-def extract_text_from_pdf(file_path):
-    try:
-        import PyPDF2
-        text = ""
-        with open(file_path, 'rb') as f:
-            reader = PyPDF2.PdfReader(f)
-            for page in reader.pages:
-                text += page.extract_text() or ""
-        return text
-    except Exception as e:
-        print(f"PDF extraction error: {e}")
-        return None
 
+def submit_route_job(handler, req):
+    """Queue a route handler as a background job. Returns (body, 202)"""
+    job_id = job_store.submit(run_route_job(handler, detach_request(req)), kind=req.path)
+    return queued_job(req, job_id)
 
-def extract_text_from_docx(file_path):
-    try:
-        import docx
-        doc = docx.Document(file_path)
-        return "\n".join(p.text for p in doc.paragraphs)
-    except Exception as e:
-        print(f"DOCX extraction error: {e}")
-        return None
 
+async def submit_route_job_async(handler, req):
+    """submit_route_job() for the ASGI server's event loop"""
+    job_id = await job_store.submit_async(run_route_job(handler, detach_request(req)), kind=req.path)
+    return queued_job(req, job_id)
 
-def extract_text_from_doc(file_path):
-    try:
-        import docx
-        doc = docx.Document(file_path)
-        text = "\n".join(p.text for p in doc.paragraphs)
-        return text if text.strip() else None
-    except Exception as e:
-        try:
-            with open(file_path, 'rb') as f:
-                return f.read().decode('utf-8', errors='ignore') or None
-        except:
-            return None
-
-
-def extract_resume_text(file_path, filename):
-    ext = filename.rsplit('.', 1)[1].lower()
-    if ext == 'pdf':
-        return extract_text_from_pdf(file_path)
-    elif ext == 'docx':
-        return extract_text_from_docx(file_path)
-    elif ext == 'doc':
-        return extract_text_from_doc(file_path)
-    elif ext == 'txt':
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                return f.read()
-        except Exception as e:
-            print(f"TXT read error: {e}")
-    return None
+
+def queued_job(req, job_id):
+    log.info("⏳ Queued %s as job %s", req.path, job_id)
+    return {"jobId": job_id, "status": "pending", "statusUrl": f"/api/jobs/{job_id}"}, 202
+
+
+def sse_event(event, data):
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
 
 # ─── Root / Health ────────────────────────────────────────────────────────────
@@ -202,7 +185,9 @@ def root():
             "analyze_answer":   "/api/analyze-answer",
             "batch_analyze":    "/api/batch-analyze-answers",
             "analyze_resume":   "/api/analyze-resume",
-            "skill_gap":        "/api/skill-gap"
+            "skill_gap":        "/api/skill-gap",
+            "jobs":             "/api/jobs/<id>",
+            "metrics":          "/metrics"
         }
     }), 200
 
@@ -215,7 +200,15 @@ def health_check():
         "version": "1.0.0",
         "environment": os.getenv('FLASK_ENV', 'development'),
         "frontend": "https://prep-mate-ai-eight.vercel.app",
-        "backend":  "https://prepmate-ai-backend-ckrb.onrender.com"
+        "backend":  "https://prepmate-ai-backend-ckrb.onrender.com",
+        "cache":    response_cache.stats() if response_cache else {"backend": "off"},
+        "jobs":     job_store.stats(),
+        "geminiPool": gemini_pool_stats(),
+        "llm":      router.stats(),
+        "hfHedging": hf_hedge_stats(),
+        "skills":   skill_stats(),
+        "questionBank": question_bank.stats() if question_bank else {"backend": "off"},
+        "resumeCache":  resume_cache.stats() if resume_cache else {"backend": "off"}
     }), 200
 
 
@@ -224,82 +217,199 @@ def health_check():
 #  FIX: Now uses questionsCount, difficulty, focusAreas, and roundName that
 #  CreateInterview.js sends in step 3. These were silently ignored before.
 
+def read_interview_request(data):
+    """Validate a create-interview payload. Returns (params, error message)"""
+    if not data:
+        return None, "No data provided"
+
+    required_fields = ["jobTitle", "jobDescription", "experienceLevel", "interviewType"]
+    missing_fields  = [f for f in required_fields if not data.get(f)]
+    if missing_fields:
+        return None, f"Missing required fields: {', '.join(missing_fields)}"
+
+    return {
+        "job_title":        data["jobTitle"],
+        "job_description":  data["jobDescription"],
+        "experience_level": data["experienceLevel"],
+        "interview_type":   data["interviewType"],
+        # Preferences from CreateInterview step 3
+        "questions_count":  int(data.get("questionsCount", 5)),
+        "difficulty":       data.get("difficulty", "mixed"),   # easy | mixed | hard
+        "focus_areas":      data.get("focusAreas", []),        # list of strings
+        "round_name":       data.get("roundName", "Interview Round"),
+    }, None
+
+
+def enrich_skills(skills, params):
+    """Inject difficulty + focus preferences into the skills context for question generation"""
+    difficulty_instruction = {
+        "easy":  "Ask foundational, entry-level questions only.",
+        "mixed": "Mix of beginner, intermediate, and one advanced question.",
+        "hard":  "Ask senior-level questions: complex system design, edge cases, tradeoffs.",
+    }.get(params["difficulty"], "Mix of beginner, intermediate, and one advanced question.")
+
+    focus_areas = params["focus_areas"]
+    return json.dumps({
+        **skills,
+        "_difficulty":      difficulty_instruction,
+        "_focusAreas":      ", ".join(focus_areas[:6]) if focus_areas else "",
+        "_questionsCount":  params["questions_count"],
+        "_roundName":       params["round_name"],
+    })
+
+
+async def take_banked_questions(skills, params):
+    """(stored questions for this interview, how many to generate: None = the usual full set)"""
+    # SQLite and the BM25 scan block, so they run off the event loop
+    banked = await asyncio.to_thread(question_bank.take, skills, params) if question_bank else []
+    if not banked:
+        # Cold interview: same prompt and budget as without a bank
+        return [], None
+    shortfall = max(params["questions_count"] - len(banked), 0)
+    log.info("📚 %s questions from the bank, generating %s", len(banked), shortfall)
+    return banked, shortfall
+
+
+async def store_questions(questions, params, skills):
+    if question_bank and questions:
+        stored = await asyncio.to_thread(question_bank.add, questions, params, skills)
+        if stored:
+            log.info("📚 Banked %s new questions", stored)
+
+
+def number_questions(questions):
+    for i, q in enumerate(questions, 1):
+        q["id"] = i
+    return questions
+
+
 @app.route("/api/create-interview", methods=["POST"])
 def create_interview():
-    try:
-        print("\n" + "=" * 60)
-        print("📨 CREATE INTERVIEW REQUEST")
-        print("=" * 60)
+    if request.args.get("stream") == "1":
+        events = iterate_sync(stream_create_interview(request.get_json(silent=True)))
+        return Response(
+            (sse_event(event, data) for event, data in events),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    return respond(handle_create_interview, background=True)
 
-        data = request.json
-        if not data:
-            return jsonify({"error": "No data provided"}), 400
 
-        required_fields = ["jobTitle", "jobDescription", "experienceLevel", "interviewType"]
-        missing_fields  = [f for f in required_fields if not data.get(f)]
-        if missing_fields:
-            return jsonify({"error": f"Missing required fields: {', '.join(missing_fields)}"}), 400
+async def handle_create_interview(req):
+    try:
+        log.info("📨 CREATE INTERVIEW REQUEST")
 
-        job_title        = data["jobTitle"]
-        job_description  = data["jobDescription"]
-        experience_level = data["experienceLevel"]
-        interview_type   = data["interviewType"]
+        params, error = read_interview_request(req.json)
+        if error:
+            return {"error": error}, 400
 
-        # Preferences from CreateInterview step 3
-        questions_count = int(data.get("questionsCount", 5))
-        difficulty      = data.get("difficulty", "mixed")   # easy | mixed | hard
-        focus_areas     = data.get("focusAreas", [])        # list of strings
-        round_name      = data.get("roundName", "Interview Round")
+        job_title        = params["job_title"]
+        job_description  = params["job_description"]
+        experience_level = params["experience_level"]
+        interview_type   = params["interview_type"]
+        questions_count  = params["questions_count"]
+        round_name       = params["round_name"]
+
+        log.info("📝 %s | %s | %s", job_title, experience_level, interview_type)
+        log.info("🎯 Difficulty: %s | Questions: %s | Focus: %s", params['difficulty'], questions_count, params['focus_areas'])
 
-        print(f"📝 {job_title} | {experience_level} | {interview_type}")
-        print(f"🎯 Difficulty: {difficulty} | Questions: {questions_count} | Focus: {focus_areas}")
+        job_description = await asyncio.to_thread(fit, job_description, input_budget("extract_skills"), JD_FOCUS)
 
         # Step 1: Extract skills
-        skills_text = extract_skills(job_title, job_description[:2500], experience_level)
-        skills      = repair_json(clean_json_response(skills_text))
-        if not skills:
-            return jsonify({"error": "Failed to extract skills. Please try again."}), 500
-
-        print(f"✅ Skills: {len(skills.get('technicalSkills', []))} tech, "
-              f"{len(skills.get('softSkills', []))} soft")
-
-        # Step 2: Generate questions — inject difficulty + focus into context
-        difficulty_instruction = {
-            "easy":  "Ask foundational, entry-level questions only.",
-            "mixed": "Mix of beginner, intermediate, and one advanced question.",
-            "hard":  "Ask senior-level questions: complex system design, edge cases, tradeoffs.",
-        }.get(difficulty, "Mix of beginner, intermediate, and one advanced question.")
-
-        enriched_skills = json.dumps({
-            **skills,
-            "_difficulty":      difficulty_instruction,
-            "_focusAreas":      ", ".join(focus_areas[:6]) if focus_areas else "",
-            "_questionsCount":  questions_count,
-            "_roundName":       round_name,
-        })
-
-        questions_text = generate_questions(
-            job_title, job_description[:2000], experience_level,
-            interview_type, enriched_skills
-        )
-        questions_data = repair_json(clean_json_response(questions_text))
-        if not questions_data:
-            return jsonify({"error": "Failed to generate questions. Please try again."}), 500
+        phase_start = time.perf_counter()
+        skills = await extract_skills_async(job_title, job_description, experience_level)
+        stage_seconds.observe(time.perf_counter() - phase_start, "create_interview", "skills")
+
+        log.info("✅ Skills: %d tech, %d soft",
+                 len(skills.get('technicalSkills', [])), len(skills.get('softSkills', [])))
+
+        # Step 2: Stored questions first, then generate the rest — inject difficulty + focus into context
+        banked, count = await take_banked_questions(skills, params)
+        generated = []
+        if count != 0:
+            generate_params = params if count is None else {**params, "questions_count": count}
+            phase_start = time.perf_counter()
+            questions_data = await generate_questions_async(
+                job_title, job_description, experience_level,
+                interview_type, enrich_skills(skills, generate_params), count=count
+            )
+            stage_seconds.observe(time.perf_counter() - phase_start, "create_interview", "questions")
+            generated = questions_data.get("questions", [])
+            await store_questions(generated, params, skills)
 
-        questions_list = questions_data.get("questions", [])
         # Trim to requested count
-        questions_list = questions_list[:questions_count]
+        questions_list = (banked + generated)[:questions_count]
+        if banked:
+            number_questions(questions_list)
+
+        if not questions_list:
+            return {"error": "No questions generated. Please try again."}, 500
+
+        log.info("✅ %s questions for %s", len(questions_list), round_name)
+        return {"skills": skills, "questions": questions_list}, 200
+
+    except RateLimitExceeded:
+        raise
+    except Exception as e:
+        log.exception("❌ ERROR: %s", e)
+        return {"error": f"Server error: {str(e)}"}, 500
+
+
+async def stream_create_interview(data):
+    """?stream=1 variant: yields (event, data) pairs for Server-Sent Events.
+
+    Events: "skills" once extracted, "question" for each banked question and
+    then as each generated question object completes in the token stream,
+    then "done" with the full payload, or "error" at any point.
+    """
+    try:
+        log.info("📨 CREATE INTERVIEW REQUEST (stream)")
+
+        params, error = read_interview_request(data)
+        if error:
+            yield "error", {"error": error}
+            return
+
+        job_description = await asyncio.to_thread(fit, params["job_description"], input_budget("extract_skills"),
+                                                   JD_FOCUS)
+        skills = await extract_skills_async(params["job_title"], job_description, params["experience_level"])
+        yield "skills", skills
+
+        banked, count = await take_banked_questions(skills, params)
+        questions_list = number_questions(banked)
+        for question in banked:
+            yield "question", question
+
+        if count != 0:
+            generate_params = params if count is None else {**params, "questions_count": count}
+            questions = stream_questions_async(
+                params["job_title"], job_description, params["experience_level"],
+                params["interview_type"], enrich_skills(skills, generate_params), count=count
+            )
+            try:
+                async for question in questions:
+                    if banked:
+                        question["id"] = len(questions_list) + 1
+                    questions_list.append(question)
+                    yield "question", question
+                    if len(questions_list) >= params["questions_count"]:
+                        break
+            finally:
+                await questions.aclose()
+            await store_questions(questions_list[len(banked):], params, skills)
 
         if not questions_list:
-            return jsonify({"error": "No questions generated. Please try again."}), 500
+            yield "error", {"error": "No questions generated. Please try again."}
+            return
 
-        print(f"✅ {len(questions_list)} questions for {round_name}")
-        return jsonify({"skills": skills, "questions": questions_list}), 200
+        log.info("✅ Streamed %s questions for %s", len(questions_list), params['round_name'])
+        yield "done", {"skills": skills, "questions": questions_list}
 
+    except RateLimitExceeded as e:
+        yield "error", {"error": str(e), "retryAfter": round(e.retry_after, 1)}
     except Exception as e:
-        print(f"\n❌ ERROR: {str(e)}")
-        print(traceback.format_exc())
-        return jsonify({"error": f"Server error: {str(e)}"}), 500
+        log.exception("❌ ERROR: %s", e)
+        yield "error", {"error": f"Server error: {str(e)}"}
 
 
 # ─── Analyze Single Answer ────────────────────────────────────────────────────
@@ -310,11 +420,16 @@ def create_interview():
 
 @app.route("/api/analyze-answer", methods=["POST"])
 def analyze_answer():
-    try:
-        data = request.json
-        if not data:
-            return jsonify({"error": "No data provided"}), 400
+    return respond(handle_analyze_answer)
 
+
+async def handle_analyze_answer(req):
+    # Parsed before the try so the fallback below always has the request data
+    data = req.get_json(silent=True)
+    if not data or not isinstance(data, dict):
+        return {"error": "No data provided"}, 400
+
+    try:
         question  = data.get('question', '')
         answer    = data.get('answer', '')
         round_num = data.get('round')
@@ -323,21 +438,30 @@ def analyze_answer():
 
         # Return zeroed result for skipped answers without hitting the AI
         if answer.strip() == "[Skipped]":
-            return jsonify({
+            return {
                 "score": 0,
                 "feedback": ["Question was skipped."],
                 "strengths": [],
                 "improvements": ["Attempt all questions to receive full AI feedback."],
                 "hasExamples": False
-            }), 200
+            }, 200
+
+        # The local score is computed only when it is the answer (fast/local mode) or the fallback
+        mode = answer_mode(data.get('mode'))
+        if skips_llm(answer, mode):
+            local = await asyncio.to_thread(score_answer_local, question, answer, round_num)
+            log.info("⚡ Answer scored locally (%s mode): %s/10", mode, local['score'])
+            return local, 200
 
         round_name = {1: "Technical Round 1", 2: "Technical Round 2"}.get(round_num, "HR Round")
+        inputs = await asyncio.to_thread(fit_fields, "analyze_answer", {"question": question, "answer": answer},
+                                         weights={"question": 1, "answer": 3}, queries={"answer": question})
 
         prompt = f"""You are an expert interviewer. Score this candidate answer.
 
 Job: {job_title} ({exp_level}) — {round_name}
-Question: {question[:300]}
-Answer: {answer[:1200]}
+Question: {inputs['question']}
+Answer: {inputs['answer']}
 
 Return ONLY valid JSON (no markdown):
 {{
@@ -350,38 +474,42 @@ Return ONLY valid JSON (no markdown):
 
 Rules: score is 0-10 integer, all arrays 2-3 items, return ONLY JSON."""
 
-        response_text = call_huggingface(prompt, max_tokens=600)
-        parsed        = repair_json(response_text)
+        parsed = await call_llm_json_async(
+            prompt, max_tokens=output_budget("analyze_answer"), cache_endpoint="analyze_answer"
+        )
 
         if not parsed:
-            # Graceful word-count fallback so Results.js keeps going
-            wc = len(answer.split())
-            return jsonify({
-                "score":        min(3 + (wc // 20), 8),
-                "feedback":     ["AI scoring temporarily unavailable. Score estimated from answer length."],
-                "strengths":    ["Attempted the question"],
-                "improvements": ["Add concrete examples and quantify your results"],
-                "hasExamples":  False
-            }), 200
-
-        return jsonify({
+            # Graceful local fallback so Results.js keeps going
+            local = await asyncio.to_thread(score_answer_local, question, answer, round_num)
+            log.warning("⚠️  AI scoring unavailable — local score %s/10", local['score'])
+            return local, 200
+
+        return {
             "score":        max(0, min(10, int(parsed.get('score', 5)))),
             "feedback":     parsed.get('feedback',     []),
             "strengths":    parsed.get('strengths',    []),
             "improvements": parsed.get('improvements', []),
-            "hasExamples":  bool(parsed.get('hasExamples', False))
-        }), 200
+            "hasExamples":  bool(parsed.get('hasExamples', False)),
+            "scoredBy":     "llm",
+        }, 200
 
+    except RateLimitExceeded:
+        raise
     except Exception as e:
-        print(f"\n❌ ERROR: {str(e)}")
+        log.error("❌ ERROR: %s", e)
         # 200 + fallback so Results.js doesn't stop
-        return jsonify({
-            "score": 5,
-            "feedback": ["Server error during analysis. Score is estimated."],
-            "strengths": [],
-            "improvements": ["Please retry for accurate scoring."],
-            "hasExamples": False
-        }), 200
+        try:
+            return await asyncio.to_thread(
+                score_answer_local, data.get('question', ''), data.get('answer', ''), data.get('round')
+            ), 200
+        except Exception:
+            return {
+                "score": 5,
+                "feedback": ["Server error during analysis. Score is estimated."],
+                "strengths": [],
+                "improvements": ["Please retry for accurate scoring."],
+                "hasExamples": False
+            }, 200
 
 
 # ─── Batch Analyze Answers (NEW) ──────────────────────────────────────────────
@@ -389,44 +517,59 @@ Rules: score is 0-10 integer, all arrays 2-3 items, return ONLY JSON."""
 #  Results.js previously called /analyze-answer once per question sequentially.
 #  For 3 rounds × 7 questions = 21 LLM calls chained = guaranteed timeout.
 #
-#  This endpoint takes ALL answers in one request and scores them in a SINGLE
-#  LLM call. One network round-trip, one model call, no timeout chain.
+#  This endpoint takes ALL answers in one request. Answers are packed into
+#  chunks sized to a token budget and the chunks are scored concurrently, so
+#  no single response is long enough to get truncated. Results are merged by
+#  questionId; answers a chunk failed to score are retried in smaller chunks,
+#  and only what still fails falls back to the local heuristic scorer.
 #
 #  Results.js now calls this instead of looping over /analyze-answer.
 
-@app.route("/api/batch-analyze-answers", methods=["POST"])
-def batch_analyze_answers():
-    try:
-        print("\n" + "=" * 60)
-        print("📨 BATCH ANALYZE ANSWERS")
-        print("=" * 60)
-
-        data = request.json
-        if not data:
-            return jsonify({"error": "No data provided"}), 400
-
-        answers   = data.get('answers', [])
-        job_title = data.get('jobTitle', 'the role')
-        exp_level = data.get('experienceLevel', 'mid-level')
-
-        if not answers:
-            return jsonify({"error": "No answers provided"}), 400
-
-        real_answers = [a for a in answers if (a.get('answer') or '').strip() != '[Skipped]']
-        skipped_ids  = {a.get('questionId') for a in answers if (a.get('answer') or '').strip() == '[Skipped]'}
-
-        print(f"📝 {len(real_answers)} real answers | {len(skipped_ids)} skipped")
-
-        # Build compact answer block (300 chars per answer to control tokens)
-        answer_lines = []
-        for i, a in enumerate(real_answers):
-            q = (a.get('question') or '')[:150]
-            ans = (a.get('answer')   or '')[:300]
-            answer_lines.append(f"[{i+1}] Q: {q}\n    A: {ans}")
-
-        answers_block = "\n\n".join(answer_lines)
-
-        prompt = f"""You are an expert interviewer. Score ALL {len(real_answers)} answers for a {exp_level} {job_title} candidate.
+BATCH_CHUNK_TOKENS  = int(os.getenv("BATCH_CHUNK_TOKENS", input_budget("batch_analyze")))  # prompt budget per chunk
+BATCH_CHUNK_MAX     = int(os.getenv("BATCH_CHUNK_MAX", 6))        # answers per chunk
+BATCH_CONCURRENCY   = int(os.getenv("BATCH_CONCURRENCY", 4))      # chunks in flight
+BATCH_RETRY_ROUNDS  = 2                                        # halve chunk size each round
+BATCH_QUESTION_TOKENS = 40    # per question in a chunk prompt
+BATCH_ANSWER_TOKENS   = 80    # an answer's packing cost is capped here; long answers
+                              # still get whatever budget shorter ones leave over
+
+
+def answer_cost(a):
+    """Tokens an answer takes when packing chunks"""
+    return (min(estimate_tokens(compact(a.get('question'))), BATCH_QUESTION_TOKENS)
+            + min(estimate_tokens(compact(a.get('answer'))), BATCH_ANSWER_TOKENS))
+
+
+def chunk_answers(answers, budget=BATCH_CHUNK_TOKENS, max_size=BATCH_CHUNK_MAX):
+    """Greedily pack answers into chunks that fit the per-chunk token budget"""
+    chunks, current, used = [], [], 0
+    for a in answers:
+        cost = answer_cost(a)
+        if current and (used + cost > budget or len(current) >= max_size):
+            chunks.append(current)
+            current, used = [], 0
+        current.append(a)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def build_chunk_prompt(chunk, job_title, exp_level):
+    """Scoring prompt for one chunk of answers"""
+    # Questions are capped; answers split the rest of the chunk budget, so
+    # short answers leave room for long ones
+    questions = [fit(a.get('question'), BATCH_QUESTION_TOKENS) for a in chunk]
+    answers   = [compact(a.get('answer')) for a in chunk]
+    shares    = allocate([estimate_tokens(ans) for ans in answers],
+                         BATCH_CHUNK_TOKENS - sum(estimate_tokens(q) for q in questions))
+    answer_lines = []
+    for i, (q, ans, share) in enumerate(zip(questions, answers, shares)):
+        answer_lines.append(f"[{i+1}] Q: {q}\n    A: {fit(ans, share, q, compacted=True)}")
+
+    answers_block = "\n\n".join(answer_lines)
+
+    prompt = f"""You are an expert interviewer. Score ALL {len(chunk)} answers for a {exp_level} {job_title} candidate.
 
 {answers_block}
 
@@ -445,43 +588,121 @@ Return ONLY valid JSON (no markdown):
 }}
 
 Rules: one entry per answer in order, index starts at 1, score 0-10, return ONLY JSON."""
+    return prompt
 
-        # ~130 output tokens per answer
-        max_tokens = min(200 + len(real_answers) * 130, 2400)
 
-        print(f"🤖 Batch scoring {len(real_answers)} answers (max_tokens={max_tokens})…")
-        response_text = call_huggingface(prompt, max_tokens=max_tokens)
-        print(f"📝 Response: {len(response_text)} chars")
+async def score_answer_chunk(chunk, job_title, exp_level, semaphore):
+    """Score one chunk. Returns {questionId: result} for the answers it managed to score"""
+    # Fitting answers to the budget ranks their blocks, so it runs off the event loop
+    prompt = await asyncio.to_thread(build_chunk_prompt, chunk, job_title, exp_level)
+    max_tokens = output_budget("batch_analyze", items=len(chunk))
 
-        parsed = repair_json(response_text)
+    async with semaphore:
+        try:
+            parsed = await call_llm_json_async(prompt, max_tokens=max_tokens, cache_endpoint="batch_analyze")
+        except Exception as e:
+            log.warning("⚠️  Chunk of %s failed: %s", len(chunk), e)
+            return {}
+
+    ai_results = parsed.get('results') if parsed else None
+    if not isinstance(ai_results, list):
+        log.warning("⚠️  Chunk of %s returned unparseable JSON", len(chunk))
+        return {}
+
+    # Prefer the model's own index; fall back to position
+    by_index = {}
+    for pos, ai in enumerate(ai_results):
+        if not isinstance(ai, dict):
+            continue
+        try:
+            idx = int(ai.get('index', pos + 1)) - 1
+        except (TypeError, ValueError):
+            idx = pos
+        by_index.setdefault(idx, ai)
+
+    scored = {}
+    for i, a in enumerate(chunk):
+        ai = by_index.get(i)
+        if ai is None or 'score' not in ai:
+            continue
+        try:
+            score = max(0, min(10, int(ai['score'])))
+        except (TypeError, ValueError):
+            continue
+        scored[a['questionId']] = {
+            "score":        score,
+            "feedback":     ai.get('feedback',     ["Answer recorded."]),
+            "strengths":    ai.get('strengths',    ["Attempted the question"]),
+            "improvements": ai.get('improvements', ["Add more specific examples"]),
+            "hasExamples":  bool(ai.get('hasExamples', False)),
+            "scoredBy":     "llm",
+            "skipped":      False,
+        }
+    return scored
 
-        results_map = {}
 
-        if parsed and 'results' in parsed:
-            ai_results = parsed['results']
-            for i, a in enumerate(real_answers):
-                ai = ai_results[i] if i < len(ai_results) else {}
-                results_map[a['questionId']] = {
-                    "score":        max(0, min(10, int(ai.get('score', 5)))),
-                    "feedback":     ai.get('feedback',     ["Answer recorded."]),
-                    "strengths":    ai.get('strengths',    ["Attempted the question"]),
-                    "improvements": ai.get('improvements', ["Add more specific examples"]),
-                    "hasExamples":  bool(ai.get('hasExamples', False)),
-                    "skipped":      False,
-                }
-        else:
-            # Word-count fallback for all real answers
-            print("⚠️  Batch parse failed — using word-count fallback")
-            for a in real_answers:
-                wc = len((a.get('answer') or '').split())
-                results_map[a['questionId']] = {
-                    "score":        min(3 + (wc // 25), 8),
-                    "feedback":     ["AI scoring temporarily unavailable. Score estimated."],
-                    "strengths":    ["Attempted the question"],
-                    "improvements": ["Add concrete examples and quantify results"],
-                    "hasExamples":  False,
-                    "skipped":      False,
-                }
+@app.route("/api/batch-analyze-answers", methods=["POST"])
+def batch_analyze_answers():
+    return respond(handle_batch_analyze_answers)
+
+
+async def handle_batch_analyze_answers(req):
+    try:
+        log.info("📨 BATCH ANALYZE ANSWERS")
+
+        data = req.json
+        if not data:
+            return {"error": "No data provided"}, 400
+
+        answers   = data.get('answers', [])
+        job_title = data.get('jobTitle', 'the role')
+        exp_level = data.get('experienceLevel', 'mid-level')
+        mode      = answer_mode(data.get('mode'))
+
+        if not answers:
+            return {"error": "No answers provided"}, 400
+
+        real_answers = [a for a in answers if (a.get('answer') or '').strip() != '[Skipped]']
+        skipped_ids  = {a.get('questionId') for a in answers if (a.get('answer') or '').strip() == '[Skipped]'}
+
+        log.info("📝 %s real answers | %s skipped", len(real_answers), len(skipped_ids))
+
+        def score_locally(batch):
+            return {a['questionId']: {**score_answer_local(a.get('question'), a.get('answer'), a.get('round')),
+                                      "skipped": False} for a in batch}
+
+        # Answers the local scorer can settle (per mode) never reach the LLM
+        results_map = await asyncio.to_thread(
+            score_locally, [a for a in real_answers if skips_llm(a.get('answer'), mode)]
+        )
+        if results_map:
+            log.info("⚡ %s answers scored locally (%s mode)", len(results_map), mode)
+        semaphore   = asyncio.Semaphore(BATCH_CONCURRENCY)
+        pending     = [a for a in real_answers if a['questionId'] not in results_map]
+        chunks      = chunk_answers(pending)
+
+        for round_num in range(BATCH_RETRY_ROUNDS + 1):
+            if not pending:
+                break
+            if round_num:
+                # Retry only what failed, in half-size chunks so one bad answer can't sink its neighbours
+                chunks = chunk_answers(pending, max_size=max(1, max(len(c) for c in chunks) // 2))
+                log.info("🔁 Retrying %s unscored answers in %s chunks", len(pending), len(chunks))
+            else:
+                log.info("🤖 Batch scoring %d answers in %d chunks (concurrency=%d)…",
+                         len(pending), len(chunks), BATCH_CONCURRENCY)
+
+            chunk_results = await asyncio.gather(*[
+                score_answer_chunk(chunk, job_title, exp_level, semaphore) for chunk in chunks
+            ])
+            for scored in chunk_results:
+                results_map.update(scored)
+            pending = [a for a in pending if a['questionId'] not in results_map]
+
+        if pending:
+            # Local fallback only for the answers that still failed
+            log.warning("⚠️  %s answers unscored — using local scorer", len(pending))
+            results_map.update(await asyncio.to_thread(score_locally, pending))
 
         # Fill skipped answers
         for a in answers:
@@ -504,56 +725,193 @@ Rules: one entry per answer in order, index starts at 1, score 0-10, return ONLY
             for a in answers
         ]
 
-        print(f"✅ Batch complete: {len(ordered)} results")
-        return jsonify({"results": ordered}), 200
+        log.info("✅ Batch complete: %s results", len(ordered))
+        return {"results": ordered}, 200
 
+    except RateLimitExceeded:
+        raise
     except Exception as e:
-        print(f"\n❌ ERROR: {str(e)}")
-        print(traceback.format_exc())
-        return jsonify({"error": f"Server error: {str(e)}"}), 500
+        log.exception("❌ ERROR: %s", e)
+        return {"error": f"Server error: {str(e)}"}, 500
 
 
 # ─── Analyze Resume ───────────────────────────────────────────────────────────
+#
+#  Call 2 (improved resume) normally waits for call 1's improvements and
+#  keyword gaps. Clients can pick a faster mode with the `mode` field:
+#    sequential  (default) call 1, then a targeted rewrite
+#    speculative a generic ATS rewrite runs in parallel with call 1
+#    deferred    returns after call 1; improvedResume arrives via
+#                GET /api/jobs/<improvedResumeJobId>
 
-@app.route("/api/analyze-resume", methods=["POST"])
-def analyze_resume():
+REWRITE_MODES = {"sequential", "speculative", "deferred"}
+
+
+def elapsed_ms(start):
+    return int((time.perf_counter() - start) * 1000)
+
+
+def build_review_prompt(resume_snippet, jd_block, scores):
+    """Call 1 when atsScorer has computed the scores: the LLM writes only the qualitative fields"""
+    sections = "\n".join(f"- {s['section']}: {s['score']} ({s['feedback']})" for s in scores["sectionFeedback"])
+    gaps = ", ".join(scores["keywordGaps"]) or "none"
+    # Without a JD there is nothing to compute keyword gaps against
+    gap_field = "" if jd_block else ',\n  "keywordGaps": ["Agile", "Stakeholder Management", "Data Analysis", "Python", "KPIs"]'
+    gap_rule = "" if jd_block else ", keywordGaps 5-8"
+    return f"""You are an expert ATS resume reviewer. The scores below come from our ATS engine; do not re-score. Write the qualitative review.
+
+RESUME:
+{resume_snippet}
+{jd_block}
+ATS SCORE: {scores['atsScore']}/100
+SECTION SCORES:
+{sections}
+MISSING KEYWORDS: {gaps}
+
+Return ONLY this JSON (no markdown):
+{{
+  "sectionFeedback": [
+    {{"section": "Work Experience", "feedback": "Relevant but lacks metrics."}}
+  ],
+  "strengths": ["Clear career progression", "Relevant technical skills", "Good educational background"],
+  "improvements": ["Add quantifiable achievements", "Use stronger action verbs", "Expand skills section"]{gap_field}
+}}
+
+Rules: one sectionFeedback item per scored section, same section names; strengths 3-4; improvements 3-5, lowest-scoring sections and missing keywords first{gap_rule}. Return ONLY JSON."""
+
+
+def merge_review(scores, review):
+    """atsScorer's scores with the LLM's per-section feedback, strengths and improvements"""
+    feedback = {str(s.get("section", "")).lower(): s.get("feedback")
+                for s in review.get("sectionFeedback") or [] if isinstance(s, dict)}
+    return {
+        "atsScore":        scores["atsScore"],
+        "sectionFeedback": [{**s, "feedback": feedback.get(s["section"].lower()) or s["feedback"]}
+                            for s in scores["sectionFeedback"]],
+        "keywordGaps":     scores["keywordGaps"] or review.get("keywordGaps") or [],
+        "strengths":       review.get("strengths") or [],
+        "improvements":    review.get("improvements") or [],
+        "atsBreakdown":    scores["atsBreakdown"],
+    }
+
+
+def build_improve_prompt(resume_snippet, analysis):
+    """Targeted rewrite using the issues and keyword gaps found by call 1"""
+    return f"""Rewrite this resume in clean ATS-optimised plain text.
+
+RESUME:
+{resume_snippet}
+
+FIX THESE ISSUES:
+{chr(10).join('- ' + i for i in analysis.get('improvements', [])[:3])}
+
+ADD THESE KEYWORDS WHERE APPLICABLE:
+{', '.join(analysis.get('keywordGaps', [])[:5])}
+
+Rules: plain text only, standard headings (PROFESSIONAL SUMMARY / WORK EXPERIENCE / EDUCATION / SKILLS), action verbs, no invented info. Return ONLY the resume text."""
+
+
+def build_generic_improve_prompt(resume_snippet, jd_snippet):
+    """Rewrite that needs nothing from call 1, so it can run alongside it"""
+    jd_block = (f"\nTAILOR IT TO THIS JOB DESCRIPTION:\n{jd_snippet}\n") if jd_snippet else ""
+    return f"""Rewrite this resume in clean ATS-optimised plain text.
+
+RESUME:
+{resume_snippet}
+{jd_block}
+Rules: plain text only, standard headings (PROFESSIONAL SUMMARY / WORK EXPERIENCE / EDUCATION / SKILLS), quantified achievements, strong action verbs, no invented info. Return ONLY the resume text."""
+
+
+async def rewrite_resume(prompt):
+    """Call 2: improved resume as plain text. Failures are non-critical and yield ''"""
+    phase_start = time.perf_counter()
+    improved_resume = ""
     try:
-        print("\n" + "=" * 60)
-        print("📨 ANALYZE RESUME REQUEST")
-        print("=" * 60)
+        log.info("🤖 Call 2/2: Improved resume…")
+        improved_resume = await call_llm_async(
+            prompt, max_tokens=output_budget("rewrite_resume"), cache_endpoint="rewrite_resume", expect_json=False
+        )
+        improved_resume = strip_text_fences(improved_resume)
+        log.info("✅ Call 2 done | %s chars", len(improved_resume))
+    except Exception as e:
+        log.warning("⚠️  Call 2 failed (non-critical): %s", e)
+    return {"improvedResume": improved_resume, "rewriteMs": elapsed_ms(phase_start)}
 
-        if 'resume' not in request.files:
-            return jsonify({"error": "No file uploaded"}), 400
 
-        file = request.files['resume']
-        if not file.filename:
-            return jsonify({"error": "No file selected"}), 400
-        if not allowed_file(file.filename):
-            return jsonify({"error": "Invalid file type. Please upload PDF, DOC, or DOCX"}), 400
+@app.route("/api/analyze-resume", methods=["POST"])
+def analyze_resume():
+    return respond(handle_analyze_resume, background=True)
 
-        filename  = secure_filename(file.filename)
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
 
-        resume_text = extract_resume_text(file_path, filename)
-        try:
-            os.remove(file_path)
-        except:
-            pass
+async def handle_analyze_resume(req):
+    speculative = None
+    try:
+        log.info("📨 ANALYZE RESUME REQUEST")
 
-        if not resume_text or len(resume_text.strip()) < 100:
-            return jsonify({"error": "Failed to extract text. Ensure the file is not password-protected."}), 400
+        timings       = {}
+        request_start = time.perf_counter()
 
-        print(f"✅ Extracted {len(resume_text)} chars")
+        if 'resume' not in req.files:
+            return {"error": "No file uploaded"}, 400
 
-        job_description      = request.form.get('jobDescription', '').strip()
-        resume_snippet       = resume_text[:3000]
-        resume_snippet_short = resume_text[:2500]
+        file = req.files['resume']
+        if not file.filename:
+            return {"error": "No file selected"}, 400
+        if not allowed_file(file.filename):
+            return {"error": "Invalid file type. Please upload PDF, DOC, or DOCX"}, 400
 
-        jd_block = (f"\nJOB DESCRIPTION:\n{job_description[:1500]}\n") if job_description else ""
+        phase_start = time.perf_counter()
+        resume_text, resume_hash = await asyncio.to_thread(read_resume, file.stream, file.filename)
+        timings["extractMs"] = elapsed_ms(phase_start)
 
-        # Call 1: Analysis JSON
-        analysis_prompt = f"""You are an expert ATS resume reviewer. Analyze this resume.
+        if not resume_text or len(resume_text.strip()) < 100:
+            return {"error": "Failed to extract text. Ensure the file is not password-protected."}, 400
+
+        log.info("✅ Extracted %s chars", len(resume_text))
+
+        job_description = req.form.get('jobDescription', '').strip()
+
+        # The resume gets most of each budget, packed by section, keeping the parts that match the JD
+        inputs  = {"resume": resume_text, "jobDescription": job_description}
+        queries = {"resume": job_description or None, "jobDescription": JD_FOCUS}
+        analysis_inputs = await asyncio.to_thread(fit_fields, "analyze_resume", inputs,
+                                                  {"resume": 3, "jobDescription": 1}, queries,
+                                                  fitters={"resume": fit_resume})
+        resume_snippet  = analysis_inputs["resume"]
+        # The targeted rewrite prompt has no JD, so its whole budget goes to the resume
+        rewrite_snippet = await asyncio.to_thread(fit_resume, resume_text, input_budget("rewrite_resume"),
+                                                  job_description or None)
+
+        jd_block = (f"\nJOB DESCRIPTION:\n{analysis_inputs['jobDescription']}\n") if job_description else ""
+
+        mode = (req.form.get('mode') or req.args.get('mode') or 'sequential').lower()
+        if mode not in REWRITE_MODES:
+            mode = 'sequential'
+
+        # Same file and JD as an earlier request: call 1 is skipped, and call 2's
+        # prompt is then identical too, so the response cache answers it
+        cached_analysis = (await asyncio.to_thread(resume_cache.get_analysis, resume_hash, job_description)
+                           if resume_cache else None)
+
+        if mode == 'speculative' and cached_analysis is None:
+            # Call 2 starts now with a generic rewrite prompt, overlapping call 1
+            rewrite_inputs = await asyncio.to_thread(fit_fields, "rewrite_resume", inputs,
+                                                     {"resume": 4, "jobDescription": 1}, queries,
+                                                     fitters={"resume": fit_resume})
+            speculative = asyncio.create_task(rewrite_resume(
+                build_generic_improve_prompt(rewrite_inputs["resume"], rewrite_inputs["jobDescription"])
+            ))
+
+        # Call 1: Analysis JSON. Scores, keyword gaps and section scores are computed
+        # locally when LOCAL_ATS is on, and the LLM only writes the review.
+        scores = None
+        if LOCAL_ATS and cached_analysis is None:
+            phase_start = time.perf_counter()
+            scores = await asyncio.to_thread(score_resume, resume_text, job_description)
+            timings["scoringMs"] = elapsed_ms(phase_start)
+            log.info("📊 Local ATS score: %s | %s keyword gaps", scores['atsScore'], len(scores['keywordGaps']))
+
+        analysis_prompt = build_review_prompt(resume_snippet, jd_block, scores) if scores else f"""You are an expert ATS resume reviewer. Analyze this resume.
 
 RESUME:
 {resume_snippet}
@@ -575,11 +933,24 @@ Return ONLY this JSON (no markdown):
 
 Rules: atsScore 0-100, sectionFeedback 2-6 items, keywordGaps 5-8, strengths 3-4, improvements 3-5. Return ONLY JSON."""
 
-        print("🤖 Call 1/2: Analysis JSON…")
-        r1      = call_huggingface(analysis_prompt, max_tokens=1200)
-        analysis = repair_json(r1)
+        phase_start = time.perf_counter()
+        if cached_analysis is not None:
+            log.info("♻️  Call 1/2: Analysis cache hit (%s)", resume_hash[:12])
+            analysis = cached_analysis
+        else:
+            log.info("🤖 Call 1/2: Analysis JSON…")
+            analysis = await call_llm_json_async(
+                analysis_prompt, max_tokens=output_budget("analyze_resume"), cache_endpoint="analyze_resume"
+            )
+        timings["analysisMs"] = elapsed_ms(phase_start)
+        # Local scores without the LLM review are served, but not cached for the TTL
+        degraded = bool(scores) and not analysis
+        if scores:
+            if degraded:
+                log.warning("⚠️  Review unparseable — returning the local scores only")
+            analysis = merge_review(scores, analysis or {})
         if not analysis:
-            return jsonify({"error": "Failed to parse AI analysis. Please try again."}), 500
+            return {"error": "Failed to parse AI analysis. Please try again."}, 500
 
         defaults = {"atsScore": 50, "sectionFeedback": [], "keywordGaps": [], "strengths": [], "improvements": []}
         for k in defaults:
@@ -591,89 +962,99 @@ Rules: atsScore 0-100, sectionFeedback 2-6 items, keywordGaps 5-8, strengths 3-4
             if 'score' in s:
                 s['score'] = max(0, min(100, int(s['score'])))
 
-        print(f"✅ Call 1 done | ATS: {ats_score}")
+        if cached_analysis is None:
+            log.info("✅ Call 1 done | ATS: %s", ats_score)
+            if resume_cache and not degraded:
+                await asyncio.to_thread(resume_cache.set_analysis, resume_hash, job_description, analysis)
 
         # Call 2: Improved resume as plain text
-        improved_resume = ""
-        try:
-            improve_prompt = f"""Rewrite this resume in clean ATS-optimised plain text.
-
-RESUME:
-{resume_snippet_short}
-
-FIX THESE ISSUES:
-{chr(10).join('- ' + i for i in analysis.get('improvements', [])[:3])}
-
-ADD THESE KEYWORDS WHERE APPLICABLE:
-{', '.join(analysis.get('keywordGaps', [])[:5])}
-
-Rules: plain text only, standard headings (PROFESSIONAL SUMMARY / WORK EXPERIENCE / EDUCATION / SKILLS), action verbs, no invented info. Return ONLY the resume text."""
+        improved_resume, job_id, rewrite = "", None, None
+        if speculative:
+            rewrite = await speculative
+        elif mode == 'deferred':
+            job_id = await job_store.submit_async(rewrite_resume(build_improve_prompt(rewrite_snippet, analysis)))
+            log.info("⏳ Call 2 deferred to job %s", job_id)
+        else:
+            rewrite = await rewrite_resume(build_improve_prompt(rewrite_snippet, analysis))
 
-            print("🤖 Call 2/2: Improved resume…")
-            improved_resume = call_huggingface(improve_prompt, max_tokens=1800)
-            improved_resume = re.sub(r'```[a-z]*\n?', '', improved_resume).strip()
-            print(f"✅ Call 2 done | {len(improved_resume)} chars")
-        except Exception as e:
-            print(f"⚠️  Call 2 failed (non-critical): {e}")
+        if rewrite:
+            improved_resume      = rewrite["improvedResume"]
+            timings["rewriteMs"] = rewrite["rewriteMs"]
+        timings["totalMs"] = elapsed_ms(request_start)
+        for stage, ms in timings.items():
+            if stage != "totalMs":
+                stage_seconds.observe(ms / 1000, "analyze_resume", stage[:-2])
 
-        return jsonify({
+        result = {
             "atsScore":        ats_score,
             "sectionFeedback": analysis.get('sectionFeedback', []),
             "keywordGaps":     analysis.get('keywordGaps', []),
             "strengths":       analysis.get('strengths', []),
             "improvements":    analysis.get('improvements', []),
             "improvedResume":  improved_resume,
-        }), 200
-
+            "mode":            mode,
+            "timings":         timings,
+        }
+        if analysis.get("atsBreakdown"):
+            result["atsBreakdown"] = analysis["atsBreakdown"]
+        if job_id:
+            result["improvedResumeJobId"] = job_id
+        return result, 200
+
+    except RateLimitExceeded:
+        raise
     except Exception as e:
-        print(f"\n❌ ERROR: {str(e)}")
-        print(traceback.format_exc())
-        return jsonify({"error": f"Server error: {str(e)}"}), 500
+        log.exception("❌ ERROR: %s", e)
+        return {"error": f"Server error: {str(e)}"}, 500
+    finally:
+        if speculative and not speculative.done():
+            speculative.cancel()
 
 
 # ─── Skill Gap ────────────────────────────────────────────────────────────────
 
 @app.route("/api/skill-gap", methods=["POST"])
 def skill_gap():
+    return respond(handle_skill_gap, background=True)
+
+
+async def handle_skill_gap(req):
     try:
-        print("\n" + "=" * 60)
-        print("📨 SKILL GAP REQUEST")
-        print("=" * 60)
+        log.info("📨 SKILL GAP REQUEST")
 
-        job_description = request.form.get('jobDescription', '').strip()
+        job_description = req.form.get('jobDescription', '').strip()
         if not job_description:
-            return jsonify({"error": "Job description is required."}), 400
+            return {"error": "Job description is required."}, 400
 
         resume_text = ""
-        if 'resume' in request.files:
-            file = request.files['resume']
+        if 'resume' in req.files:
+            file = req.files['resume']
             if file and file.filename:
                 if not allowed_file(file.filename):
-                    return jsonify({"error": "Invalid file type."}), 400
-                filename  = secure_filename(file.filename)
-                file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                file.save(file_path)
-                resume_text = extract_resume_text(file_path, filename) or ""
-                try:
-                    os.remove(file_path)
-                except:
-                    pass
+                    return {"error": "Invalid file type."}, 400
+                resume_text, _ = await asyncio.to_thread(read_resume, file.stream, file.filename)
+                resume_text = resume_text or ""
 
         if not resume_text:
-            resume_text = request.form.get('resumeText', '').strip()
+            resume_text = req.form.get('resumeText', '').strip()
 
         if not resume_text or len(resume_text) < 50:
-            return jsonify({"error": "Could not extract resume text. Please try a different file."}), 400
+            return {"error": "Could not extract resume text. Please try a different file."}, 400
+
+        log.info("✅ JD: %s | Resume: %s chars", len(job_description), len(resume_text))
 
-        print(f"✅ JD: {len(job_description)} | Resume: {len(resume_text)} chars")
+        inputs = await asyncio.to_thread(fit_fields, "skill_gap",
+                                         {"jobDescription": job_description, "resume": resume_text},
+                                         queries={"jobDescription": JD_FOCUS, "resume": job_description},
+                                         fitters={"resume": fit_resume})
 
         prompt = f"""You are an expert career coach. Compare the resume against the job description.
 
 JOB DESCRIPTION:
-{job_description[:2500]}
+{inputs['jobDescription']}
 
 RESUME:
-{resume_text[:2500]}
+{inputs['resume']}
 
 Return ONLY valid JSON (no markdown):
 {{
@@ -697,16 +1078,15 @@ Return ONLY valid JSON (no markdown):
 
 Rules: roadmap max 6 items, priority = high/medium/low, return ONLY JSON."""
 
-        print("🤖 Skill gap AI call…")
-        response_text = call_huggingface(prompt, max_tokens=2000)
-        analysis = repair_json(response_text)
+        log.info("🤖 Skill gap AI call…")
+        analysis = await call_llm_json_async(prompt, max_tokens=output_budget("skill_gap"), cache_endpoint="skill_gap")
         if not analysis:
-            return jsonify({"error": "Failed to parse AI response. Please try again."}), 500
+            return {"error": "Failed to parse AI response. Please try again."}, 500
 
         required_keys = ["presentSkills", "missingSkills", "roadmap"]
         missing_keys  = [k for k in required_keys if k not in analysis]
         if missing_keys:
-            return jsonify({"error": f"Incomplete AI response (missing: {', '.join(missing_keys)})."}), 500
+            return {"error": f"Incomplete AI response (missing: {', '.join(missing_keys)})."}, 500
 
         for item in analysis.get("roadmap", []):
             if item.get("priority") not in {"high", "medium", "low"}:
@@ -722,14 +1102,25 @@ Rules: roadmap max 6 items, priority = high/medium/low, return ONLY JSON."""
             "totalTimeframe": analysis.get("totalTimeframe", ""),
             "roadmap":        analysis.get("roadmap", [])
         }
-        print(f"✅ Skill gap done | Present: {len(result['presentSkills'])} | "
-              f"Missing: {len(result['missingSkills'])} | Roadmap: {len(result['roadmap'])}")
-        return jsonify(result), 200
+        log.info("✅ Skill gap done | Present: %d | Missing: %d | Roadmap: %d",
+                 len(result['presentSkills']), len(result['missingSkills']), len(result['roadmap']))
+        return result, 200
 
+    except RateLimitExceeded:
+        raise
     except Exception as e:
-        print(f"\n❌ ERROR: {str(e)}")
-        print(traceback.format_exc())
-        return jsonify({"error": f"Server error: {str(e)}"}), 500
+        log.exception("❌ ERROR: %s", e)
+        return {"error": f"Server error: {str(e)}"}, 500
+
+
+# ─── Jobs ─────────────────────────────────────────────────────────────────────
+
+@app.route("/api/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    job = job_store.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found or expired"}), 404
+    return jsonify(job), 200
 
 
 # ─── Error Handlers ───────────────────────────────────────────────────────────
@@ -741,7 +1132,8 @@ def not_found(error):
         "available_endpoints": [
             "/api/health", "/api/create-interview",
             "/api/analyze-answer", "/api/batch-analyze-answers",
-            "/api/analyze-resume", "/api/skill-gap"
+            "/api/analyze-resume", "/api/skill-gap",
+            "/api/jobs/<id>"
         ]
     }), 404
 
@@ -753,11 +1145,17 @@ def internal_error(error):
 def file_too_large(error):
     return jsonify({"error": "File too large. Maximum size is 5MB."}), 413
 
+@app.errorhandler(RateLimitExceeded)
+def rate_limited(error):
+    response = jsonify({"error": str(error), "retryAfter": round(error.retry_after, 1)})
+    response.headers["Retry-After"] = str(int(error.retry_after) + 1)
+    return response, 429
+
 
 # ─── Entry Point ──────────────────────────────────────────────────────────────
 
 if __name__ == "__main__":
     port = int(os.getenv('PORT', 5000))
     env  = os.getenv('FLASK_ENV', 'development')
-    print(f"\n🚀 PrepMate-AI Backend | Port {port} | Env {env}\n")
+    log.info("🚀 PrepMate-AI Backend | Port %s | Env %s", port, env)
     app.run(debug=(env == 'development'), port=port, host='0.0.0.0')
\ No newline at end of file
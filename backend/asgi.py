@@ -0,0 +1,206 @@
+# backend/asgi.py
+# ASGI serving mode:  uvicorn asgi:application --host 0.0.0.0 --port $PORT
+#
+# Under gunicorn every request pins a worker thread for the whole LLM call,
+# retry sleeps included. Here the LLM routes are awaited directly on the
+# server's event loop, so one process can hold hundreds of in-flight calls.
+# Everything else (health, preflight, 404s) is passed through to the Flask
+# app unchanged.
+
+import sys
+import json
+import time
+from fnmatch import fnmatch
+from collections import defaultdict
+from tempfile import SpooledTemporaryFile
+from urllib.parse import parse_qs
+
+from asgiref.wsgi import WsgiToAsgi
+from werkzeug.wrappers import Request
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from app import (
+    app, CORS_ORIGINS, MAX_FILE_SIZE, sse_event, wants_job, submit_route_job_async,
+    handle_create_interview, handle_analyze_answer, handle_batch_analyze_answers,
+    handle_analyze_resume, handle_skill_gap, stream_create_interview,
+)
+from rateLimiter import RateLimitExceeded
+from metrics import request_seconds
+from logger import start_request
+
+ASYNC_ROUTES = {
+    "/api/create-interview":       handle_create_interview,
+    "/api/analyze-answer":         handle_analyze_answer,
+    "/api/batch-analyze-answers":  handle_batch_analyze_answers,
+    "/api/analyze-resume":         handle_analyze_resume,
+    "/api/skill-gap":              handle_skill_gap,
+}
+
+# Routes that accept ?async=1 and answer 202 + a job id
+JOB_ROUTES = {"/api/create-interview", "/api/analyze-resume", "/api/skill-gap"}
+
+# ?stream=1 variants that answer with Server-Sent Events
+STREAM_ROUTES = {
+    "/api/create-interview":       stream_create_interview,
+}
+
+flask_app = WsgiToAsgi(app)
+
+
+def build_environ(scope, body):
+    """Minimal WSGI environ so werkzeug can parse JSON and multipart bodies"""
+    environ = {
+        "REQUEST_METHOD":  scope["method"],
+        "SCRIPT_NAME":     scope.get("root_path", ""),
+        "PATH_INFO":       scope["path"],
+        "QUERY_STRING":    scope["query_string"].decode("ascii"),
+        "SERVER_PROTOCOL": f"HTTP/{scope['http_version']}",
+        "SERVER_NAME":     scope.get("server", ("localhost", 80))[0],
+        "SERVER_PORT":     str(scope.get("server", ("localhost", 80))[1]),
+        "wsgi.version":    (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input":      body,
+        "wsgi.errors":     sys.stderr,
+    }
+    headers = defaultdict(list)
+    for name, value in scope.get("headers", []):
+        name = name.decode("latin1")
+        if name in ("content-length", "content-type"):
+            key = name.upper().replace("-", "_")
+        else:
+            key = "HTTP_" + name.upper().replace("-", "_")
+        headers[key].append(value.decode("latin1"))
+    environ.update({k: ",".join(v) for k, v in headers.items()})
+    return environ
+
+
+def cors_headers(scope):
+    """Mirror the Flask-CORS policy for responses that bypass Flask"""
+    origin = next((v.decode("latin1") for k, v in scope.get("headers", []) if k == b"origin"), None)
+    if not origin or not any(fnmatch(origin, pattern) for pattern in CORS_ORIGINS):
+        return []
+    return [
+        (b"access-control-allow-origin", origin.encode("latin1")),
+        (b"access-control-allow-credentials", b"true"),
+        (b"vary", b"Origin"),
+    ]
+
+
+async def send_json(send, scope, body, status, extra_headers=()):
+    payload = json.dumps(body).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(payload)).encode("ascii")),
+            *cors_headers(scope),
+            *extra_headers,
+        ],
+    })
+    await send({"type": "http.response.body", "body": payload})
+
+
+async def send_events(send, scope, events):
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [
+            (b"content-type", b"text/event-stream"),
+            (b"cache-control", b"no-cache"),
+            (b"x-accel-buffering", b"no"),
+            *cors_headers(scope),
+        ],
+    })
+    try:
+        async for event, data in events:
+            await send({"type": "http.response.body", "body": sse_event(event, data).encode("utf-8"), "more_body": True})
+    finally:
+        await events.aclose()
+    await send({"type": "http.response.body"})
+
+
+async def read_body(receive, limit):
+    """Buffer the request body; returns None if the client disconnected"""
+    body = SpooledTemporaryFile(max_size=64 * 1024)
+    size = 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            body.close()
+            return None
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > limit:
+            body.close()
+            raise RequestEntityTooLarge()
+        body.write(chunk)
+        if not message.get("more_body"):
+            break
+    body.seek(0)
+    return body
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await lifespan(receive, send)
+
+    handler = ASYNC_ROUTES.get(scope.get("path"))
+    if scope["type"] != "http" or scope["method"] != "POST" or handler is None:
+        return await flask_app(scope, receive, send)
+
+    # Flask's hooks never see these routes, so time them and tag their logs here
+    start = time.perf_counter()
+    status = ["500"]
+    incoming = next((v.decode("latin1") for k, v in scope.get("headers", []) if k == b"x-request-id"), None)
+    rid = start_request(incoming).encode("latin1")
+
+    async def timed_send(message):
+        if message["type"] == "http.response.start":
+            status[0] = str(message["status"])
+            message = {**message, "headers": [*message.get("headers", []), (b"x-request-id", rid)]}
+        await send(message)
+
+    try:
+        await serve_async_route(scope, receive, timed_send, handler)
+    finally:
+        request_seconds.observe(time.perf_counter() - start, scope["path"], "POST", status[0])
+
+
+async def serve_async_route(scope, receive, send, handler):
+    try:
+        body = await read_body(receive, MAX_FILE_SIZE)
+    except RequestEntityTooLarge:
+        return await send_json(send, scope, {"error": "File too large. Maximum size is 5MB."}, 413)
+    if body is None:
+        return
+
+    try:
+        req = Request(build_environ(scope, body))
+        req.max_content_length = MAX_FILE_SIZE
+        stream = STREAM_ROUTES.get(scope["path"])
+        if stream and parse_qs(scope["query_string"].decode("ascii")).get("stream") == ["1"]:
+            return await send_events(send, scope, stream(req.get_json(silent=True)))
+        if scope["path"] in JOB_ROUTES and wants_job(req):
+            result, status = await submit_route_job_async(handler, req)
+        else:
+            result, status = await handler(req)
+        await send_json(send, scope, result, status)
+    except RateLimitExceeded as e:
+        await send_json(
+            send, scope,
+            {"error": str(e), "retryAfter": round(e.retry_after, 1)}, 429,
+            [(b"retry-after", str(int(e.retry_after) + 1).encode("ascii"))]
+        )
+    finally:
+        body.close()
@@ -0,0 +1,61 @@
+# backend/asyncRuntime.py
+# One long-lived asyncio event loop per worker process for LLM I/O.
+#
+# The providers are written as coroutines so an ASGI server can hold hundreds
+# of in-flight model calls on a single loop. Sync callers (the Flask routes
+# under gunicorn, the test scripts) hand their coroutine to this background
+# loop and wait for the result, so pooled HTTP clients live on one loop
+# instead of being rebuilt per request.
+#
+# That loop is a single thread shared by every request in the process: a
+# handler that blocks or computes on it stalls all the others. Coroutines
+# running here await network I/O directly and hand everything else to
+# asyncio.to_thread: file parsing, SQLite (response/resume cache, question
+# bank), prompt fitting, local ATS and answer scoring, and long JSON repairs
+# (jsonRepair.repair_async).
+
+import asyncio
+import threading
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def get_loop():
+    """Start (once per process) and return the background event loop"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=_loop.run_forever, name="llm-event-loop", daemon=True)
+            thread.start()
+    return _loop
+
+
+def run_sync(coro, timeout=None):
+    """Run a coroutine on the background loop and block until it finishes"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        coro.close()
+        raise RuntimeError("run_sync() called from a running event loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result(timeout)
+
+
+async def _anext(agen):
+    return await agen.__anext__()
+
+
+def iterate_sync(agen):
+    """Drive an async generator on the background loop from a sync iterator"""
+    loop = get_loop()
+    try:
+        while True:
+            try:
+                yield asyncio.run_coroutine_threadsafe(_anext(agen), loop).result()
+            except StopAsyncIteration:
+                return
+    finally:
+        asyncio.run_coroutine_threadsafe(agen.aclose(), loop).result()
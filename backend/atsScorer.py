@@ -0,0 +1,299 @@
+# backend/atsScorer.py
+# Local, deterministic ATS scoring: atsScore, keywordGaps and per-section
+# scores for analyze-resume, so the LLM only writes the qualitative review.
+#
+# A JobProfile turns a job description into weighted keywords: skills from
+# skillExtractor's taxonomy (its aliases are the synonym sets, so "k8s" in a
+# resume covers "Kubernetes" in the JD) and stemmed content words the JD
+# repeats or lists as requirements. A resume is indexed in one pass (the
+# Aho-Corasick skill matcher plus a stemmed word set) and coverage is a
+# weighted set lookup, so one profile scores hundreds of resumes in
+# milliseconds each. Section scores come from resumeSections.segment():
+# contact details, bullets, quantified results, action verbs, degree, and
+# JD skills listed in the skills section.
+
+import os
+import re
+from functools import lru_cache
+
+from skillExtractor import matcher, TECHNICAL, SOFT, EXACT_ALIASES
+from resumeSections import segment
+from promptBudget import compact, STOPWORDS
+
+LOCAL_ATS    = os.getenv("LOCAL_ATS", "on").lower() not in ("0", "off", "false")
+MAX_KEYWORDS = 25
+MAX_GAPS     = 8
+
+WORD        = re.compile(r"[A-Za-z][A-Za-z0-9+#]*")
+EMAIL       = re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+")
+PHONE       = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+PROFILE_URL = re.compile(r"linkedin\.com|github\.com|gitlab\.com|https?://", re.IGNORECASE)
+METRIC      = re.compile(r"\d+\s*(%|percent|x\b|k\b|m\b|ms\b|hours?|days?|users|customers|\$)|\$\s*\d|\d{2,}",
+                         re.IGNORECASE)
+YEAR        = re.compile(r"\b(19|20)\d{2}\b")
+DEGREE      = re.compile(r"\b(bachelor|master|b\.?sc|m\.?sc|b\.?s\.?|m\.?s\.?|b\.?a\.?|m\.?a\.?|b\.?tech|m\.?tech|"
+                         r"b\.?e\.?|mba|ph\.?d|doctorate|degree|diploma|associate)\b", re.IGNORECASE)
+REQUIREMENT = re.compile(r"require|must|experience (with|in)|knowledge of|proficien|familiar|expertise|"
+                         r"understanding of|skills?:|qualifications?", re.IGNORECASE)
+
+ACTION_VERBS = {
+    "achieve", "architect", "automate", "build", "built", "create", "cut", "deliver", "deploy", "design",
+    "develop", "drive", "drove", "establish", "grow", "grew", "implement", "improve", "increase", "launch",
+    "lead", "led", "maintain", "manage", "mentor", "migrate", "optimise", "optimize", "own", "reduce",
+    "refactor", "scale", "ship", "spearhead", "streamline",
+}
+
+# Words every JD uses that are not keywords a resume should contain
+GENERIC = STOPWORDS | {
+    "ability", "able", "work", "working", "team", "teams", "role", "company", "join", "looking", "ideal",
+    "candidate", "years", "year", "experience", "experienced", "strong", "excellent", "good", "great",
+    "including", "using", "within", "across", "other", "well", "plus", "bonus", "preferred", "required",
+    "requirements", "responsibilities", "qualifications", "skills", "knowledge", "understanding",
+    "must", "should", "would", "like", "help", "new", "we", "us", "what", "who", "how", "where", "which",
+    "benefits", "salary", "remote", "office", "opportunity", "employer", "equal", "apply", "about",
+    "day", "make", "high", "based", "part", "per", "each", "best", "build", "building", "ensure",
+    "environment", "proven", "track", "record", "familiarity", "proficiency", "minimum", "least",
+    "small", "large", "fast", "growing", "exciting", "passionate", "various", "multiple", "things",
+}
+
+# Canonical resume sections: (label used in sectionFeedback, counts towards atsScore)
+SECTION_LABELS = {
+    "contact":        ("Contact Information", True),
+    "summary":        ("Professional Summary", True),
+    "experience":     ("Work Experience", True),
+    "education":      ("Education", True),
+    "skills":         ("Skills", True),
+    "projects":       ("Projects", False),
+    "certifications": ("Certifications", False),
+}
+CORE_LABELS = {label for label, core in SECTION_LABELS.values() if core}
+
+
+def stem(word):
+    """Light suffix stripping; only needs to map JD and resume forms to the same key"""
+    for suffix in ("izations", "ization", "isations", "isation", "ations", "ation", "ments", "ment",
+                   "ings", "ing", "ers", "er", "ed"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+            word = word[:-len(suffix)]
+            break
+    else:
+        if word.endswith("ies") and len(word) > 5:
+            word = word[:-3] + "y"
+        elif word.endswith("es") and word[:-2].endswith(("s", "x", "z", "ch", "sh")):
+            word = word[:-2]
+        elif word.endswith("s") and not word.endswith(("ss", "us", "sis")) and len(word) > 3:
+            word = word[:-1]
+    # manage / managed / managing -> manag
+    return word[:-1] if word.endswith("e") and len(word) > 4 else word
+
+
+ACTION_STEMS = {stem(v) for v in ACTION_VERBS}
+
+# Skill -> stems of its one-word aliases, so "Mentored" in a resume covers "Mentoring"
+ALIAS_STEMS = {
+    name: {stem(a.lower()) for a in [name, *aliases] if " " not in a and a not in EXACT_ALIASES and a.isalpha()}
+    for name, aliases in [*((n, a) for n, (_, a) in TECHNICAL.items()), *SOFT.items()]
+}
+
+
+def index_text(text):
+    """(canonical skill names, stemmed words) found in `text`"""
+    skills = {name for _, _, (_, name, _) in matcher.find(text)}
+    words = {stem(w) for w in WORD.findall(text.lower()) if w not in GENERIC}
+    return skills, words
+
+
+class JobProfile:
+    """Weighted keywords of one job description, compiled once and scored against many resumes"""
+
+    def __init__(self, job_description):
+        text = job_description or ""
+        weights, labels = {}, {}
+
+        spans = matcher.find(text)
+        for _, _, (kind, name, _) in spans:
+            key = ("skill", name)
+            base = 3.0 if kind == "technical" else 1.5
+            weights[key] = min(weights.get(key, 0) + base, base * 2)
+            labels[key] = name
+
+        # Content words outside skill mentions: repeated, or on a requirement line
+        masked = list(text)
+        for start, end, _ in spans:
+            masked[start:end] = " " * (end - start)
+        counts, surface = {}, {}
+        for line in "".join(masked).split("\n"):
+            on_requirement = bool(REQUIREMENT.search(line))
+            for token in WORD.findall(line):
+                word = token.lower()
+                if len(word) < 4 or word in GENERIC:
+                    continue
+                key = ("term", stem(word))
+                count, required = counts.get(key, (0, False))
+                counts[key] = (count + 1, required or on_requirement)
+                # "APIs" keeps its case, "billing" becomes "Billing"
+                surface.setdefault(key, token if not token.islower() else token.capitalize())
+        for key, (count, required) in counts.items():
+            if count >= 2 or required:
+                weights[key] = 1.0 + 0.5 * (count >= 3) + 0.5 * required
+                labels[key] = surface[key]
+
+        ranked = sorted(weights, key=lambda k: (-weights[k], k[0] != "skill", labels[k]))[:MAX_KEYWORDS]
+        self.keywords = [(key, labels[key], weights[key]) for key in ranked]
+        self.total = sum(w for _, _, w in self.keywords)
+        self.skills = {key[1] for key, _, _ in self.keywords if key[0] == "skill"}
+
+    def coverage(self, skills, words):
+        """(0-1 weighted share of keywords present, matched labels, missing labels by weight)"""
+        matched, missing, got = [], [], 0.0
+        for (kind, value), label, weight in self.keywords:
+            if value in words if kind == "term" else (value in skills or ALIAS_STEMS.get(value, set()) & words):
+                matched.append(label)
+                got += weight
+            else:
+                missing.append(label)
+        return (got / self.total if self.total else 0.0), matched, missing
+
+
+@lru_cache(maxsize=64)
+def job_profile(job_description):
+    return JobProfile(job_description)
+
+
+def score_contact(lines):
+    text = "\n".join(lines)
+    found = [name for name, pattern in (("email", EMAIL), ("phone", PHONE), ("profile link", PROFILE_URL))
+             if pattern.search(text)]
+    score = 40 * ("email" in found) + 30 * ("phone" in found) + 30 * ("profile link" in found)
+    missing = [name for name in ("email", "phone", "profile link") if name not in found]
+    return score, ("Email, phone and profile link present." if not missing
+                   else f"Add {', '.join(missing)} so recruiters can reach you.")
+
+
+def score_summary(lines, profile):
+    words = " ".join(lines).split()
+    skills, stems = index_text(" ".join(lines))
+    hits = profile.coverage(skills, stems)[1] if profile else []
+    length = 60 if 15 <= len(words) <= 90 else 35
+    score = length + min(len(hits) * 10, 40)
+    if len(words) < 15:
+        return score, "Summary is very short; add your focus, seniority and two or three key skills."
+    if len(words) > 90:
+        return score, "Summary is long; keep it to three or four lines."
+    return score, ("Summary mentions the role's key skills." if len(hits) >= 3
+                   else "Work more of the job's key skills into the summary.")
+
+
+def score_experience(lines):
+    bullets = [l[2:] for l in lines if l.startswith("- ")] or lines
+    with_metrics = sum(1 for b in bullets if METRIC.search(b))
+    with_verbs = sum(1 for b in bullets if b.split() and stem(b.split()[0].lower().strip(",.")) in ACTION_STEMS)
+    bullet_share = sum(1 for l in lines if l.startswith("- ")) / len(lines)
+    score = round(40 + 20 * bullet_share + 25 * with_metrics / len(bullets) + 15 * with_verbs / len(bullets))
+    if with_metrics < len(bullets) / 2:
+        feedback = f"{with_metrics} of {len(bullets)} bullets quantify results; add numbers (%, users, time saved)."
+    elif with_verbs < len(bullets) / 2:
+        feedback = "Start more bullets with strong action verbs (Built, Led, Reduced)."
+    else:
+        feedback = "Bullets are quantified and start with action verbs."
+    return score, feedback
+
+
+def score_education(lines):
+    text = "\n".join(lines)
+    degree, year = bool(DEGREE.search(text)), bool(YEAR.search(text))
+    score = 40 + 40 * degree + 20 * year
+    if not degree:
+        return score, "Name the degree or qualification explicitly."
+    return score, "Degree and dates are clear." if year else "Add graduation year."
+
+
+def score_skills(lines, profile):
+    skills, _ = index_text("\n".join(lines))
+    if profile and profile.skills:
+        listed = len(skills & profile.skills) / len(profile.skills)
+        missing = sorted(profile.skills - skills)[:4]
+        score = round(40 + 60 * listed)
+        return score, (f"Add the job's skills you have: {', '.join(missing)}." if missing
+                       else "Lists every skill the job asks for.")
+    score = round(40 + 60 * min(len(skills) / 10, 1.0))
+    return score, ("Group skills by category (languages, frameworks, tools)." if len(skills) >= 6
+                   else "List more concrete tools and technologies.")
+
+
+def score_projects(lines):
+    text = "\n".join(lines)
+    score = 50 + 25 * bool(METRIC.search(text)) + 25 * bool(index_text(text)[0])
+    return score, "Name the stack and outcome of each project."
+
+
+def score_sections(resume_text, profile):
+    sections = {}
+    for s in segment(resume_text):
+        sections.setdefault(s["section"], []).extend(s["lines"])
+    if "contact" not in sections:
+        sections["contact"] = resume_text.split("\n")[:5]
+
+    scorers = {
+        "contact":        lambda lines: score_contact(lines),
+        "summary":        lambda lines: score_summary(lines, profile),
+        "experience":     score_experience,
+        "education":      score_education,
+        "skills":         lambda lines: score_skills(lines, profile),
+        "projects":       score_projects,
+        "certifications": lambda lines: (80, "Certifications listed."),
+    }
+    feedback = []
+    for name, (label, core) in SECTION_LABELS.items():
+        if name in sections:
+            score, text = scorers[name](sections[name])
+            feedback.append({"section": label, "score": max(0, min(100, int(score))), "feedback": text})
+        elif core:
+            feedback.append({"section": label, "score": 0, "feedback": f"No {label} section found; add one."})
+    return feedback
+
+
+def formatting_score(resume_text):
+    """0-1: length in a typical one-to-two page range, and bulleted rather than prose"""
+    words = len(resume_text.split())
+    length = 1.0 if 250 <= words <= 1000 else max(0.3, min(words / 250, 1000 / max(words, 1)))
+    lines = [l for l in resume_text.split("\n") if l.strip()]
+    bullets = sum(1 for l in lines if l.startswith("- ")) / len(lines) if lines else 0.0
+    return 0.7 * length + 0.3 * min(bullets * 3, 1.0)
+
+
+def score_resume(resume_text, job_description=""):
+    """atsScore, keywordGaps, sectionFeedback and a breakdown, in the analysis JSON's shape"""
+    text = compact(resume_text)
+    profile = job_profile(job_description.strip()) if job_description and job_description.strip() else None
+    if profile and not profile.keywords:
+        profile = None
+
+    sections = score_sections(text, profile)
+    core = [s["score"] for s in sections if s["section"] in CORE_LABELS]
+    structure = sum(core) / len(core) / 100 if core else 0.0
+    formatting = formatting_score(text)
+
+    if profile:
+        coverage, matched, missing = profile.coverage(*index_text(text))
+        ats = 0.6 * coverage + 0.3 * structure + 0.1 * formatting
+    else:
+        coverage, matched, missing = None, [], []
+        ats = 0.75 * structure + 0.25 * formatting
+
+    return {
+        "atsScore":        max(0, min(100, round(ats * 100))),
+        "keywordGaps":     missing[:MAX_GAPS],
+        "sectionFeedback": sections,
+        "atsBreakdown": {
+            "keywordCoverage": round(coverage, 3) if coverage is not None else None,
+            "matchedKeywords": matched,
+            "structure":       round(structure, 3),
+            "formatting":      round(formatting, 3),
+        },
+    }
+
+
+def score_resumes(resume_texts, job_description=""):
+    """score_resume for many resumes against one JD; the JD is compiled once"""
+    return [score_resume(text, job_description) for text in resume_texts]
@@ -0,0 +1,91 @@
+# backend/bench_answer_score.py
+# Latency of the local answer scorer, and how it separates answer quality.
+#
+# Scores synthetic HR and technical answers of four kinds (low effort,
+# filler-heavy, plain, STAR with numbers), reports per-answer latency
+# (median / p95 / max; the budget is 5 ms), the mean score per kind, and
+# how many answers mode "fast" would keep away from the LLM.
+#
+#   python bench_answer_score.py [--answers 2000]
+
+import sys
+import time
+import random
+import argparse
+import statistics
+
+from answerScorer import score_answer_local, is_low_effort
+
+QUESTIONS = [
+    (None, "Tell me about a time you handled a conflict within your team."),
+    (None, "Describe a project where you had to meet a tight deadline."),
+    (None, "Tell me about a mistake you made and what you learned from it."),
+    (1, "Explain how database indexing improves query performance."),
+    (1, "How would you design a rate limiter for a public API?"),
+    (2, "What happens when you type a URL into the browser and press enter?"),
+]
+FILLER = ["um", "like", "basically", "you know", "kind of", "I guess", "stuff", "actually"]
+TECH   = ["PostgreSQL", "Redis", "Python", "Docker", "Kubernetes", "React", "Kafka", "AWS"]
+
+
+def low_effort(rng, question):
+    return rng.choice(["I don't know.", "Not sure, never done that.", "I would just fix it.",
+                       "It depends on the situation really."])
+
+
+def filler_heavy(rng, question):
+    words = question.lower().rstrip("?.").split()[2:6]
+    parts = [f"{rng.choice(FILLER)} {' '.join(words)}" for _ in range(rng.randint(4, 8))]
+    return ", ".join(parts) + " and stuff like that."
+
+
+def plain(rng, question):
+    topic = " ".join(question.lower().rstrip("?.").split()[-4:])
+    return (f"For {topic} I think the main thing is to understand the problem first. "
+            f"You look at what is needed and then decide on an approach with the team. "
+            f"It is important to communicate clearly and check the result at the end.")
+
+
+def star(rng, question):
+    topic = " ".join(question.lower().rstrip("?.").split()[-4:])
+    return (f"At my previous company we had an issue with {topic}. My task was to fix it before the release. "
+            f"I analyzed the logs, I proposed a plan using {rng.choice(TECH)} and {rng.choice(TECH)}, "
+            f"and I set up a review with the team. As a result, errors dropped by {rng.randint(20, 80)}% "
+            f"and we shipped {rng.randint(1, 5)} days early.")
+
+
+KINDS = {"low effort": low_effort, "filler-heavy": filler_heavy, "plain": plain, "STAR + numbers": star}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--answers", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(21)
+    samples = []
+    for _ in range(args.answers):
+        round_num, question = rng.choice(QUESTIONS)
+        kind = rng.choice(list(KINDS))
+        samples.append((kind, round_num, question, KINDS[kind](rng, question)))
+
+    timings, scores, skipped = [], {}, 0
+    for kind, round_num, question, answer in samples:
+        start = time.perf_counter()
+        result = score_answer_local(question, answer, round_num)
+        timings.append((time.perf_counter() - start) * 1000)
+        scores.setdefault(kind, []).append(result["score"])
+        skipped += is_low_effort(answer)
+
+    timings.sort()
+    print(f"score_answer_local: {statistics.median(timings):.3f} ms median, "
+          f"{timings[int(len(timings) * 0.95) - 1]:.3f} ms p95, {timings[-1]:.3f} ms max "
+          f"({len(timings)} answers, budget 5 ms)")
+    for kind in KINDS:
+        print(f"  {kind:15} mean score {statistics.mean(scores[kind]):.1f}  "
+              f"(min {min(scores[kind])}, max {max(scores[kind])})")
+    print(f"\nmode=fast skips the LLM for {skipped}/{len(samples)} answers ({skipped / len(samples):.0%})")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
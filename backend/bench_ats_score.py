@@ -0,0 +1,61 @@
+# backend/bench_ats_score.py
+# Throughput of the local ATS scorer when a recruiter batch-scores many
+# resumes against one job description.
+#
+# Reports the one-off JobProfile compile time, per-resume scoring time
+# (median / p95) for resumes of 1, 4 and 9 jobs, resumes per second, and
+# checks that scores are deterministic across runs.
+#
+#   python bench_ats_score.py [--resumes 500]
+
+import sys
+import time
+import random
+import argparse
+import statistics
+
+from atsScorer import JobProfile, job_profile, score_resume, score_resumes
+from bench_prompt_budget import SKILLS, make_resume, make_jd
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resumes", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(20)
+    required = rng.sample(SKILLS, 5)
+    jd = make_jd(rng, 10, required)
+    resumes = [make_resume(rng, rng.choice((1, 4, 9)), rng.sample(SKILLS, 4)) for _ in range(args.resumes)]
+
+    start = time.perf_counter()
+    for _ in range(20):
+        JobProfile(jd)
+    print(f"JobProfile compile: {(time.perf_counter() - start) / 20 * 1000:.2f} ms "
+          f"({len(job_profile(jd).keywords)} keywords)")
+
+    timings = {}
+    for text in resumes:
+        start = time.perf_counter()
+        score_resume(text, jd)
+        jobs = text.count("Software Engineer, Company")
+        timings.setdefault(jobs, []).append((time.perf_counter() - start) * 1000)
+    for jobs in sorted(timings):
+        ms = sorted(timings[jobs])
+        print(f"  resumes with {jobs} jobs: {statistics.median(ms):.2f} ms median, "
+              f"{ms[int(len(ms) * 0.95) - 1]:.2f} ms p95 ({len(ms)} resumes)")
+
+    start = time.perf_counter()
+    first = score_resumes(resumes, jd)
+    elapsed = time.perf_counter() - start
+    print(f"\nscore_resumes: {len(resumes)} resumes in {elapsed * 1000:.0f} ms "
+          f"({len(resumes) / elapsed:.0f} resumes/s)")
+
+    second = score_resumes(resumes, jd)
+    print(f"deterministic: {first == second}")
+    scores = [r["atsScore"] for r in first]
+    print(f"atsScore spread: min {min(scores)}, median {statistics.median(scores):.0f}, max {max(scores)}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
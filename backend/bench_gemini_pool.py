@@ -0,0 +1,97 @@
+# backend/bench_gemini_pool.py
+# Verify Gemini connection pooling against a local stub server (no network).
+#
+# Compares a bare requests.post per call (the old transport) with the pooled
+# session and the async httpx client, and reports connections opened, reuse
+# and latency. The stub adds --connect-ms to every new connection to stand in
+# for the TCP + TLS handshake.
+#
+#   python bench_gemini_pool.py [--calls 50] [--concurrency 8] [--latency-ms 20] [--connect-ms 30]
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+
+import requests
+
+from stubServer import start_stub_server
+
+
+def report(name, latencies, connections, elapsed):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{name:<26} {len(latencies):>4} calls  {connections:>4} connections  "
+          f"mean {statistics.mean(latencies) * 1000:>6.1f} ms  p95 {p95 * 1000:>6.1f} ms  "
+          f"total {elapsed:>5.2f} s")
+
+
+def timed(fn, calls):
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(calls):
+        t = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - t)
+    return latencies, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--connect-ms", type=float, default=30)
+    args = parser.parse_args()
+
+    server = start_stub_server(latency=args.latency_ms / 1000, connect_delay=args.connect_ms / 1000)
+    os.environ["GEMINI_API_URL"] = server.url + "/v1/models/stub:generateContent"
+    os.environ["GEMINI_API_KEY"] = "stub"
+    os.environ["GEMINI_RATE_LIMIT_RPS"] = "100000"
+    os.environ["GEMINI_RATE_LIMIT_BURST"] = "100000"
+    import geminiService
+
+    print(f"Stub at {server.url}: {args.latency_ms:.0f} ms per response, "
+          f"{args.connect_ms:.0f} ms per new connection\n")
+
+    # Old transport: a fresh connection for every call
+    payload = geminiService.build_payload("Say hi", 64)
+    url = f"{geminiService.GEMINI_API_URL}?key=stub"
+    latencies, elapsed = timed(lambda: requests.post(url, json=payload, timeout=30).json(), args.calls)
+    report("requests.post per call", latencies, server.counters["connections"], elapsed)
+
+    # Pooled session, sequential
+    server.reset()
+    latencies, elapsed = timed(lambda: geminiService.call_gemini("Say hi", 64), args.calls)
+    report("pooled session", latencies, server.counters["connections"], elapsed)
+
+    # Pooled async client, concurrent
+    server.reset()
+
+    async def run_async():
+        semaphore = asyncio.Semaphore(args.concurrency)
+        latencies = []
+
+        async def one():
+            async with semaphore:
+                t = time.perf_counter()
+                await geminiService.call_gemini_async("Say hi", 64)
+                latencies.append(time.perf_counter() - t)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(args.calls)))
+        return latencies, time.perf_counter() - start
+
+    latencies, elapsed = asyncio.run(run_async())
+    report(f"async client x{args.concurrency}", latencies, server.counters["connections"], elapsed)
+
+    print("\npool_stats():")
+    for key, value in geminiService.pool_stats().items():
+        print(f"  {key}: {value}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+# backend/bench_json_parsers.py
+# Micro-benchmarks for the code that turns every model response into JSON.
+#
+# Runs each parser over a fixed corpus of model-shaped outputs (clean,
+# fenced, leading prose, truncated mid-string, truncated mid-array, and a
+# 20-answer batch result) and reports, per function and case:
+#   ops/s, µs/op  best of --repeat timeit runs
+#   peak KiB      most memory held at once during one call (tracemalloc)
+#   blocks        allocations still alive after the call, i.e. the result
+#   ok            whether the call produced a value
+# json.loads, run where the text is already valid JSON, is the floor; legacy
+# repair_json (the parser before jsonRepair) is the baseline the current code
+# replaced. repair_json, clean_json_response and the two services'
+# extract_json_from_text were all folded into jsonRepair.repair.
+#
+#   python bench_json_parsers.py [--repeat 5] [--output bench_output.txt]
+#
+# The same corpus runs under pytest: tests/test_json_parsers.py checks every
+# parser on it, and `python -m pytest -m bench` also times each one and
+# prints this table in the test summary.
+
+import sys
+import json
+import random
+import timeit
+import argparse
+import tracemalloc
+from datetime import datetime
+
+from jsonRepair import repair, strip_fences
+from jsonStream import ArrayItemStream
+from stubServer import SKILL_GAP_REPLY, questions_reply, answer_result, STREAM_CHUNK_CHARS
+from bench_json_repair import batch_response, legacy_repair_json
+
+
+def cut_after(text, marker, occurrence, extra):
+    """`text` cut `extra` characters after the n-th occurrence of `marker`, as max_tokens would"""
+    pos = -1
+    for _ in range(occurrence):
+        pos = text.index(marker, pos + 1)
+    return text[:pos + len(marker) + extra]
+
+
+def build_corpus():
+    """[(case, text, streamed array key or None)], the same on every run"""
+    rng = random.Random(25)
+    questions = json.dumps(json.loads(questions_reply(7)), indent=2)
+    batch = batch_response(10, rng, 2)
+    return [
+        ("clean",              json.dumps(answer_result(), indent=2),                None),
+        ("fenced",             f"```json\n{questions}\n```",                          "questions"),
+        ("leading prose",      "Here is the analysis you asked for:\n\n" + SKILL_GAP_REPLY, "roadmap"),
+        ("truncated mid-string", cut_after(questions, '"question": "', 5, 18),       "questions"),
+        ("truncated mid-array",  cut_after(batch, '"strengths": [', 7, len('"Relevant example", ')), "results"),
+        ("batch of 20",        batch_response(20, rng, 2),                            "results"),
+    ]
+
+
+def stream_items(key):
+    """Feed the text in streaming-sized chunks, as stream_questions_async does"""
+    def parse(text):
+        parser = ArrayItemStream(key)
+        items = []
+        for i in range(0, len(text), STREAM_CHUNK_CHARS):
+            items.extend(parser.feed(text[i:i + STREAM_CHUNK_CHARS]))
+        return items
+    return parse
+
+
+def parsers(text, key):
+    """(name, function) pairs to run on a case; every function returns a falsy value on failure"""
+    funcs = [("json.loads", json.loads)] if try_call(json.loads, text) else []   # the floor, where it applies
+    funcs += [
+        ("strip_fences",       strip_fences),
+        ("repair",             lambda text: repair(text).value),
+        ("legacy repair_json", legacy_repair_json),
+    ]
+    if key:
+        funcs.append(("ArrayItemStream", stream_items(key)))
+    return funcs
+
+
+def try_call(fn, text):
+    try:
+        return fn(text)
+    except ValueError:
+        return None
+
+
+def ops_per_second(fn, text, repeat):
+    timer = timeit.Timer(lambda: try_call(fn, text))
+    number, _ = timer.autorange()
+    return number / min(timer.repeat(repeat=repeat, number=number))
+
+
+def allocations(fn, text):
+    """(peak bytes during one call, blocks still allocated after it)"""
+    try_call(fn, text)   # warm caches (compiled patterns, interned keys) first
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        result = try_call(fn, text)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    del result
+    return peak - base, blocks
+
+
+HEADER = f"{'case':22}{'function':20}{'chars':>7}{'ops/s':>11}{'µs/op':>9}{'peak KiB':>10}{'blocks':>8}{'ok':>4}"
+
+
+def table_row(case, name, chars, ops, peak, blocks, ok):
+    """One line of the results table (also used by the pytest run, see tests/conftest.py)"""
+    return (f"{case:22}{name:20}{chars:>7}{ops:>11,.0f}{1e6 / ops:>9.1f}"
+            f"{peak / 1024:>10.1f}{blocks:>8}{'yes' if ok else 'no':>4}")
+
+
+def allocation_overhead():
+    """Blocks the measurement itself leaves behind"""
+    return allocations(lambda text: None, "")[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5, help="timeit runs per function; the best is kept")
+    parser.add_argument("--output", help="also append the table to this file (e.g. bench_output.txt)")
+    args = parser.parse_args()
+
+    lines = [f"bench_json_parsers {datetime.now().isoformat(timespec='seconds')}", HEADER]
+    print("\n".join(lines))
+    overhead = allocation_overhead()
+    for case, text, key in build_corpus():
+        for name, fn in parsers(text, key):
+            ok = bool(try_call(fn, text))
+            ops = ops_per_second(fn, text, args.repeat)
+            peak, blocks = allocations(fn, text)
+            lines.append(table_row(case, name, len(text), ops, peak, max(0, blocks - overhead), ok))
+            print(lines[-1], flush=True)
+
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as out:
+            out.write("\n".join(lines) + "\n\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+# backend/bench_json_repair.py
+# Compare the single-pass jsonRepair.repair with the old line-trimming
+# repair_json on a corpus of truncated model outputs.
+#
+#   python bench_json_repair.py [--runs 5]
+
+import re
+import sys
+import json
+import time
+import random
+import argparse
+
+from jsonRepair import repair
+
+
+def legacy_repair_json(text):
+    """repair_json as it was before jsonRepair (kept here as the baseline)"""
+    text = re.sub(r'```json\s*', '', text)
+    text = re.sub(r'```\s*', '', text)
+    text = text.strip()
+
+    brace_pos = text.find('{')
+    if brace_pos == -1:
+        return None
+    text = text[brace_pos:]
+
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+
+    depth = 0
+    end_pos = -1
+    in_string = False
+    escape_next = False
+    for i, ch in enumerate(text):
+        if escape_next:
+            escape_next = False
+            continue
+        if ch == '\\' and in_string:
+            escape_next = True
+            continue
+        if ch == '"':
+            in_string = not in_string
+            continue
+        if in_string:
+            continue
+        if ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                end_pos = i
+                break
+
+    if end_pos != -1:
+        try:
+            return json.loads(text[:end_pos + 1])
+        except json.JSONDecodeError:
+            pass
+
+    lines = text.splitlines()
+    for trim in range(len(lines)):
+        attempt = '\n'.join(lines[:len(lines) - trim]).rstrip().rstrip(',')
+        open_braces   = attempt.count('{') - attempt.count('}')
+        open_brackets = attempt.count('[') - attempt.count(']')
+        attempt += ']' * open_brackets + '}' * open_braces
+        try:
+            return json.loads(attempt)
+        except json.JSONDecodeError:
+            continue
+
+    return None
+
+
+FEEDBACK = [
+    "Solid answer. Mention how you'd handle {edge cases} like empty input.",
+    "Good structure [STAR], but the result lacks a metric.",
+    "Explained \"eventual consistency\" well; add a concrete example.",
+    "Too brief: one sentence.\nExpand on trade-offs, e.g. cost vs. latency.",
+    "Clear and confident. Could reference monitoring (p95, error budgets).",
+]
+
+
+def batch_response(n, rng, indent):
+    """A batch-analyze response like the model produces"""
+    results = [{
+        "index":        i,
+        "score":        rng.randint(3, 9),
+        "feedback":     rng.choice(FEEDBACK),
+        "strengths":    ["Relevant example", "Clear structure"],
+        "improvements": ["Quantify impact", "Be more specific {e.g. numbers}"],
+        "keyPoints":    ["Point A", "Point B", "Point C"],
+    } for i in range(n)]
+    return "```json\n" + json.dumps({"results": results}, indent=indent) + "\n```"
+
+
+def build_corpus(indent, seed=7, per_size=40):
+    rng = random.Random(seed)
+    corpus = []
+    for n in (5, 10, 20):
+        full = batch_response(n, rng, indent)
+        for _ in range(per_size):
+            # Cut somewhere in the back 70% of the document, as max_tokens does
+            cut = rng.randint(int(len(full) * 0.3), len(full) - 5)
+            corpus.append((n, full[:cut]))
+    return corpus
+
+
+def count_items(value):
+    return len(value.get("results", [])) if isinstance(value, dict) else 0
+
+
+def run(name, fn, corpus, runs):
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        values = [fn(text) for _, text in corpus]
+        best = min(best, time.perf_counter() - start)
+    parsed = sum(1 for v in values if v)
+    items = sum(count_items(v) for v in values)
+    print(f"{name:<22} {best * 1000 / len(corpus):>9.3f} ms/call   "
+          f"parsed {parsed:>3}/{len(corpus)}   results recovered {items}")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for label, indent in (("pretty-printed", 2), ("single-line", None)):
+        corpus = build_corpus(indent)
+        chars = sum(len(t) for _, t in corpus) // len(corpus)
+        print(f"{label}: {len(corpus)} truncated batch responses (5/10/20 answers), avg {chars} chars")
+
+        legacy = run("legacy repair_json", legacy_repair_json, corpus, args.runs)
+        single = run("jsonRepair.repair", lambda t: repair(t).value, corpus, args.runs)
+        print(f"speed-up: {legacy / single:.1f}x\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
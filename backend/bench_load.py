@@ -0,0 +1,242 @@
+# backend/bench_load.py
+# Offline load test: every LLM-backed endpoint against the stub LLM server.
+#
+# Starts stubServer with the given latency distribution, truncation rate and
+# 503/429 injection, points both providers at it, serves the app on a local
+# port (Flask's threaded server, or uvicorn + asgi.py) and drives each
+# endpoint with `--concurrency` clients. Prints throughput and p50/p95/p99
+# per endpoint, with the stub's counters (LLM calls, injected faults), and
+# appends the run with its settings to bench_output.txt so runs can be
+# compared over time. The LLM/resume caches and the question bank are off
+# unless --cache is given, so every request reaches the stub.
+#
+#   python bench_load.py [--requests 40] [--concurrency 8] [--latency lognormal:0.3,0.5]
+#                        [--truncate 0.05] [--error-503 0.02] [--error-429 0.02]
+#                        [--endpoints analyze-answer,skill-gap] [--server flask|asgi]
+
+import os
+import sys
+import time
+import math
+import socket
+import random
+import logging
+import argparse
+import threading
+import subprocess
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from stubServer import start_stub_server, parse_latency, llm_reply
+
+TITLES = ["Backend Engineer", "Data Engineer", "Frontend Developer", "DevOps Engineer", "ML Engineer"]
+SKILLS = ["Python", "SQL", "Docker", "Kubernetes", "React", "AWS", "Kafka", "Redis", "Terraform", "PostgreSQL"]
+QUESTIONS = [
+    "Tell me about a time you handled a conflict within your team.",
+    "Explain how database indexing improves query performance.",
+    "How would you design a rate limiter for a public API?",
+    "Describe a project where you had to meet a tight deadline.",
+]
+
+
+def job_description(rng, i):
+    skills = ", ".join(rng.sample(SKILLS, 5))
+    return (f"We are hiring a {rng.choice(TITLES)} (req {i}) to build and run our platform services. "
+            f"Requirements: 3+ years with {skills}. You will design APIs, own deployments, "
+            f"mentor engineers and work closely with product on roadmap priorities.")
+
+
+def answer(rng, i):
+    return (f"At my previous company (case {i}) we had an outage in our {rng.choice(SKILLS)} pipeline. "
+            f"My task was to fix it before the release, so I analysed the logs, proposed a plan with the team "
+            f"and rolled it out in stages. As a result, errors dropped by {rng.randint(20, 80)}% "
+            f"and we shipped {rng.randint(1, 5)} days early.")
+
+
+def resume(rng, i):
+    skills = ", ".join(rng.sample(SKILLS, 6))
+    return (f"Jane Doe {i}\njane{i}@example.com | +1 555 0100\n\n"
+            f"PROFESSIONAL SUMMARY\nBackend engineer with {rng.randint(2, 9)} years of experience.\n\n"
+            f"WORK EXPERIENCE\nSoftware Engineer, Acme Corp (2019-Present)\n"
+            f"- Built REST APIs serving {rng.randint(1, 50)}M requests a day\n"
+            f"- Cut p95 latency by {rng.randint(10, 60)}% with caching\n\n"
+            f"EDUCATION\nB.Sc. Computer Science, State University\n\nSKILLS\n{skills}\n")
+
+
+# Each builder returns (path, requests keyword arguments) for request number i
+ENDPOINTS = {
+    "create-interview": lambda rng, i: ("/api/create-interview", {"json": {
+        "jobTitle": rng.choice(TITLES), "jobDescription": job_description(rng, i),
+        "experienceLevel": "mid-level", "interviewType": rng.choice(["technical", "behavioral", "mixed"]),
+        "questionsCount": 5,
+    }}),
+    "analyze-answer": lambda rng, i: ("/api/analyze-answer", {"json": {
+        "question": rng.choice(QUESTIONS), "answer": answer(rng, i), "round": rng.choice([None, 1, 2]),
+        "jobTitle": rng.choice(TITLES), "experienceLevel": "mid-level", "mode": "full",
+    }}),
+    "batch-analyze-answers": lambda rng, i: ("/api/batch-analyze-answers", {"json": {
+        "answers": [{"questionId": q + 1, "question": rng.choice(QUESTIONS), "answer": answer(rng, f"{i}.{q}"),
+                     "round": rng.choice([None, 1, 2])} for q in range(5)],
+        "jobTitle": rng.choice(TITLES), "experienceLevel": "mid-level", "mode": "full",
+    }}),
+    "analyze-resume": lambda rng, i: ("/api/analyze-resume", {
+        "files": {"resume": (f"resume-{i}.txt", resume(rng, i).encode("utf-8"), "text/plain")},
+        "data": {"jobDescription": job_description(rng, i)},
+    }),
+    "skill-gap": lambda rng, i: ("/api/skill-gap", {
+        "data": {"jobDescription": job_description(rng, i), "resumeText": resume(rng, i)},
+    }),
+}
+
+
+def configure_environment(stub, args):
+    """Point both providers at the stub; must run before app is imported"""
+    os.environ.update({
+        "HF_API_KEY": "stub", "HF_BASE_URL": stub.url,
+        "GEMINI_API_KEY": "stub", "GEMINI_API_URL": stub.url + "/v1/models/stub:generateContent",
+        "HF_RATE_LIMIT_RPS": "100000", "HF_RATE_LIMIT_BURST": "100000",
+        "GEMINI_RATE_LIMIT_RPS": "100000", "GEMINI_RATE_LIMIT_BURST": "100000",
+    })
+    if not args.cache:
+        os.environ.update({"LLM_CACHE_BACKEND": "off", "RESUME_CACHE": "off", "QUESTION_BANK": "off"})
+    os.environ.setdefault("LOG_LEVEL", "CRITICAL")   # failures are counted in the table, not logged
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_app(kind):
+    """Serve the app on a background thread; returns its base URL once /api/health answers"""
+    port = free_port()
+    if kind == "asgi":
+        import uvicorn
+        from asgi import application
+        server = uvicorn.Server(uvicorn.Config(application, host="127.0.0.1", port=port, log_level="error"))
+        target = server.run
+    else:
+        from werkzeug.serving import make_server
+        from app import app
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)   # no access-log line per request
+        target = make_server("127.0.0.1", port, app, threaded=True).serve_forever
+    threading.Thread(target=target, name="bench-app", daemon=True).start()
+
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            requests.get(url + "/api/health", timeout=1)
+            return url
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    raise RuntimeError(f"{kind} server did not start on port {port}")
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+def run_endpoint(base_url, name, args, stub):
+    """Drive one endpoint; returns its result row"""
+    rng = random.Random(f"{args.seed}-{name}")
+    calls = [ENDPOINTS[name](rng, i) for i in range(args.requests)]
+    local = threading.local()
+
+    def send(call):
+        path, kwargs = call
+        if not hasattr(local, "session"):
+            local.session = requests.Session()   # one keep-alive connection per client thread
+        session = local.session
+        start = time.perf_counter()
+        try:
+            ok = session.post(base_url + path, timeout=args.timeout, **kwargs).status_code < 400
+        except requests.RequestException:
+            ok = False
+        return time.perf_counter() - start, ok
+
+    stub.reset()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(send, calls))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(seconds * 1000 for seconds, _ in results)
+    ok = sum(1 for _, success in results if success)
+    return {
+        "endpoint": name, "ok": ok, "errors": len(results) - ok, "rps": len(results) / elapsed,
+        "p50": percentile(latencies, 50), "p95": percentile(latencies, 95), "p99": percentile(latencies, 99),
+        "llm": stub.counters["requests"], "503": stub.counters["503"], "429": stub.counters["429"],
+        "truncated": stub.counters["truncated"],
+    }
+
+
+COLUMNS = (f"{'endpoint':24}{'ok':>5}{'err':>5}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+           f"{'llm':>6}{'503':>5}{'429':>5}{'trunc':>6}")
+
+
+def format_row(r):
+    return (f"{r['endpoint']:24}{r['ok']:>5}{r['errors']:>5}{r['rps']:>8.2f}{r['p50']:>9.0f}"
+            f"{r['p95']:>9.0f}{r['p99']:>9.0f}{r['llm']:>6}{r['503']:>5}{r['429']:>5}{r['truncated']:>6}")
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              timeout=5).stdout.strip() or "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=40, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", default="lognormal:0.3,0.5",
+                        help="stub latency in seconds: N, uniform:LOW,HIGH, lognormal:MEDIAN,SIGMA or exp:MEAN")
+    parser.add_argument("--truncate", type=float, default=0.05, help="share of replies cut short")
+    parser.add_argument("--error-503", type=float, default=0.02, help="share of LLM calls answered 503")
+    parser.add_argument("--error-429", type=float, default=0.02, help="share of LLM calls answered 429")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="comma-separated subset")
+    parser.add_argument("--server", choices=["flask", "asgi"], default="flask")
+    parser.add_argument("--cache", action="store_true", help="keep the LLM/resume caches and question bank on")
+    parser.add_argument("--timeout", type=float, default=120, help="client timeout per request, seconds")
+    parser.add_argument("--seed", type=int, default=24)
+    parser.add_argument("--output", default="bench_output.txt")
+    args = parser.parse_args()
+
+    endpoints = [e.strip() for e in args.endpoints.split(",") if e.strip()]
+    unknown = [e for e in endpoints if e not in ENDPOINTS]
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(unknown)} (choose from {', '.join(ENDPOINTS)})")
+
+    random.seed(args.seed)
+    stub = start_stub_server(latency=parse_latency(args.latency), reply=llm_reply, truncate_rate=args.truncate,
+                             error_rates={503: args.error_503, 429: args.error_429})
+    configure_environment(stub, args)
+    base_url = start_app(args.server)
+
+    header = (f"bench_load {datetime.now().isoformat(timespec='seconds')} rev {git_revision()} | "
+              f"server={args.server} requests={args.requests} concurrency={args.concurrency} "
+              f"latency={args.latency} truncate={args.truncate} 503={args.error_503} 429={args.error_429} "
+              f"cache={'on' if args.cache else 'off'}")
+    print(header + "\n\n" + COLUMNS)
+
+    lines = [header, COLUMNS]
+    for name in endpoints:
+        lines.append(format_row(run_endpoint(base_url, name, args, stub)))
+        print(lines[-1], flush=True)
+
+    with open(args.output, "a", encoding="utf-8") as out:
+        out.write("\n".join(lines) + "\n\n")
+    print(f"\nAppended to {args.output}")
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
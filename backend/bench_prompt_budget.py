@@ -0,0 +1,199 @@
+# backend/bench_prompt_budget.py
+# Compare the old fixed character cut-offs with promptBudget on a corpus of
+# synthetic resumes, job descriptions and answers of varying length.
+#
+# Reports prompt-input tokens per request for each endpoint (old vs new) and
+# how many of the JD's required skills that appear in the resume survive
+# into the prompt, since dropping the wrong half of a resume is worse than
+# spending a few tokens. A second table compares packing resumes with plain
+# fit() and with resumeSections.fit_resume(): skills and sections kept.
+#
+#   python bench_prompt_budget.py [--per-size 30]
+
+import io
+import sys
+import random
+import contextlib
+import argparse
+import statistics
+
+from promptBudget import fit, fit_fields, compact, allocate, estimate_tokens, input_budget, JD_FOCUS
+from resumeSections import fit_resume
+
+SKILLS = ["Python", "Go", "Rust", "Kafka", "Kubernetes", "PostgreSQL", "Terraform", "React",
+          "GraphQL", "Airflow", "Spark", "Redis", "AWS", "gRPC", "TypeScript", "Docker"]
+VERBS = ["Built", "Led", "Designed", "Migrated", "Maintained", "Optimised", "Shipped", "Automated"]
+THINGS = ["billing services", "internal dashboards", "the onboarding flow", "CI pipelines",
+          "a reporting backend", "customer-facing APIs", "data ingestion jobs", "the search index"]
+BOILERPLATE = [
+    "We are an equal opportunity employer and value diversity at our company.",
+    "All qualified applicants will receive consideration without regard to race, religion or gender.",
+    "If you need a reasonable accommodation during the application process, contact us.",
+    "Click here to read our privacy policy.",
+]
+
+
+def noisy(line, rng):
+    """PDF-extraction style whitespace"""
+    return line.replace(" ", rng.choice([" ", "  ", "   ", " \t"])) + rng.choice(["", " ", "   "])
+
+
+def make_resume(rng, jobs, skills):
+    lines = ["JANE DOE", "Senior Software Engineer", "jane@example.com   |   +1 555 0100",
+             "linkedin.com/in/jane   |   github.com/jane", "221B Baker Street, London, NW1 6XE", "",
+             "PROFESSIONAL SUMMARY", "Engineer with a focus on reliable backend systems.", "",
+             "WORK EXPERIENCE"]
+    for j in range(jobs):
+        lines += ["", f"Software Engineer, Company {j}    20{10 + j}-20{11 + j}"]
+        for _ in range(rng.randint(4, 7)):
+            lines.append(noisy(f"• {rng.choice(VERBS)} {rng.choice(THINGS)} used by {rng.randint(2, 90)}k users", rng))
+        if j % 3 == 2:
+            lines += ["", f"Page {j // 3 + 1} of {jobs // 3 + 1}", ""]
+    # The skills that matter often sit at the end of a long resume
+    lines += ["", "EDUCATION", "B.Sc. Computer Science, University of Somewhere, 2009",
+              "", "PROJECTS", f"• Side project: streaming pipeline in {skills[0]} with {skills[1]}",
+              "", "SKILLS", ", ".join(skills + rng.sample(SKILLS, 3)),
+              "", "CERTIFICATIONS", f"• {rng.choice(['AWS Solutions Architect', 'CKA', 'Terraform Associate'])}",
+              "", "INTERESTS", "Climbing, chess, open source", "", "REFERENCES", "Available upon request"]
+    return "\n".join(lines)
+
+
+SECTIONS = ["PROFESSIONAL SUMMARY", "WORK EXPERIENCE", "EDUCATION", "PROJECTS", "SKILLS", "CERTIFICATIONS"]
+
+
+def make_jd(rng, paragraphs, skills):
+    lines = ["About us", "We are a fast-growing company building tools for teams.", ""]
+    for _ in range(paragraphs):
+        lines.append(noisy(f"You will work on {rng.choice(THINGS)} and {rng.choice(THINGS)} with a small team.", rng))
+    lines += ["", "Requirements", *(f"- Production experience with {s}" for s in skills), "",
+              "Benefits", "- Remote friendly", "- Learning budget", ""]
+    lines += rng.sample(BOILERPLATE, 3)
+    return "\n".join(lines)
+
+
+def make_answer(rng, words):
+    return " ".join(rng.choice(VERBS + THINGS + ["because", "so", "then", "we", "I"]) for _ in range(words))
+
+
+def build_corpus(per_size, seed=11):
+    rng = random.Random(seed)
+    corpus = []
+    for jobs, paragraphs, words in ((1, 2, 40), (4, 6, 150), (9, 14, 400)):
+        for _ in range(per_size):
+            skills = rng.sample(SKILLS, 4)
+            corpus.append({
+                "size":    f"{jobs} jobs",
+                "skills":  skills,
+                "resume":  make_resume(rng, jobs, skills),
+                "jd":      make_jd(rng, paragraphs, skills),
+                "answers": [("Describe a system you designed and the trade-offs you made.",
+                             make_answer(rng, rng.randint(words // 4, words))) for _ in range(6)],
+            })
+    return corpus
+
+
+# Variable parts of each prompt as the routes built them before promptBudget
+def old_inputs(item):
+    resume, jd = item["resume"], item["jd"]
+    q, a = item["answers"][0]
+    return {
+        "extract_skills": [jd[:2500]],
+        "analyze_answer": [q[:300], a[:1200]],
+        "batch_analyze":  [q[:150] + a[:300] for q, a in item["answers"]],
+        "analyze_resume": [resume[:3000], jd[:1500]],
+        "rewrite_resume": [resume[:2500]],
+        "skill_gap":      [jd[:2500], resume[:2500]],
+    }
+
+
+def new_inputs(item, resume_fit=fit_resume):
+    resume, jd = item["resume"], item["jd"]
+    q, a = item["answers"][0]
+    inputs = {"resume": resume, "jobDescription": jd}
+    queries = {"resume": jd, "jobDescription": JD_FOCUS}
+    answer = fit_fields("analyze_answer", {"question": q, "answer": a},
+                        weights={"question": 1, "answer": 3}, queries={"answer": q})
+    analysis = fit_fields("analyze_resume", inputs, {"resume": 3, "jobDescription": 1}, queries,
+                          fitters={"resume": resume_fit})
+    gap = fit_fields("skill_gap", {"jobDescription": jd, "resume": resume},
+                     queries={"jobDescription": JD_FOCUS, "resume": jd}, fitters={"resume": resume_fit})
+
+    questions = [fit(q, 40) for q, _ in item["answers"]]
+    answers = [compact(a) for _, a in item["answers"]]
+    shares = allocate([estimate_tokens(a) for a in answers],
+                      input_budget("batch_analyze") - sum(map(estimate_tokens, questions)))
+    return {
+        "extract_skills": [fit(jd, input_budget("extract_skills"), JD_FOCUS)],
+        "analyze_answer": list(answer.values()),
+        "batch_analyze":  [q + fit(a, s, q, compacted=True) for q, a, s in zip(questions, answers, shares)],
+        "analyze_resume": list(analysis.values()),
+        "rewrite_resume": [resume_fit(resume, input_budget("rewrite_resume"), jd)],
+        "skill_gap":      list(gap.values()),
+    }
+
+
+def coverage(texts, skills):
+    joined = "\n".join(texts)
+    return sum(1 for s in skills if s in joined) / len(skills)
+
+
+def sections_kept(texts):
+    joined = "\n".join(texts)
+    return sum(1 for s in SECTIONS if s in joined) / len(SECTIONS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--per-size", type=int, default=30)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.per_size)
+    print(f"{len(corpus)} requests: resumes of 1/4/9 jobs, JDs with boilerplate, 6 answers each\n")
+
+    with contextlib.redirect_stdout(io.StringIO()):   # fit_fields logs every trim
+        rows = [(item, old_inputs(item), new_inputs(item)) for item in corpus]
+        plain = [new_inputs(item, resume_fit=fit) for item in corpus]
+
+    print(f"{'endpoint':<16} {'old tok':>8} {'new tok':>8} {'saved/req':>10} {'saved':>7}   "
+          f"{'resume skills kept old → new':>28}")
+    total_old = total_new = 0
+    for endpoint in rows[0][1]:
+        old = [sum(map(estimate_tokens, o[endpoint])) for _, o, _ in rows]
+        new = [sum(map(estimate_tokens, n[endpoint])) for _, _, n in rows]
+        total_old += sum(old)
+        total_new += sum(new)
+        saved = statistics.mean(old) - statistics.mean(new)
+        kept = ""
+        if endpoint in ("analyze_resume", "rewrite_resume", "skill_gap"):
+            kept_old = statistics.mean(coverage(o[endpoint], item["skills"]) for item, o, _ in rows)
+            kept_new = statistics.mean(coverage(n[endpoint], item["skills"]) for item, _, n in rows)
+            kept = f"{kept_old:>6.0%} → {kept_new:.0%}"
+        print(f"{endpoint:<16} {statistics.mean(old):>8.0f} {statistics.mean(new):>8.0f} "
+              f"{saved:>10.0f} {saved / statistics.mean(old):>7.0%}   {kept:>28}")
+
+    print(f"\nall endpoints: {(total_old - total_new) / len(rows):.0f} tokens saved per request "
+          f"({(total_old - total_new) / total_old:.0%})")
+
+    by_size = {}
+    for item, o, n in rows:
+        s = by_size.setdefault(item["size"], [0, 0])
+        s[0] += sum(estimate_tokens(t) for texts in o.values() for t in texts)
+        s[1] += sum(estimate_tokens(t) for texts in n.values() for t in texts)
+    for size, (old, new) in by_size.items():
+        print(f"  resumes with {size:<7}: {(old - new) / args.per_size:>6.0f} tokens saved per request")
+
+    print(f"\n{'resume packing':<16} {'fit tok':>8} {'sect tok':>8}   {'skills fit → sections':>22}   "
+          f"{'sections fit → sections':>24}")
+    for endpoint in ("analyze_resume", "rewrite_resume", "skill_gap"):
+        fit_tok = statistics.mean(sum(map(estimate_tokens, p[endpoint])) for p in plain)
+        sect_tok = statistics.mean(sum(map(estimate_tokens, n[endpoint])) for _, _, n in rows)
+        skills = [statistics.mean(coverage(p[endpoint], item["skills"]) for item, p in zip(corpus, plain)),
+                  statistics.mean(coverage(n[endpoint], item["skills"]) for item, _, n in rows)]
+        kept = [statistics.mean(sections_kept(p[endpoint]) for p in plain),
+                statistics.mean(sections_kept(n[endpoint]) for _, _, n in rows)]
+        print(f"{endpoint:<16} {fit_tok:>8.0f} {sect_tok:>8.0f}   {skills[0]:>13.0%} → {skills[1]:<6.0%}   "
+              f"{kept[0]:>15.0%} → {kept[1]:.0%}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
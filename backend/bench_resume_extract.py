@@ -0,0 +1,122 @@
+# backend/bench_resume_extract.py
+# Compare the old resume extraction (every page, `text +=`) with
+# resumeExtractor on a generated corpus of PDFs and DOCX files, from
+# one-page resumes to a 400-page document.
+#
+# Reports time per file and characters returned for each, and checks that
+# the extractor stops at RESUME_MAX_PAGES / RESUME_MAX_CHARS and returns
+# within RESUME_EXTRACT_TIMEOUT however long the file is.
+#
+#   python bench_resume_extract.py [--repeat 3]
+
+import io
+import sys
+import time
+import random
+import argparse
+import statistics
+
+import PyPDF2
+import docx
+
+import resumeExtractor
+from resumeExtractor import extract_text_from_pdf, extract_text_from_docx
+
+WORDS = ["built", "led", "designed", "migrated", "billing", "services", "python", "kafka",
+         "kubernetes", "dashboards", "pipelines", "customers", "latency", "reduced", "team"]
+
+
+def make_lines(rng, count):
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 12))).capitalize()
+            for _ in range(count)]
+
+
+def make_pdf(pages, lines_per_page, rng):
+    """Minimal PDF with one Helvetica text stream per page"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for _ in range(pages):
+        ops = ["BT", "/F1 10 Tf", "14 TL", "50 780 Td"]
+        ops += [f"({line}) Tj T*" for line in make_lines(rng, lines_per_page)]
+        stream = "\n".join(ops + ["ET"])
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>"
+
+    out, offsets = io.BytesIO(), []
+    out.write(b"%PDF-1.4\n")
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def make_docx(paragraphs, rng):
+    document = docx.Document()
+    for line in make_lines(rng, paragraphs):
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+# As app.py extracted text before resumeExtractor
+def old_pdf(data):
+    text = ""
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    for page in reader.pages:
+        text += page.extract_text() or ""
+    return text
+
+
+def old_docx(data):
+    return "\n".join(p.text for p in docx.Document(io.BytesIO(data)).paragraphs)
+
+
+def timed(fn, data, repeat):
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(data)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000, len(result or "")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    rng = random.Random(16)
+
+    corpus = [(f"pdf {pages:>3} pages", "pdf", make_pdf(pages, 45, rng)) for pages in (1, 2, 5, 30, 120, 400)]
+    corpus += [(f"docx {paras:>4} paras", "docx", make_docx(paras, rng)) for paras in (60, 400, 3000)]
+
+    print(f"limits: {resumeExtractor.MAX_PAGES} pages, {resumeExtractor.MAX_CHARS} chars, "
+          f"{resumeExtractor.EXTRACT_TIMEOUT:g}s, pool from {resumeExtractor.PARALLEL_MIN_PAGES} pages "
+          f"with {resumeExtractor.EXTRACT_WORKERS} workers\n")
+    print(f"{'file':<18} {'size':>8} {'old ms':>9} {'old chars':>10} {'new ms':>9} {'new chars':>10} {'speedup':>8}")
+    for name, kind, data in corpus:
+        old_fn, new_fn = (old_pdf, extract_text_from_pdf) if kind == "pdf" else (old_docx, extract_text_from_docx)
+        old_ms, old_chars = timed(old_fn, data, args.repeat)
+        new_ms, new_chars = timed(new_fn, data, args.repeat)
+        print(f"{name:<18} {len(data) // 1024:>6}KB {old_ms:>9.1f} {old_chars:>10} {new_ms:>9.1f} "
+              f"{new_chars:>10} {old_ms / new_ms:>7.1f}x")
+
+    # A file that cannot finish in time still returns promptly
+    big = corpus[5][2]
+    start = time.perf_counter()
+    text = resumeExtractor.extract_pdf_parallel(big, 400, max_chars=10 ** 9, timeout=0.5)
+    print(f"\n400 pages, no page/char limit, 0.5s timeout: returned in "
+          f"{time.perf_counter() - start:.2f}s with {len(text)} chars")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
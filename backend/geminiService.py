@@ -1,100 +1,212 @@
 # backend/geminiService.py
 
 import os
+import time
+import asyncio
+import weakref
+import threading
 import requests
+import httpx
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
-import time
-import json
-import re
+
+from rateLimiter import create_bucket
+from jsonRepair import repair, repair_async
+from responseCache import response_cache, make_key, get_ttl
+from metrics import llm_seconds, llm_wait_seconds, prompt_chars, completion_chars
+from logger import get_logger
 
 load_dotenv()
 
+log = get_logger("geminiService")
+
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 # Using Gemini 1.5 Flash with v1 API (stable)
-GEMINI_API_URL = (
+GEMINI_API_URL = os.getenv("GEMINI_API_URL", (
     "https://generativelanguage.googleapis.com/v1/"
     "models/gemini-1.5-flash:generateContent"
-)
+))
+GEMINI_MODEL = GEMINI_API_URL.rsplit("/", 1)[-1].split(":")[0]
 
 HEADERS = {
     "Content-Type": "application/json"
 }
 
-RATE_LIMIT_DELAY = 5  # 5 seconds between requests
-last_request_time = 0
+TEMPERATURE = 0.7
 
+# Free tier: 15 requests/minute -> 0.25/sec with a small burst
+RATE_LIMIT_RPS = float(os.getenv("GEMINI_RATE_LIMIT_RPS", 0.25))
+RATE_LIMIT_BURST = int(os.getenv("GEMINI_RATE_LIMIT_BURST", 3))
+rate_limiter = create_bucket("Gemini", RATE_LIMIT_RPS, RATE_LIMIT_BURST)
 
-def rate_limit():
-    """Enforce rate limiting between API calls"""
-    global last_request_time
-    now = time.time()
-    elapsed = now - last_request_time
-    if elapsed < RATE_LIMIT_DELAY:
-        time.sleep(RATE_LIMIT_DELAY - elapsed)
-    last_request_time = time.time()
 
+# Pooled keep-alive transport: one requests.Session per process for sync
+# callers, one httpx client per event loop for async ones. A connect timeout
+# separate from the read timeout fails fast on network trouble while still
+# giving long generations time to finish.
+POOL_SIZE       = int(os.getenv("GEMINI_POOL_SIZE", 10))
+CONNECT_TIMEOUT = float(os.getenv("GEMINI_CONNECT_TIMEOUT", 5))
+READ_TIMEOUT    = float(os.getenv("GEMINI_READ_TIMEOUT", 30))
 
-def extract_json_from_text(text):
-    """Extract JSON from text, handling markdown code blocks"""
-    # Remove markdown code blocks
-    text = re.sub(r'```json\s*', '', text)
-    text = re.sub(r'```\s*', '', text)
-    text = text.strip()
-    
-    # Try to find JSON object
-    json_match = re.search(r'\{.*\}', text, re.DOTALL)
-    if json_match:
-        return json_match.group(0)
-    
-    return text
+session = None
+session_lock = threading.Lock()
 
+# One async HTTP client per event loop (the background loop, or the ASGI server's)
+async_clients = weakref.WeakKeyDictionary()
 
-def call_gemini(prompt, max_tokens=2048):
-    """Make a request to Gemini API with rate limiting"""
-    if not GEMINI_API_KEY:
-        raise Exception("Gemini API key missing in .env file")
+# Requests sent vs TCP connections opened, per transport
+pool_counters = {"sync": {"requests": 0}, "async": {"requests": 0, "connections": 0}}
+pool_counters_lock = threading.Lock()
+
+
+def rate_limit(deadline=None):
+    """Wait for a token-bucket slot; raises RateLimitExceeded if the queue is too long"""
+    return rate_limiter.acquire(deadline)
+
+
+async def rate_limit_async(deadline=None):
+    """Like rate_limit(), but waits for the slot without blocking the event loop"""
+    wait = rate_limiter.reserve(deadline)
+    llm_wait_seconds.observe(max(wait, 0.0), "gemini")
+    if wait > 0:
+        await asyncio.sleep(wait)
+    return wait
+
+
+def get_session():
+    """Get or create the pooled requests.Session shared by sync callers"""
+    global session
+    with session_lock:
+        if session is None:
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+    return session
+
+
+def get_async_client():
+    """Get or create the httpx client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    if loop not in async_clients:
+        async_clients[loop] = httpx.AsyncClient(
+            headers=HEADERS,
+            timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE),
+        )
+    return async_clients[loop]
 
-    rate_limit()
 
-    payload = {
+def count_request(transport):
+    with pool_counters_lock:
+        pool_counters[transport]["requests"] += 1
+
+
+async def trace_connections(event, info):
+    """httpx trace hook: counts new TCP connections on the async transport"""
+    if event == "connection.connect_tcp.complete":
+        with pool_counters_lock:
+            pool_counters["async"]["connections"] += 1
+
+
+def sync_connections():
+    """Connections opened by the session's urllib3 pools"""
+    if session is None:
+        return 0
+    opened = 0
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+    return opened
+
+
+def pool_stats():
+    """Connection reuse for the Gemini transports"""
+    with pool_counters_lock:
+        counters = {
+            "sync":  {**pool_counters["sync"], "connections": sync_connections()},
+            "async": dict(pool_counters["async"]),
+        }
+    for c in counters.values():
+        c["reused"] = max(c["requests"] - c["connections"], 0)
+        c["reuseRatio"] = round(c["reused"] / c["requests"], 3) if c["requests"] else 0.0
+    return {
+        "poolSize":       POOL_SIZE,
+        "connectTimeout": CONNECT_TIMEOUT,
+        "readTimeout":    READ_TIMEOUT,
+        **counters,
+    }
+
+
+def build_payload(prompt, max_tokens):
+    return {
         "contents": [
             {
                 "parts": [{"text": prompt}]
             }
         ],
         "generationConfig": {
-            "temperature": 0.7,
+            "temperature": TEMPERATURE,
             "topP": 0.95,
             "maxOutputTokens": max_tokens
         }
     }
 
-    try:
-        response = requests.post(
-            f"{GEMINI_API_URL}?key={GEMINI_API_KEY}",
-            headers=HEADERS,
-            json=payload,
-            timeout=30
+
+def check_response(status_code, text):
+    """Translate Gemini error statuses into readable exceptions"""
+    if status_code == 429:
+        raise Exception(
+            "Rate limit exceeded. Please wait 1-2 minutes and try again. "
+            "Free tier: 15 requests/minute, 1,500/day."
         )
 
-        if response.status_code == 429:
-            raise Exception(
-                "Rate limit exceeded. Please wait 1-2 minutes and try again. "
-                "Free tier: 15 requests/minute, 1,500/day."
-            )
+    if status_code == 403:
+        raise Exception("Invalid API key. Please check your GEMINI_API_KEY in .env")
 
-        if response.status_code == 403:
-            raise Exception("Invalid API key. Please check your GEMINI_API_KEY in .env")
+    if status_code == 404:
+        raise Exception(
+            "Model not found. Run 'python list_models.py' to see available models."
+        )
+
+    if status_code >= 400:
+        raise Exception(f"Gemini API error ({status_code}): {text}")
 
-        if response.status_code == 404:
-            raise Exception(
-                "Model not found. Run 'python list_models.py' to see available models."
-            )
 
-        if not response.ok:
-            raise Exception(f"Gemini API error ({response.status_code}): {response.text}")
+def response_text(data):
+    return data["candidates"][0]["content"]["parts"][0]["text"]
 
+
+def parse_gemini_json(data):
+    """Pull the completion out of a Gemini response and parse it once"""
+    text = response_text(data)
+    parsed = repair(text).value
+    if not isinstance(parsed, dict):
+        log.warning("⚠️  JSON validation failed", extra={"fields": {"rawResponse": text[:500]}})
+        raise Exception("Gemini returned invalid JSON format")
+    return parsed
+
+
+def call_gemini(prompt, max_tokens=2048, deadline=None):
+    """Make a request to Gemini API with rate limiting"""
+    if not GEMINI_API_KEY:
+        raise Exception("Gemini API key missing in .env file")
+
+    rate_limit(deadline)
+
+    try:
+        count_request("sync")
+        response = get_session().post(
+            f"{GEMINI_API_URL}?key={GEMINI_API_KEY}",
+            json=build_payload(prompt, max_tokens),
+            timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
+        )
+        check_response(response.status_code, response.text)
         return response.json()
         
     except requests.exceptions.Timeout:
@@ -103,6 +215,63 @@ def call_gemini(prompt, max_tokens=2048):
         raise Exception("Cannot connect to Gemini API. Check your internet connection.")
 
 
+async def call_gemini_async(prompt, max_tokens=2048, deadline=None):
+    """Async variant of call_gemini() for use on an event loop"""
+    if not GEMINI_API_KEY:
+        raise Exception("Gemini API key missing in .env file")
+
+    await rate_limit_async(deadline)
+
+    try:
+        count_request("async")
+        response = await get_async_client().post(
+            f"{GEMINI_API_URL}?key={GEMINI_API_KEY}",
+            json=build_payload(prompt, max_tokens),
+            extensions={"trace": trace_connections}
+        )
+        check_response(response.status_code, response.text)
+        return response.json()
+
+    except httpx.TimeoutException:
+        raise Exception("Request timeout. Please check your internet connection.")
+    except httpx.ConnectError:
+        raise Exception("Cannot connect to Gemini API. Check your internet connection.")
+
+
+async def complete_gemini_async(prompt, max_tokens=2048, deadline=None, cache_endpoint=None,
+                                expect_json=True, fail_fast=True):
+    """Provider entry point for llmRouter: (text, RepairResult), same contract as
+    huggingfaceService.complete_huggingface_async. Gemini calls are never retried
+    here, so fail_fast is accepted only for signature parity."""
+    ttl = get_ttl(cache_endpoint) if response_cache else 0
+    cache_key = make_key(GEMINI_API_URL, "", prompt, max_tokens, TEMPERATURE) if ttl else None
+    if cache_key:
+        cached = await response_cache.get_async(cache_key)
+        if cached is not None:
+            log.debug("⚡ Cache hit (%s, Gemini)", cache_endpoint)
+            return cached, (await repair_async(cached)) if expect_json else None
+
+    prompt_chars.observe(len(prompt), "gemini")
+    call_start = time.perf_counter()
+    try:
+        text = response_text(await call_gemini_async(prompt, max_tokens, deadline))
+    except Exception:
+        llm_seconds.observe(time.perf_counter() - call_start, "gemini", GEMINI_MODEL, "error")
+        raise
+    llm_seconds.observe(time.perf_counter() - call_start, "gemini", GEMINI_MODEL, "ok")
+    log.debug("📝 Gemini returned %s characters", len(text))
+    completion_chars.observe(len(text), "gemini")
+    if not expect_json:
+        if cache_key and text.strip():
+            await response_cache.set_async(cache_key, text, ttl)
+        return text, None
+
+    result = await repair_async(text)
+    if cache_key and result.complete:
+        await response_cache.set_async(cache_key, text, ttl)
+    return text, result
+
+
 def extract_skills(job_title, job_description, experience_level):
     """Extract skills from job description using Gemini"""
     prompt = f"""Analyze this job posting and extract skills. Return ONLY valid JSON with NO markdown formatting.
@@ -122,20 +291,7 @@ Return this exact JSON structure:
 }}"""
 
     data = call_gemini(prompt, max_tokens=1024)
-    text = data["candidates"][0]["content"]["parts"][0]["text"]
-    
-    # Clean and validate JSON
-    cleaned_text = extract_json_from_text(text)
-    
-    # Validate it's proper JSON
-    try:
-        json.loads(cleaned_text)
-    except json.JSONDecodeError as e:
-        print(f"⚠️  JSON validation failed: {e}")
-        print(f"Raw response: {text[:500]}")
-        raise Exception("Gemini returned invalid JSON format")
-    
-    return cleaned_text
+    return parse_gemini_json(data)
 
 
 def generate_questions(job_title, job_description, experience_level, interview_type, skills_json):
@@ -177,17 +333,4 @@ Return this exact JSON structure:
 Make questions specific, challenging, and relevant to the {experience_level} level."""
 
     data = call_gemini(prompt, max_tokens=2048)
-    text = data["candidates"][0]["content"]["parts"][0]["text"]
-    
-    # Clean and validate JSON
-    cleaned_text = extract_json_from_text(text)
-    
-    # Validate it's proper JSON
-    try:
-        json.loads(cleaned_text)
-    except json.JSONDecodeError as e:
-        print(f"⚠️  JSON validation failed: {e}")
-        print(f"Raw response: {text[:500]}")
-        raise Exception("Gemini returned invalid JSON format")
-    
-    return cleaned_text
\ No newline at end of file
+    return parse_gemini_json(data)
\ No newline at end of file
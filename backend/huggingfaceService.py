@@ -5,21 +5,38 @@
 import os
 from dotenv import load_dotenv
 import time
-import json
-import re
+import asyncio
+import weakref
+import threading
+from collections import deque
+
+from asyncRuntime import run_sync
+from jsonStream import ArrayItemStream
+from jsonRepair import repair_async, log_repair
+from rateLimiter import create_bucket
+from responseCache import response_cache, make_key, get_ttl
+from promptBudget import output_budget
+from skillExtractor import extract_skills_local
+from metrics import llm_seconds, llm_retries, llm_wait_seconds, llm_hedges, prompt_chars, completion_chars
+from logger import get_logger
+
+log = get_logger("huggingfaceService")
 
 # Import Hugging Face client
 try:
-    from huggingface_hub import InferenceClient
+    from huggingface_hub import AsyncInferenceClient
 except ImportError:
-    print("Installing huggingface_hub...")
+    log.info("Installing huggingface_hub...")
     import subprocess
     subprocess.check_call(["pip", "install", "huggingface_hub"])
-    from huggingface_hub import InferenceClient
+    from huggingface_hub import AsyncInferenceClient
 
 load_dotenv()
 
 HF_API_KEY = os.getenv("HF_API_KEY")
+# Any OpenAI-compatible chat-completions server instead of the HF router (a
+# self-hosted TGI/vLLM endpoint, or stubServer for offline load tests)
+HF_BASE_URL = os.getenv("HF_BASE_URL") or None
 
 # Available FREE Llama models:
 # Option 1: Meta Llama 3.1 8B (RECOMMENDED)
@@ -31,151 +48,290 @@ MODEL = "meta-llama/Llama-3.1-8B-Instruct"
 # Option 3: Qwen 2.5 7B (Fast and good)
 # MODEL = "Qwen/Qwen2.5-7B-Instruct"
 
-RATE_LIMIT_DELAY = 3
-last_request_time = 0
+# Token bucket shared by every thread in this worker (or every worker with
+# LLM_RATE_LIMIT_BACKEND=file): RATE_LIMIT_RPS calls/sec, bursts of RATE_LIMIT_BURST
+RATE_LIMIT_RPS = float(os.getenv("HF_RATE_LIMIT_RPS", 1))
+RATE_LIMIT_BURST = int(os.getenv("HF_RATE_LIMIT_BURST", 5))
+rate_limiter = create_bucket("HuggingFace", RATE_LIMIT_RPS, RATE_LIMIT_BURST)
+
+SYSTEM_MESSAGE = (
+    "You are an expert technical recruiter and interviewer. You MUST respond with ONLY valid, complete JSON. "
+    "Do not use markdown formatting, code blocks, or any additional text. "
+    "Ensure all JSON objects are properly closed with matching braces and brackets."
+)
+TEMPERATURE = 0.7
+STOP_SEQUENCES = ["```", "\n\n\n"]  # Stop at markdown or excessive newlines
+QUESTION_FIELDS = ["id", "question", "difficulty", "focusArea"]
+
+# One async client per event loop (the background loop, or the ASGI server's)
+clients = weakref.WeakKeyDictionary()
 
-# Initialize client
-client = None
+# Opt-in hedging for the endpoints in HF_HEDGE_ENDPOINTS (e.g. analyze_answer):
+# when a request is slower than the HF_HEDGE_PERCENTILE of recent latencies,
+# an identical request is fired (if the rate limiter has a token free right
+# now), the first response wins and the other is cancelled.
+HEDGE_ENDPOINTS   = {e.strip() for e in os.getenv("HF_HEDGE_ENDPOINTS", "").split(",") if e.strip()}
+HEDGE_PERCENTILE  = float(os.getenv("HF_HEDGE_PERCENTILE", 0.9))
+HEDGE_MIN_SAMPLES = int(os.getenv("HF_HEDGE_MIN_SAMPLES", 20))
+HEDGE_MIN_DELAY   = float(os.getenv("HF_HEDGE_MIN_DELAY", 1.0))
+
+latencies = deque(maxlen=200)   # seconds per chat completion (lower bound when a hedge won)
+hedge_counters = {"requests": 0, "hedged": 0, "hedgeWins": 0, "skippedNoBudget": 0}
+HEDGE_EVENTS = {"requests": "request", "hedged": "hedged", "hedgeWins": "hedge_won",
+                "skippedNoBudget": "skipped_no_budget"}   # hedge_counters key -> metric label
+hedge_lock = threading.Lock()
 
 
 def get_client():
-    """Get or create Hugging Face client"""
-    global client
-    if client is None:
+    """Get or create the async Hugging Face client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    if loop not in clients:
         if not HF_API_KEY:
             raise Exception(
                 "Hugging Face API key missing in .env file. "
                 "Get your free key at: https://huggingface.co/settings/tokens"
             )
-        client = InferenceClient(token=HF_API_KEY)
-    return client
-
-
-def rate_limit():
-    """Enforce rate limiting between API calls"""
-    global last_request_time
-    now = time.time()
-    elapsed = now - last_request_time
-    if elapsed < RATE_LIMIT_DELAY:
-        time.sleep(RATE_LIMIT_DELAY - elapsed)
-    last_request_time = time.time()
-
-
-def extract_json_from_text(text):
-    """Extract JSON from text, handling markdown code blocks and incomplete JSON"""
-    # Remove markdown code blocks
-    text = re.sub(r'```json\s*', '', text)
-    text = re.sub(r'```\s*', '', text)
-    text = text.strip()
-    
-    # Try to find complete JSON object
-    # Look for opening { and closing }
-    start = text.find('{')
-    if start == -1:
-        return text
-    
-    # Count braces to find matching closing brace
-    brace_count = 0
-    end = start
-    
-    for i in range(start, len(text)):
-        if text[i] == '{':
-            brace_count += 1
-        elif text[i] == '}':
-            brace_count -= 1
-            if brace_count == 0:
-                end = i + 1
-                break
-    
-    if end > start:
-        extracted = text[start:end]
-        # Validate it's proper JSON
-        try:
-            json.loads(extracted)
-            return extracted
-        except json.JSONDecodeError:
-            # If not valid, return original
-            return text
-    
-    return text
+        clients[loop] = AsyncInferenceClient(token=HF_API_KEY, base_url=HF_BASE_URL)
+    return clients[loop]
 
 
-def call_huggingface(prompt, max_tokens=3072, retry_count=3):
-    """Make a request to Hugging Face using InferenceClient with retry logic"""
-    rate_limit()
-    
-    hf_client = get_client()
-    
-    # Format message for Llama
-    messages = [
+def rate_limit(deadline=None):
+    """Wait for a token-bucket slot; raises RateLimitExceeded if the queue is too long"""
+    return rate_limiter.acquire(deadline)
+
+
+async def rate_limit_async(deadline=None):
+    """Like rate_limit(), but waits for the slot without blocking the event loop"""
+    wait = rate_limiter.reserve(deadline)
+    llm_wait_seconds.observe(max(wait, 0.0), "huggingface")
+    if wait > 0:
+        await asyncio.sleep(wait)
+    return wait
+
+
+def count_hedge(name):
+    with hedge_lock:
+        hedge_counters[name] += 1
+    llm_hedges.inc("huggingface", HEDGE_EVENTS[name])
+
+
+def hedge_delay():
+    """Seconds to wait before hedging, or None until there are enough samples"""
+    samples = sorted(latencies)
+    if len(samples) < HEDGE_MIN_SAMPLES:
+        return None
+    return max(HEDGE_MIN_DELAY, samples[min(len(samples) - 1, int(len(samples) * HEDGE_PERCENTILE))])
+
+
+def hedge_stats():
+    with hedge_lock:
+        counters = dict(hedge_counters)
+    delay = hedge_delay()
+    return {
+        "endpoints":       sorted(HEDGE_ENDPOINTS),
+        "delayMs":         int(delay * 1000) if delay is not None else None,
+        **counters,
+        "hedgeRate":       round(counters["hedged"] / counters["requests"], 3) if counters["requests"] else 0.0,
+        "winRate":         round(counters["hedgeWins"] / counters["hedged"], 3) if counters["hedged"] else 0.0,
+    }
+
+
+async def chat_completion_hedged(hf_client, hedge, **request):
+    """One chat completion; with `hedge`, a duplicate races it once it is slower than usual"""
+    start = time.perf_counter()
+    delay = hedge_delay() if hedge else None
+    count_hedge("requests")
+
+    first = asyncio.ensure_future(hf_client.chat_completion(**request))
+    tasks = {first}
+    try:
+        if delay is not None:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                if rate_limiter.try_acquire():
+                    count_hedge("hedged")
+                    log.info("🏁 No response after %.1fs, sending a hedged request", delay)
+                    tasks.add(asyncio.ensure_future(hf_client.chat_completion(**request)))
+                else:
+                    count_hedge("skippedNoBudget")
+
+        error = None
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                # A cancelled sibling has no exception() to read (it would raise CancelledError)
+                if task.cancelled():
+                    continue
+                if task.exception() is not None:
+                    error = error or task.exception()
+                    continue
+                if task is not first:
+                    count_hedge("hedgeWins")
+                latencies.append(time.perf_counter() - start)
+                return task.result()
+        raise error or asyncio.CancelledError()
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def build_messages(prompt):
+    """Format the chat messages for Llama"""
+    return [
         {
             "role": "system",
-            "content": "You are an expert technical recruiter and interviewer. You MUST respond with ONLY valid, complete JSON. Do not use markdown formatting, code blocks, or any additional text. Ensure all JSON objects are properly closed with matching braces and brackets."
+            "content": SYSTEM_MESSAGE
         },
         {
             "role": "user",
             "content": prompt
         }
     ]
+
+
+def call_huggingface(prompt, max_tokens=3072, retry_count=3, deadline=None, cache_endpoint=None,
+                     expect_json=True, hedge=None):
+    """Blocking wrapper around call_huggingface_async() for sync callers"""
+    return run_sync(call_huggingface_async(
+        prompt, max_tokens, retry_count, deadline, cache_endpoint, expect_json, hedge
+    ))
+
+
+def call_huggingface_json(prompt, max_tokens=3072, retry_count=3, deadline=None, cache_endpoint=None,
+                          hedge=None):
+    """Blocking wrapper around call_huggingface_json_async() for sync callers"""
+    return run_sync(call_huggingface_json_async(prompt, max_tokens, retry_count, deadline, cache_endpoint, hedge))
+
+
+async def call_huggingface_async(prompt, max_tokens=3072, retry_count=3, deadline=None, cache_endpoint=None,
+                                 expect_json=True, hedge=None):
+    """Completion text for `prompt` (see complete_huggingface_async)"""
+    text, _ = await complete_huggingface_async(
+        prompt, max_tokens, retry_count, deadline, cache_endpoint, expect_json, hedge=hedge
+    )
+    return text
+
+
+async def call_huggingface_json_async(prompt, max_tokens=3072, retry_count=3, deadline=None, cache_endpoint=None,
+                                      hedge=None):
+    """Parsed JSON object for `prompt`, repaired if truncated; None if nothing was salvageable"""
+    _, result = await complete_huggingface_async(prompt, max_tokens, retry_count, deadline, cache_endpoint,
+                                                 hedge=hedge)
+    log_repair(result)
+    return result.value
+
+
+async def complete_huggingface_async(prompt, max_tokens=3072, retry_count=3, deadline=None, cache_endpoint=None,
+                                     expect_json=True, fail_fast=False, hedge=None):
+    """Make a request to Hugging Face using AsyncInferenceClient with retry logic.
+
+    Returns (text, RepairResult); the response is parsed exactly once here so
+    callers never re-parse it. `cache_endpoint` names the calling endpoint;
+    valid-JSON responses are then cached for that endpoint's TTL (see
+    responseCache.ENDPOINT_TTLS). With expect_json=False (plain-text output)
+    the first response is returned (and cached, if non-empty) as-is, with no
+    RepairResult, instead of being retried for not parsing as JSON. With fail_fast=True (set by
+    llmRouter when another provider can take the request) "model loading"
+    and rate-limit errors raise at once instead of sleeping 10-30 s.
+    `hedge` overrides HF_HEDGE_ENDPOINTS for this call.
+    """
+    if hedge is None:
+        hedge = cache_endpoint in HEDGE_ENDPOINTS
+
+    ttl = get_ttl(cache_endpoint) if response_cache else 0
+    cache_key = make_key(MODEL, SYSTEM_MESSAGE, prompt, max_tokens, TEMPERATURE) if ttl else None
+    if cache_key:
+        cached = await response_cache.get_async(cache_key)
+        if cached is not None:
+            log.debug("⚡ Cache hit (%s)", cache_endpoint)
+            return cached, (await repair_async(cached)) if expect_json else None
+
+    await rate_limit_async(deadline)
+    
+    hf_client = get_client()
+    
+    messages = build_messages(prompt)
+    prompt_chars.observe(len(prompt), "huggingface")
     
     last_error = None
     
     for attempt in range(retry_count):
         try:
-            print(f"🔄 Attempt {attempt + 1}/{retry_count}...")
+            log.debug("🔄 Attempt %s/%s...", attempt + 1, retry_count)
             
             # Use chat completion endpoint
-            response = hf_client.chat_completion(
-                messages=messages,
-                model=MODEL,
-                max_tokens=max_tokens,
-                temperature=0.7,
-                stop=["```", "\n\n\n"]  # Stop at markdown or excessive newlines
-            )
+            call_start = time.perf_counter()
+            try:
+                response = await chat_completion_hedged(
+                    hf_client, hedge,
+                    messages=messages,
+                    model=MODEL,
+                    max_tokens=max_tokens,
+                    temperature=TEMPERATURE,
+                    stop=STOP_SEQUENCES
+                )
+            except Exception:
+                llm_seconds.observe(time.perf_counter() - call_start, "huggingface", MODEL, "error")
+                raise
+            llm_seconds.observe(time.perf_counter() - call_start, "huggingface", MODEL, "ok")
             
             # Extract generated text
             generated_text = response.choices[0].message.content
             
-            print(f"📝 Received {len(generated_text)} characters")
+            log.debug("📝 Received %s characters", len(generated_text))
+            completion_chars.observe(len(generated_text), "huggingface")
+            
+            if not expect_json:
+                if cache_key and generated_text.strip():
+                    await response_cache.set_async(cache_key, generated_text, ttl)
+                return generated_text, None
             
             # Validate it's complete JSON
-            cleaned = extract_json_from_text(generated_text)
+            result = await repair_async(generated_text)
             
-            try:
-                parsed = json.loads(cleaned)  # Test if it's valid
-                print(f"✅ Valid JSON received on attempt {attempt + 1}")
-                return generated_text
-            except json.JSONDecodeError as json_err:
-                print(f"⚠️  Incomplete/invalid JSON on attempt {attempt + 1}: {json_err}")
-                
-                if attempt < retry_count - 1:
-                    print(f"🔄 Retrying in 2 seconds...")
-                    time.sleep(2)
-                    last_error = json_err
-                    continue
-                else:
-                    # Last attempt failed, return what we have
-                    print(f"⚠️  All attempts exhausted, returning last response")
-                    return generated_text
+            if result.complete:
+                log.debug("✅ Valid JSON received on attempt %s", attempt + 1)
+                if cache_key:
+                    await response_cache.set_async(cache_key, generated_text, ttl)
+                return generated_text, result
+            
+            log.warning("⚠️  Incomplete/invalid JSON on attempt %s", attempt + 1)
+            
+            if attempt < retry_count - 1:
+                log.debug("🔄 Retrying in 2 seconds...")
+                llm_retries.inc("huggingface", "invalid_json")
+                await asyncio.sleep(2)
+                continue
+            else:
+                # Last attempt failed, return what we have (repaired where possible)
+                log.warning("⚠️  All attempts exhausted, returning last response")
+                return generated_text, result
             
         except Exception as e:
             error_msg = str(e)
             last_error = e
             
-            print(f"❌ Attempt {attempt + 1} failed: {error_msg}")
+            log.warning("❌ Attempt %s failed: %s", attempt + 1, error_msg)
+            
+            transient = ("503" in error_msg or "loading" in error_msg.lower()
+                         or "rate limit" in error_msg.lower() or "429" in error_msg)
+            if fail_fast and transient:
+                raise Exception(f"Hugging Face unavailable: {error_msg}")
             
             # Handle specific error cases
             if "503" in error_msg or "loading" in error_msg.lower():
                 wait_time = 20 if attempt == 0 else 30
-                print(f"⏳ Model is loading, waiting {wait_time} seconds...")
-                time.sleep(wait_time)
+                log.info("⏳ Model is loading, waiting %s seconds...", wait_time)
+                llm_retries.inc("huggingface", "503")
+                await asyncio.sleep(wait_time)
                 continue
             
             elif "rate limit" in error_msg.lower() or "429" in error_msg:
                 if attempt < retry_count - 1:
                     wait_time = 10 * (attempt + 1)
-                    print(f"⏳ Rate limited, waiting {wait_time} seconds...")
-                    time.sleep(wait_time)
+                    log.info("⏳ Rate limited, waiting %s seconds...", wait_time)
+                    llm_retries.inc("huggingface", "429")
+                    await asyncio.sleep(wait_time)
                     continue
                 else:
                     raise Exception(
@@ -190,8 +346,9 @@ def call_huggingface(prompt, max_tokens=3072, retry_count=3):
                 )
             
             elif attempt < retry_count - 1:
-                print(f"🔄 Retrying in 3 seconds...")
-                time.sleep(3)
+                log.debug("🔄 Retrying in 3 seconds...")
+                llm_retries.inc("huggingface", "error")
+                await asyncio.sleep(3)
                 continue
             
             else:
@@ -204,9 +361,65 @@ def call_huggingface(prompt, max_tokens=3072, retry_count=3):
         raise Exception("All retry attempts failed")
 
 
+async def stream_huggingface_async(prompt, max_tokens=3072, deadline=None, cache_endpoint=None):
+    """Yield the completion text as it is generated.
+
+    Cached responses are replayed as a single chunk. If the stream cannot be
+    opened (model loading, transient errors) this falls back to the retrying
+    call_huggingface_async() and yields its full text.
+    """
+    ttl = get_ttl(cache_endpoint) if response_cache else 0
+    cache_key = make_key(MODEL, SYSTEM_MESSAGE, prompt, max_tokens, TEMPERATURE) if ttl else None
+    if cache_key:
+        cached = await response_cache.get_async(cache_key)
+        if cached is not None:
+            log.debug("⚡ Cache hit (%s)", cache_endpoint)
+            yield cached
+            return
+
+    await rate_limit_async(deadline)
+
+    call_start = time.perf_counter()
+    try:
+        stream = await get_client().chat_completion(
+            messages=build_messages(prompt),
+            model=MODEL,
+            max_tokens=max_tokens,
+            temperature=TEMPERATURE,
+            stop=STOP_SEQUENCES,
+            stream=True
+        )
+    except Exception as e:
+        log.warning("⚠️  Streaming unavailable (%s), falling back to a regular call", e)
+        yield await call_huggingface_async(prompt, max_tokens, deadline=deadline, cache_endpoint=cache_endpoint)
+        return
+
+    prompt_chars.observe(len(prompt), "huggingface")
+    chunks = []
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            chunks.append(delta)
+            yield delta
+
+    generated_text = "".join(chunks)
+    log.debug("📝 Streamed %s characters", len(generated_text))
+    llm_seconds.observe(time.perf_counter() - call_start, "huggingface", MODEL, "ok")
+    completion_chars.observe(len(generated_text), "huggingface")
+    if cache_key and (await repair_async(generated_text)).complete:
+        await response_cache.set_async(cache_key, generated_text, ttl)
+
+
 def extract_skills(job_title, job_description, experience_level):
-    """Extract skills from job description using Llama"""
-    prompt = f"""Analyze this job posting and extract the required skills.
+    """Blocking wrapper around extract_skills_async()"""
+    return run_sync(extract_skills_async(job_title, job_description, experience_level))
+
+
+def build_skills_prompt(job_title, job_description, experience_level):
+    """Prompt for extract_skills_async() (and llmRouter's provider-neutral version)"""
+    return f"""Analyze this job posting and extract the required skills.
 
 Job Title: {job_title}
 Experience Level: {experience_level}
@@ -224,57 +437,57 @@ Return ONLY valid JSON with this exact structure (no markdown, no explanation, n
 
 IMPORTANT: Return ONLY the JSON object above, nothing else. Ensure all braces are closed."""
 
-    print("📤 Sending skills extraction request to Hugging Face...")
-    text = call_huggingface(prompt, max_tokens=1024)
-    
-    # Clean and validate JSON
-    cleaned_text = extract_json_from_text(text)
-    
-    print(f"🧹 Cleaned response ({len(cleaned_text)} chars)")
+
+def check_skills(skills):
+    """Validate parsed skills JSON; competencies and focus are nice-to-have"""
+    if not isinstance(skills, dict):
+        raise Exception("AI returned invalid JSON format. Error: no JSON object in response")
     
-    try:
-        parsed = json.loads(cleaned_text)
-        # Validate structure
-        required_keys = ["technicalSkills", "softSkills", "requiredCompetencies", "primaryFocus"]
-        missing_keys = [key for key in required_keys if key not in parsed]
-        
-        if missing_keys:
-            raise ValueError(f"Missing required keys: {', '.join(missing_keys)}")
-        
-        print(f"✅ Skills JSON validated successfully")
-        
-    except (json.JSONDecodeError, ValueError) as e:
-        print(f"⚠️  JSON validation failed: {e}")
-        print(f"Raw response (first 500 chars): {text[:500]}")
-        print(f"Cleaned response (first 500 chars): {cleaned_text[:500]}")
-        
-        # Try to create a fallback structure
-        try:
-            # Attempt to extract any valid JSON-like content
-            json_match = re.search(r'\{.*\}', text, re.DOTALL)
-            if json_match:
-                fallback = json.loads(json_match.group())
-                if all(key in fallback for key in ["technicalSkills", "softSkills"]):
-                    print("✅ Recovered with regex fallback")
-                    return json.dumps(fallback)
-        except:
-            pass
-        
-        raise Exception(f"AI returned invalid JSON format. Error: {str(e)}")
+    missing_keys = [key for key in ["technicalSkills", "softSkills"] if key not in skills]
+    if missing_keys:
+        raise Exception(f"AI returned invalid JSON format. Error: Missing required keys: {', '.join(missing_keys)}")
     
-    return cleaned_text
+    skills.setdefault("requiredCompetencies", [])
+    skills.setdefault("primaryFocus", "")
+    log.debug("✅ Skills JSON validated successfully")
+    return skills
 
 
-def generate_questions(job_title, job_description, experience_level, interview_type, skills_json):
-    """Generate interview questions using Llama"""
-    
-    question_count = {
+async def extract_skills_async(job_title, job_description, experience_level):
+    """Extract skills from job description, locally for common roles, else using Llama"""
+    skills = extract_skills_local(job_title, job_description, experience_level)
+    if skills:
+        return skills
+
+    prompt = build_skills_prompt(job_title, job_description, experience_level)
+
+    log.debug("📤 Sending skills extraction request to Hugging Face...")
+    skills = await call_huggingface_json_async(prompt, max_tokens=output_budget("extract_skills"), cache_endpoint="extract_skills")
+    return check_skills(skills)
+
+
+def generate_questions(job_title, job_description, experience_level, interview_type, skills_json, count=None):
+    """Blocking wrapper around generate_questions_async()"""
+    return run_sync(generate_questions_async(
+        job_title, job_description, experience_level, interview_type, skills_json, count
+    ))
+
+
+def questions_max_tokens(count=None):
+    """3072 for a full set; a top-up of `count` questions gets a proportional budget"""
+    return 3072 if count is None else output_budget("generate_questions", items=count)
+
+
+def build_questions_prompt(job_title, job_description, experience_level, interview_type, skills_json,
+                           count=None):
+    """Prompt for generate_questions_async() / stream_questions_async(); `count` overrides the per-type default"""
+    question_count = count or {
         "technical": 6,
         "behavioral": 5,
         "mixed": 7
     }.get(interview_type, 6)
     
-    prompt = f"""Generate exactly {question_count} challenging {interview_type} interview questions for this role.
+    return f"""Generate exactly {question_count} challenging {interview_type} interview questions for this role.
 
 Job Title: {job_title}
 Experience Level: {experience_level}
@@ -302,49 +515,74 @@ CRITICAL RULES:
 4. Ensure all braces and brackets are properly closed
 5. No trailing commas"""
 
-    print("📤 Sending question generation request to Hugging Face...")
-    text = call_huggingface(prompt, max_tokens=3072)
-    
-    # Clean and validate JSON
-    cleaned_text = extract_json_from_text(text)
+
+async def generate_questions_async(job_title, job_description, experience_level, interview_type, skills_json,
+                                   count=None):
+    """Generate interview questions using Llama"""
+    prompt = build_questions_prompt(
+        job_title, job_description, experience_level, interview_type, skills_json, count
+    )
+
+    log.debug("📤 Sending question generation request to Hugging Face...")
+    parsed = await call_huggingface_json_async(
+        prompt, max_tokens=questions_max_tokens(count), cache_endpoint="generate_questions"
+    )
+    return check_questions(parsed)
+
+
+def is_valid_question(q):
+    return isinstance(q, dict) and all(q.get(f) not in (None, "") for f in QUESTION_FIELDS)
+
+
+def check_questions(parsed):
+    """Validate parsed questions JSON; questions missing fields are dropped, and none left is an error"""
+    questions = parsed.get("questions") if isinstance(parsed, dict) else None
+    if not isinstance(questions, list) or not questions:
+        raise Exception("AI returned invalid JSON format. Error: missing or empty 'questions' array")
     
-    print(f"🧹 Cleaned response ({len(cleaned_text)} chars)")
+    valid = [q for q in questions if is_valid_question(q)]
+    if len(valid) < len(questions):
+        dropped = [i + 1 for i, q in enumerate(questions) if not is_valid_question(q)]
+        log.warning("⚠️  Dropped questions %s: missing fields", dropped)
+    if not valid:
+        raise Exception("AI returned invalid JSON format. Error: no question has all of " + ", ".join(QUESTION_FIELDS))
     
+    log.debug("✅ Questions JSON validated successfully (%s questions)", len(valid))
+    return {**parsed, "questions": valid}
+
+
+async def stream_questions_async(job_title, job_description, experience_level, interview_type, skills_json,
+                                 count=None):
+    """Yield each generated question as soon as its JSON object is complete"""
+    prompt = build_questions_prompt(
+        job_title, job_description, experience_level, interview_type, skills_json, count
+    )
+
+    log.debug("📤 Streaming question generation request to Hugging Face...")
+    parser = ArrayItemStream("questions")
+    chunks = []
+    emitted = 0
+
+    stream = stream_huggingface_async(prompt, max_tokens=questions_max_tokens(count), cache_endpoint="generate_questions")
     try:
-        parsed = json.loads(cleaned_text)
-        
-        # Validate structure
-        if "questions" not in parsed or not isinstance(parsed["questions"], list):
-            raise ValueError("Invalid questions structure - missing 'questions' array")
-        
-        if len(parsed["questions"]) == 0:
-            raise ValueError("No questions generated")
-        
-        # Validate each question has required fields
-        for i, q in enumerate(parsed["questions"]):
-            required_fields = ["id", "question", "difficulty", "focusArea"]
-            missing = [f for f in required_fields if f not in q]
-            if missing:
-                raise ValueError(f"Question {i+1} missing fields: {', '.join(missing)}")
-        
-        print(f"✅ Questions JSON validated successfully ({len(parsed['questions'])} questions)")
-        
-    except (json.JSONDecodeError, ValueError) as e:
-        print(f"⚠️  JSON validation failed: {e}")
-        print(f"Raw response (first 800 chars): {text[:800]}")
-        print(f"Cleaned text (first 800 chars): {cleaned_text[:800]}")
-        
-        # Try to recover with regex
-        try:
-            json_match = re.search(r'\{.*\}', text, re.DOTALL)
-            if json_match:
-                fallback = json.loads(json_match.group())
-                if "questions" in fallback and len(fallback["questions"]) > 0:
-                    print("✅ Recovered with regex fallback")
-                    return json.dumps(fallback)
-        except:
-            pass
-        
-        raise Exception(f"AI returned invalid JSON format. Error: {str(e)}")
-    
-    return cleaned_text
\ No newline at end of file
+        async for delta in stream:
+            chunks.append(delta)
+            for q in parser.feed(delta):
+                if is_valid_question(q):
+                    emitted += 1
+                    yield q
+    finally:
+        await stream.aclose()
+
+    if emitted:
+        log.info("✅ Streamed %s questions", emitted)
+        return
+
+    # Nothing usable arrived incrementally (e.g. odd formatting) - parse the whole text
+    log.warning("⚠️  No questions parsed from the stream, parsing full response")
+    parsed = (await repair_async("".join(chunks))).value
+    if not isinstance(parsed, dict):
+        raise Exception("AI returned invalid JSON format. Error: no JSON object in response")
+    for q in parsed.get("questions", []):
+        if is_valid_question(q):
+            yield q
@@ -0,0 +1,222 @@
+# backend/jobs.py
+# Background jobs for work the client collects later by polling
+# GET /api/jobs/<id>.
+#
+# POST /api/create-interview, /api/analyze-resume and /api/skill-gap accept
+# ?async=1: the request is answered with a job id straight away and the route
+# logic runs here, so a slow or "loading" model never holds an HTTP worker
+# past the platform's request timeout. Jobs run on the background event loop,
+# at most JOB_WORKERS at a time. With JOB_BACKEND=sqlite job state lives in a
+# file shared by every gunicorn worker, so any worker can answer the poll.
+
+import os
+import json
+import time
+import uuid
+import asyncio
+import sqlite3
+import tempfile
+import threading
+
+from asyncRuntime import get_loop
+from rateLimiter import RateLimitExceeded
+from logger import get_logger
+
+log = get_logger("jobs")
+
+JOB_BACKEND      = os.getenv("JOB_BACKEND", "memory")   # memory | sqlite
+JOB_DB_PATH      = os.getenv("JOB_DB_PATH", os.path.join(tempfile.gettempdir(), "prepmate-jobs.db"))
+JOB_WORKERS      = int(os.getenv("JOB_WORKERS", 4))
+JOB_TTL          = int(os.getenv("JOB_TTL", 3600))
+CLEANUP_INTERVAL = 60
+
+
+class JobError(Exception):
+    """A job whose route logic answered with an error status"""
+
+    def __init__(self, message, status=500):
+        super().__init__(message)
+        self.status = status
+
+
+class JobStore:
+    """In-process job registry; coroutines run on the background event loop"""
+
+    backend = "memory"
+
+    def __init__(self, workers=JOB_WORKERS, ttl=JOB_TTL):
+        self.workers = workers
+        self.ttl = ttl
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._slots = None
+        self._last_cleanup = 0.0
+
+    def _save(self, job_id, job):
+        with self._lock:
+            self._jobs[job_id] = job
+
+    def _load(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def _purge(self, cutoff):
+        with self._lock:
+            expired = [k for k, job in self._jobs.items() if job["updatedAt"] < cutoff]
+            for k in expired:
+                del self._jobs[k]
+        return len(expired)
+
+    def _counts(self):
+        counts = {}
+        with self._lock:
+            for job in self._jobs.values():
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return counts
+
+    def _create(self, kind):
+        """Store a new pending job (after any due cleanup) and return its id"""
+        self.cleanup()
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._save(job_id, {"status": "pending", "kind": kind, "createdAt": now, "updatedAt": now})
+        return job_id
+
+    def submit(self, coro, kind=None):
+        """Schedule a coroutine and return its job id"""
+        job_id = self._create(kind)
+        asyncio.run_coroutine_threadsafe(self._run(job_id, coro), get_loop())
+        return job_id
+
+    async def submit_async(self, coro, kind=None):
+        """submit() for coroutines on an event loop"""
+        job_id = await self._create_async(kind)
+        asyncio.run_coroutine_threadsafe(self._run(job_id, coro), get_loop())
+        return job_id
+
+    async def _create_async(self, kind):
+        return self._create(kind)
+
+    async def _update_async(self, job_id, **fields):
+        self._update(job_id, **fields)
+
+    async def _run(self, job_id, coro):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+        async with self._slots:
+            await self._update_async(job_id, status="running")
+            try:
+                result = await coro
+                await self._update_async(job_id, status="done", result=result)
+            except RateLimitExceeded as e:
+                await self._update_async(job_id, status="error", error=str(e), httpStatus=429,
+                                         retryAfter=round(e.retry_after, 1))
+            except JobError as e:
+                await self._update_async(job_id, status="error", error=str(e), httpStatus=e.status)
+            except Exception as e:
+                log.exception("❌ Job %s failed: %s", job_id, e)
+                await self._update_async(job_id, status="error", error=str(e), httpStatus=500)
+
+    def _update(self, job_id, **fields):
+        job = self._load(job_id)
+        if job is None:
+            return
+        job.update(fields, updatedAt=time.time())
+        self._save(job_id, job)
+
+    def get(self, job_id):
+        job = self._load(job_id)
+        if not job or job["updatedAt"] < time.time() - self.ttl:
+            return None
+        return dict(job, id=job_id)
+
+    def cleanup(self, force=False):
+        """Drop jobs untouched for longer than the TTL (at most once a minute)"""
+        now = time.time()
+        if not force and now - self._last_cleanup < CLEANUP_INTERVAL:
+            return 0
+        self._last_cleanup = now
+        removed = self._purge(now - self.ttl)
+        if removed:
+            log.info("🧹 Removed %s expired job(s)", removed)
+        return removed
+
+    def stats(self):
+        return {"backend": self.backend, "workers": self.workers, "ttl": self.ttl, **self._counts()}
+
+
+class SQLiteJobStore(JobStore):
+    """Job state in a SQLite file shared by all workers"""
+
+    backend = "sqlite"
+
+    def __init__(self, workers=JOB_WORKERS, ttl=JOB_TTL, path=JOB_DB_PATH):
+        super().__init__(workers, ttl)
+        self.path = path
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, status TEXT NOT NULL, "
+                "payload TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    # Job reads and writes (up to the 5 s busy timeout) run on a worker
+    # thread, so they never block the event loop shared by every request
+    async def _create_async(self, kind):
+        return await asyncio.to_thread(self._create, kind)
+
+    async def _update_async(self, job_id, **fields):
+        await asyncio.to_thread(self._update, job_id, **fields)
+
+    def _save(self, job_id, job):
+        try:
+            with self._conn() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO jobs (id, status, payload, updated_at) VALUES (?, ?, ?, ?)",
+                    (job_id, job["status"], json.dumps(job), job["updatedAt"])
+                )
+        except sqlite3.Error as e:
+            log.warning("⚠️  Job write failed: %s", e)
+
+    def _load(self, job_id):
+        try:
+            row = self._conn().execute("SELECT payload FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return json.loads(row[0]) if row else None
+        except sqlite3.Error as e:
+            log.warning("⚠️  Job read failed: %s", e)
+            return None
+
+    def _purge(self, cutoff):
+        try:
+            with self._conn() as conn:
+                return conn.execute("DELETE FROM jobs WHERE updated_at < ?", (cutoff,)).rowcount
+        except sqlite3.Error as e:
+            log.warning("⚠️  Job cleanup failed: %s", e)
+            return 0
+
+    def _counts(self):
+        try:
+            rows = self._conn().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+            return dict(rows)
+        except sqlite3.Error:
+            return {}
+
+
+def create_job_store():
+    """Build the job store for the configured backend"""
+    if JOB_BACKEND == "sqlite":
+        return SQLiteJobStore()
+    return JobStore()
+
+
+job_store = create_job_store()
@@ -0,0 +1,191 @@
+# backend/jsonRepair.py
+# The one place model output is turned into JSON.
+#
+# Every provider and route goes through repair(): fences and leading prose are
+# stripped with compiled patterns, a clean response is parsed once by
+# json.loads, and the parsed object (not text) is handed back to the caller.
+#
+# Responses cut off by max_tokens end mid-string or mid-array. Instead of
+# trimming lines and re-parsing the whole document once per line, one regex
+# scan tracks strings, escapes and the bracket stack, remembering the last
+# point where everything before it was a complete value. The prefix up to
+# that point plus the matching closers is parsed once. An array element the
+# cut lands inside is dropped rather than kept half-written.
+
+import os
+import re
+import json
+import asyncio
+
+from metrics import json_repairs
+from logger import get_logger
+
+log = get_logger("jsonRepair")
+
+FENCE      = re.compile(r'```(?:json)?\s*')
+TEXT_FENCE = re.compile(r'```[a-z]*\n?')
+TOKEN      = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*(")?|[{}\[\],:]')
+CLOSERS    = {'{': '}', '[': ']'}
+
+# Responses this long are repaired on a worker thread by repair_async(), so a
+# big or badly truncated completion does not stall the shared event loop
+OFFLOAD_CHARS = int(os.getenv("JSON_REPAIR_OFFLOAD_CHARS", 8000))
+
+# Extra parses allowed when the salvaged prefix still fails (e.g. a stray
+# quote or an unquoted key); each pass cuts at the reported error position.
+MAX_PASSES = 3
+
+
+class RepairResult:
+    """Parsed value plus what the repair had to do to get it"""
+
+    __slots__ = ("value", "repaired", "cut_at", "salvaged")
+
+    def __init__(self, value=None, repaired=False, cut_at=None):
+        self.value = value
+        self.repaired = repaired
+        self.cut_at = cut_at   # offset into the cleaned text where input was dropped
+        self.salvaged = list(value) if isinstance(value, dict) else []
+
+    @property
+    def complete(self):
+        """The response held a whole JSON object (trailing-comma fixes aside)"""
+        return self.value is not None and self.cut_at is None
+
+    def __bool__(self):
+        return self.value is not None
+
+    def __repr__(self):
+        return f"RepairResult(repaired={self.repaired}, cut_at={self.cut_at}, salvaged={self.salvaged})"
+
+
+def log_repair(result):
+    """Note in the logs when a response only parsed after repair"""
+    if result and result.repaired:
+        where = f" at char {result.cut_at}" if result.cut_at is not None else ""
+        log.info("🩹 Repaired JSON%s | kept: %s", where, ', '.join(result.salvaged))
+
+
+def strip_fences(text):
+    return FENCE.sub('', text).strip()
+
+
+def strip_text_fences(text):
+    """Remove ``` fences around plain-text output (e.g. the rewritten resume)"""
+    return TEXT_FENCE.sub('', text).strip()
+
+
+def scan(text, start):
+    """
+    One pass from the opening brace at `start`.
+    Returns (candidate, cut_at): the balanced document, or the longest
+    complete prefix with its closers appended (cut_at is then the offset
+    where the rest of the input was dropped).
+    """
+    stack = []
+    marks = []  # per open container: the cut to fall back to if it is an unfinished array element
+    cut, cut_depth = start, 0
+    after_colon = False
+    pending_comma = None
+    drop = []   # trailing commas before a closer: [1, 2,] -> [1, 2]
+
+    for m in TOKEN.finditer(text, start):
+        tok = m.group()
+        ch = tok[0]
+
+        if ch == '"':
+            if m.group(1) is None:
+                break   # truncated inside a string
+            pending_comma = None
+            if after_colon or stack[-1] == ']':
+                cut, cut_depth = m.end(), len(stack)
+            after_colon = False
+        elif ch in '{[':
+            marks.append((cut, cut_depth) if stack and stack[-1] == ']' else None)
+            stack.append(CLOSERS[ch])
+            pending_comma = None
+            after_colon = False
+            if len(stack) == 1:
+                cut, cut_depth = m.end(), 1   # nested empty containers would look like real items
+        elif ch in '}]':
+            if stack[-1] != ch:
+                break   # mismatched closer, keep what was balanced before it
+            if pending_comma is not None and not text[pending_comma + 1:m.start()].strip():
+                drop.append(pending_comma)
+            pending_comma = None
+            after_colon = False
+            stack.pop()
+            marks.pop()
+            if not stack:
+                return _without(text, start, m.end(), drop), None
+            cut, cut_depth = m.end(), len(stack)
+        elif ch == ',':
+            pending_comma = m.start()
+            after_colon = False
+            cut, cut_depth = m.start(), len(stack)
+        else:
+            after_colon = True
+
+    # Entries below cut_depth can only change by a pop, which moves the cut.
+    # An array element still open at the cut is incomplete ({"index": 2} with
+    # no score), so the outermost one is dropped whole, with its comma.
+    for mark in marks[:cut_depth]:
+        if mark is not None:
+            cut, cut_depth = mark
+            break
+    return _without(text, start, cut, drop) + ''.join(reversed(stack[:cut_depth])), cut
+
+
+def _without(text, start, end, drop):
+    """text[start:end] minus the dropped comma positions"""
+    if not drop:
+        return text[start:end]
+    parts, prev = [], start
+    for pos in drop:
+        if pos >= end:
+            break
+        parts.append(text[prev:pos])
+        prev = pos + 1
+    parts.append(text[prev:end])
+    return ''.join(parts)
+
+
+def repair(text):
+    """Parse the first JSON object in model output, repairing truncation. Always returns a RepairResult"""
+    if not text:
+        json_repairs.inc("empty")
+        return RepairResult()
+    text = strip_fences(text)
+    start = text.find('{')
+    if start == -1:
+        json_repairs.inc("empty")
+        return RepairResult()
+
+    try:
+        value = json.loads(text[start:])
+        json_repairs.inc("clean")
+        return RepairResult(value)
+    except json.JSONDecodeError:
+        pass
+
+    candidate, cut_at = scan(text, start)
+    for attempt in range(MAX_PASSES):
+        try:
+            value = json.loads(candidate)
+            json_repairs.inc("rescanned" if attempt else "truncated")
+            return RepairResult(value, repaired=True, cut_at=cut_at)
+        except json.JSONDecodeError as e:
+            if e.pos <= 1:
+                break
+            # Still malformed somewhere: cut at the parser's error and rescan
+            candidate, cut = scan(candidate[:e.pos], 0)
+            cut_at = start + (e.pos if cut is None else cut)
+    json_repairs.inc("failed")
+    return RepairResult()
+
+
+async def repair_async(text):
+    """repair() for coroutines: long responses are parsed off the event loop"""
+    if not text or len(text) < OFFLOAD_CHARS:
+        return repair(text)
+    return await asyncio.to_thread(repair, text)
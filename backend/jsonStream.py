@@ -0,0 +1,109 @@
+# backend/jsonStream.py
+# Incremental JSON parsing for streamed model output.
+#
+# The model writes {"questions": [{...}, {...}, ...]} token by token. Waiting
+# for the closing bracket means waiting for the whole completion; this parser
+# tracks strings, escapes and nesting as chunks arrive and hands back each
+# element of the target array the moment its closing brace is seen.
+
+import json
+
+SEEK, OPEN, ITEMS, DONE = range(4)
+
+
+class ArrayItemStream:
+    """Feed text chunks; returns each complete element of the top-level array under `key`"""
+
+    def __init__(self, key):
+        self.key = key
+        self._phase = SEEK
+        self._depth = 0
+        self._array_depth = None
+        self._in_string = False
+        self._escape = False
+        self._string = []
+        self._last_string = None
+        self._element = None
+
+    @property
+    def done(self):
+        return self._phase == DONE
+
+    def feed(self, chunk):
+        items = []
+        for ch in chunk:
+            if self._phase == DONE:
+                break
+
+            if self._element is not None:
+                self._element.append(ch)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._element is None:
+                        self._last_string = ''.join(self._string)
+                elif self._element is None:
+                    self._string.append(ch)
+                continue
+
+            if ch.isspace():
+                continue
+
+            at_array_level = self._phase == ITEMS and self._depth == self._array_depth
+
+            # Between elements: commas, the closing bracket, or the start of the next element
+            if at_array_level and self._element is None:
+                if ch == ',':
+                    continue
+                if ch == ']':
+                    self._phase = DONE
+                    continue
+                self._element = [ch]
+
+            if ch == '"':
+                self._in_string = True
+                self._string = []
+                if self._phase == OPEN:
+                    self._phase = SEEK
+            elif ch in '{[':
+                self._depth += 1
+                if self._phase == OPEN:
+                    if ch == '[':
+                        self._phase = ITEMS
+                        self._array_depth = self._depth
+                    else:
+                        self._phase = SEEK
+            elif ch in '}]':
+                if at_array_level and self._element is not None:
+                    # A scalar element followed directly by the closing bracket
+                    self._element.pop()
+                    self._emit(items)
+                    self._phase = DONE
+                    continue
+                self._depth -= 1
+                if self._element is not None and self._depth == self._array_depth:
+                    self._emit(items)
+            elif ch == ':':
+                if self._phase == SEEK and self._depth == 1 and self._last_string == self.key:
+                    self._phase = OPEN
+            elif ch == ',':
+                if at_array_level and self._element is not None:
+                    self._element.pop()
+                    self._emit(items)
+            elif self._phase == OPEN:
+                # The key holds a scalar, not an array
+                self._phase = SEEK
+        return items
+
+    def _emit(self, items):
+        text = ''.join(self._element)
+        self._element = None
+        try:
+            items.append(json.loads(text))
+        except json.JSONDecodeError:
+            pass
@@ -0,0 +1,295 @@
+# backend/llmRouter.py
+# Latency-aware routing across LLM providers (Hugging Face, Gemini).
+#
+# Each provider exposes complete(prompt, ...) -> (text, RepairResult). The
+# router keeps a rolling window of latencies and outcomes per provider, sends
+# each request to the healthiest one, hedges to the next provider if the
+# first is slow, fails over on errors, and opens a circuit breaker on a
+# provider that keeps failing so requests stop queueing behind it.
+
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+
+from huggingfaceService import (
+    complete_huggingface_async, build_skills_prompt, build_questions_prompt, questions_max_tokens,
+    check_skills, check_questions, HF_API_KEY
+)
+from geminiService import complete_gemini_async, GEMINI_API_KEY
+from jsonRepair import log_repair
+from rateLimiter import RateLimitExceeded
+from promptBudget import output_budget
+from skillExtractor import extract_skills_local
+from logger import get_logger
+
+log = get_logger("llmRouter")
+
+PROVIDER_ORDER   = [p.strip() for p in os.getenv("LLM_PROVIDERS", "huggingface,gemini").split(",") if p.strip()]
+LATENCY_WINDOW   = int(os.getenv("LLM_LATENCY_WINDOW", 100))
+HEDGE_DELAY      = float(os.getenv("LLM_HEDGE_DELAY", 0))        # seconds; 0 (default) disables hedging
+CIRCUIT_FAILURES = int(os.getenv("LLM_CIRCUIT_FAILURES", 5))     # consecutive errors that open the circuit
+CIRCUIT_COOLDOWN = float(os.getenv("LLM_CIRCUIT_COOLDOWN", 30))  # seconds before a trial request
+
+# Router hedging stacks with huggingfaceService's HF_HEDGE_ENDPOINTS: a slow
+# hedged HF call is already two upstream requests, and a router hedge on top
+# makes it three. Enable one or the other for a given endpoint, not both.
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+class Provider:
+    """One LLM backend plus its rolling health and circuit-breaker state"""
+
+    def __init__(self, name, complete, window=LATENCY_WINDOW):
+        self.name = name
+        self.complete = complete
+        self.latencies = deque(maxlen=window)   # seconds, successful calls only
+        self.outcomes = deque(maxlen=window)    # True = success
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.races_won = 0
+        self._lock = threading.Lock()
+
+    def available(self):
+        """Whether the circuit lets a request through (claims the half-open trial)"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= CIRCUIT_COOLDOWN:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record(self, ok, latency=None, trips_circuit=True):
+        """`trips_circuit=False` for outcomes that say nothing about availability (bad JSON)"""
+        with self._lock:
+            self.outcomes.append(ok)
+            self.trial_in_flight = False
+            if ok:
+                self.latencies.append(latency)
+                self.consecutive_failures = 0
+                if self.state != CLOSED:
+                    log.info("🔌 %s circuit closed", self.name)
+                self.state = CLOSED
+                return
+            if not trips_circuit:
+                return
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= CIRCUIT_FAILURES:
+                if self.state != OPEN:
+                    log.warning("🔌 %s circuit OPEN after %s failures", self.name, self.consecutive_failures)
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def release(self, elapsed=None):
+        """Give back a half-open trial that was cancelled before it finished.
+        `elapsed` is recorded as a latency lower bound for a hedge loser."""
+        with self._lock:
+            self.trial_in_flight = False
+            if elapsed is not None:
+                self.latencies.append(elapsed)
+
+    def won_race(self):
+        """Count a hedged race this provider finished first"""
+        with self._lock:
+            self.races_won += 1
+
+    def score(self):
+        """Lower is healthier: median latency inflated by the recent error rate"""
+        with self._lock:
+            p50 = percentile(self.latencies, 0.5)
+            errors = self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+        # Untried providers get the benefit of the doubt so they are sampled
+        return (p50 or 0.0) * (1 + 4 * errors) + 60 * errors
+
+    def stats(self):
+        with self._lock:
+            p50 = percentile(self.latencies, 0.5)
+            p95 = percentile(self.latencies, 0.95)
+            return {
+                "state":      self.state,
+                "samples":    len(self.outcomes),
+                "errorRate":  round(self.outcomes.count(False) / len(self.outcomes), 3) if self.outcomes else 0.0,
+                "p50Ms":      int(p50 * 1000) if p50 is not None else None,
+                "p95Ms":      int(p95 * 1000) if p95 is not None else None,
+                "racesWon":   self.races_won,
+            }
+
+
+class LLMRouter:
+    """Send each completion to the healthiest provider, with hedging and failover"""
+
+    def __init__(self, providers, hedge_delay=HEDGE_DELAY):
+        self.providers = providers
+        self.hedge_delay = hedge_delay
+        self.hedges = 0
+
+    def ranked(self):
+        """Available providers, healthiest first (config order breaks ties)"""
+        order = sorted(self.providers, key=lambda p: p.score())
+        return [p for p in order if p.available()]
+
+    async def _attempt(self, provider, prompt, kwargs, fail_fast):
+        start = time.perf_counter()
+        try:
+            text, result = await provider.complete(prompt, fail_fast=fail_fast, **kwargs)
+        except RateLimitExceeded:
+            provider.release()
+            raise
+        except asyncio.CancelledError:
+            provider.release(time.perf_counter() - start)
+            raise
+        except Exception:
+            provider.record(False)
+            raise
+        if kwargs.get("expect_json", True) and not result:
+            # The provider answered, so its circuit stays closed; the router may still fail over
+            provider.record(False, trips_circuit=False)
+        else:
+            provider.record(True, time.perf_counter() - start)
+        return text, result
+
+    async def complete(self, prompt, max_tokens=2048, deadline=None, cache_endpoint=None, expect_json=True):
+        """(text, RepairResult) from the first provider to succeed.
+
+        If every provider answers but none with usable JSON, the last answer is
+        returned (callers treat an empty result as "unparseable"); if every
+        provider errors, the last error is raised.
+        """
+        candidates = self.ranked()
+        if not candidates:
+            raise Exception("All LLM providers are unavailable (circuit open). Please try again shortly.")
+
+        kwargs = {"max_tokens": max_tokens, "deadline": deadline,
+                  "cache_endpoint": cache_endpoint, "expect_json": expect_json}
+        pending = {}
+        last_error = None
+        unusable = None
+
+        def launch(provider):
+            # Providers only skip their long internal retry sleeps when someone can take over
+            fail_fast = bool(candidates)
+            task = asyncio.ensure_future(self._attempt(provider, prompt, kwargs, fail_fast))
+            pending[task] = provider
+
+        launch(candidates.pop(0))
+        try:
+            while pending:
+                hedge_ready = candidates and self.hedge_delay > 0 and len(pending) == 1
+                done, _ = await asyncio.wait(
+                    pending, timeout=self.hedge_delay if hedge_ready else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # Primary is slow: race the next provider against it
+                    self.hedges += 1
+                    provider = candidates.pop(0)
+                    log.info("🏁 Hedging to %s after %gs", provider.name, self.hedge_delay)
+                    launch(provider)
+                    continue
+
+                for task in done:
+                    provider = pending.pop(task)
+                    try:
+                        text, result = task.result()
+                    except Exception as e:
+                        log.warning("⚠️  %s failed: %s", provider.name, e)
+                        last_error = e
+                        continue
+                    if expect_json and not result:
+                        log.warning("⚠️  %s returned no usable JSON", provider.name)
+                        unusable = (text, result)
+                        continue
+                    if pending:
+                        provider.won_race()
+                    if expect_json:
+                        log_repair(result)
+                    return text, result
+
+                # Every in-flight attempt failed: fail over to the next provider
+                if not pending and candidates:
+                    provider = candidates.pop(0)
+                    log.info("↪️  Failing over to %s", provider.name)
+                    launch(provider)
+        finally:
+            for task in pending:
+                task.cancel()
+            for provider in candidates:
+                provider.release()
+
+        if unusable:
+            return unusable
+        raise last_error
+
+    def stats(self):
+        return {
+            "hedgeDelay": self.hedge_delay,
+            "hedges":     self.hedges,
+            "providers":  {p.name: p.stats() for p in self.providers},
+        }
+
+
+def build_providers():
+    """Providers from LLM_PROVIDERS, skipping any without an API key"""
+    known = {
+        "huggingface": (complete_huggingface_async, HF_API_KEY),
+        "gemini":      (complete_gemini_async, GEMINI_API_KEY),
+    }
+    providers = []
+    for name in PROVIDER_ORDER:
+        if name not in known:
+            log.warning("⚠️  Unknown LLM provider '%s' in LLM_PROVIDERS", name)
+            continue
+        complete, key = known[name]
+        if key:
+            providers.append(Provider(name, complete))
+    # Keep the original single-provider behaviour when no keys are configured
+    return providers or [Provider("huggingface", complete_huggingface_async)]
+
+
+router = LLMRouter(build_providers())
+
+
+async def call_llm_async(prompt, max_tokens=2048, deadline=None, cache_endpoint=None, expect_json=True):
+    """Completion text from the healthiest provider"""
+    text, _ = await router.complete(prompt, max_tokens, deadline, cache_endpoint, expect_json)
+    return text
+
+
+async def call_llm_json_async(prompt, max_tokens=2048, deadline=None, cache_endpoint=None):
+    """Parsed JSON object from the healthiest provider; None if nothing was salvageable"""
+    _, result = await router.complete(prompt, max_tokens, deadline, cache_endpoint)
+    return result.value
+
+
+async def extract_skills_async(job_title, job_description, experience_level):
+    """Provider-neutral huggingfaceService.extract_skills_async"""
+    skills = extract_skills_local(job_title, job_description, experience_level)
+    if skills:
+        return skills
+    prompt = build_skills_prompt(job_title, job_description, experience_level)
+    log.debug("📤 Sending skills extraction request...")
+    return check_skills(await call_llm_json_async(prompt, max_tokens=output_budget("extract_skills"), cache_endpoint="extract_skills"))
+
+
+async def generate_questions_async(job_title, job_description, experience_level, interview_type, skills_json,
+                                   count=None):
+    """Provider-neutral huggingfaceService.generate_questions_async"""
+    prompt = build_questions_prompt(job_title, job_description, experience_level, interview_type, skills_json, count)
+    log.debug("📤 Sending question generation request...")
+    return check_questions(await call_llm_json_async(
+        prompt, max_tokens=questions_max_tokens(count), cache_endpoint="generate_questions"
+    ))
@@ -0,0 +1,143 @@
+# backend/logger.py
+# Structured, non-blocking logging for the request path.
+#
+# Modules log through get_logger(__name__) instead of print(). The handler on
+# the caller's thread only merges the message arguments and puts the record
+# on an in-memory queue; one listener thread formats records (tracebacks
+# included) as JSON lines and writes them to stdout, so a slow or contended
+# stdout never adds latency to a request. When the queue is full, records are
+# dropped and counted (prepmate_log_dropped_total) instead of blocking.
+#
+# Every record carries the ID of the request that emitted it: X-Request-ID
+# when the client sends one, otherwise a generated one. It lives in a
+# contextvar, so it follows the request onto the event loop and into its
+# background jobs.
+#
+# Messages take %-style arguments, so a record below LOG_LEVEL costs a
+# single level check:  log.debug("Received %d characters", len(text))
+
+import os
+import sys
+import json
+import uuid
+import queue
+import logging
+import threading
+import contextvars
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from metrics import log_dropped
+
+LOG_LEVEL      = os.getenv("LOG_LEVEL", "INFO").upper()      # DEBUG shows every LLM attempt
+LOG_FORMAT     = os.getenv("LOG_FORMAT", "json").lower()     # json | text
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))     # records buffered before dropping
+
+ROOT = "prepmate"
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+def start_request(incoming=None):
+    """Set (and return) the current request's ID: the client's X-Request-ID if sane, else a new one"""
+    rid = incoming if incoming and len(incoming) <= 64 and incoming.isprintable() else uuid.uuid4().hex[:16]
+    request_id.set(rid)
+    return rid
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, requestId, msg, any `fields`, exc"""
+
+    def format(self, record):
+        entry = {
+            "ts":        datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level":     record.levelname,
+            "logger":    record.name,
+            "requestId": getattr(record, "request_id", None),
+            "msg":       record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Plain lines for local development"""
+
+    def format(self, record):
+        rid = getattr(record, "request_id", None)
+        line = f"{record.levelname[0]} [{rid or '-'}] {record.getMessage()}"
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Enqueue without formatting; drop rather than wait when the listener falls behind"""
+
+    def __init__(self, formatter):
+        super().__init__(queue.Queue(LOG_QUEUE_SIZE))
+        self.formatter = formatter
+        self.listener = None
+        self.pid = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        # Lazily, and again in a forked child (gunicorn --preload), whose copy of the listener thread is gone
+        with self._lock:
+            if self.pid == os.getpid():
+                return
+            stream = logging.StreamHandler(sys.stdout)
+            stream.setFormatter(self.formatter)
+            self.queue = queue.Queue(LOG_QUEUE_SIZE)
+            self.listener = QueueListener(self.queue, stream)
+            self.listener.start()
+            self.pid = os.getpid()
+
+    def handle(self, record):
+        # queue.Queue is thread-safe, so skip the per-handler lock logging.Handler takes
+        if self.filter(record):
+            self.emit(record)
+        return record
+
+    def prepare(self, record):
+        # Arguments are merged now (they may change later); the traceback is rendered by the listener
+        record.msg = record.getMessage()
+        record.args = None
+        record.request_id = request_id.get()
+        return record
+
+    def enqueue(self, record):
+        if self.pid != os.getpid():
+            self._start()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_dropped.inc()
+
+    def close(self):
+        """Write out what is queued and stop the listener (logging.shutdown calls this at exit)"""
+        with self._lock:
+            if self.listener and self.pid == os.getpid():
+                self.listener.stop()
+            self.listener, self.pid = None, None
+        super().close()
+
+
+def configure():
+    """Install the queue handler on the `prepmate` logger (once per process)"""
+    root = logging.getLogger(ROOT)
+    if root.handlers:
+        return root
+    root.setLevel(LOG_LEVEL)
+    root.propagate = False
+    root.addHandler(NonBlockingQueueHandler(JsonFormatter() if LOG_FORMAT == "json" else TextFormatter()))
+    return root
+
+
+def get_logger(name):
+    configure()
+    return logging.getLogger(f"{ROOT}.{name}")
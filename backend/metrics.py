@@ -0,0 +1,232 @@
+# backend/metrics.py
+# Prometheus-style metrics, served at GET /metrics in the text exposition format.
+#
+# Updates on the hot path never take a lock: every thread writes to its own
+# shard (a plain dict keyed by label values) and a scrape sums the shards.
+# Counters and histograms only grow, so a scrape racing a write at worst
+# sees that write on the next scrape. When a thread exits (Flask's dev
+# server starts one per request) its shard is folded into a shared total
+# and dropped, so the number of shards tracks live threads, not requests. Each worker process exposes its own
+# series; scrape every worker (or sum by instance) under gunicorn.
+#
+# The metrics themselves are declared at the bottom so instrumented modules
+# import one name each, e.g. `from metrics import llm_seconds`.
+
+import os
+import weakref
+import threading
+from bisect import bisect_left
+
+METRICS = os.getenv("METRICS", "on").lower() not in ("0", "off", "false")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+LLM_BUCKETS     = (0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+SIZE_BUCKETS    = (256, 1024, 2048, 4096, 8192, 16384, 32768, 65536)
+
+registry = []
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def label_text(names, values, extra=""):
+    pairs = [f'{n}="{escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def number(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class ThreadToken:
+    """Lives in a thread-local; collected when the thread exits"""
+
+    __slots__ = ("__weakref__",)
+
+
+class Metric:
+    """Base for sharded metrics: per-thread dicts of label values -> state"""
+
+    kind = "untyped"
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._local = threading.local()
+        self._shards = {}    # id(shard) -> shard, for live threads
+        self._retired = {}   # label values -> state folded in from exited threads
+        self._lock = threading.Lock()   # only taken when a thread first writes, exits, or on scrape
+        registry.append(self)
+
+    def _shard(self):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            # The thread-local drops the token when its thread exits; that retires the shard
+            self._local.token = token = ThreadToken()
+            weakref.finalize(token, self._retire, shard)
+            with self._lock:
+                self._shards[id(shard)] = shard
+        return shard
+
+    def _retire(self, shard):
+        with self._lock:
+            self._shards.pop(id(shard), None)
+            self._fold(self._retired, list(shard.items()))
+
+    def _snapshots(self):
+        with self._lock:
+            shards = list(self._shards.values())
+            retired = {}
+            self._fold(retired, list(self._retired.items()))   # a copy, so later retirements don't race
+        # list(dict.items()) is a single C call, so it never sees a half-inserted key
+        return [list(retired.items())] + [list(shard.items()) for shard in shards]
+
+    def values(self):
+        """{label values: state} summed across live and exited threads"""
+        totals = {}
+        for items in self._snapshots():
+            self._fold(totals, items)
+        return totals
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount=1):
+        if not METRICS:
+            return
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    @staticmethod
+    def _fold(totals, items):
+        for labels, value in items:
+            totals[labels] = totals.get(labels, 0) + value
+
+    def samples(self):
+        for labels, value in sorted(self.values().items()):
+            yield f"{self.name}{label_text(self.labels, labels)} {number(value)}"
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        if not METRICS:
+            return
+        shard = self._shard()
+        state = shard.get(labels)
+        if state is None:
+            # One count per bucket plus +Inf, then the running sum
+            state = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    @staticmethod
+    def _fold(totals, items):
+        # State: [per-bucket counts..., +Inf count, sum]
+        for labels, state in items:
+            merged = totals.setdefault(labels, [0] * len(state))
+            for i, value in enumerate(list(state)):
+                merged[i] += value
+
+    def samples(self):
+        for labels, state in sorted(self.values().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), state[:-1]):
+                cumulative += count
+                le = 'le="' + (bound if bound == "+Inf" else number(float(bound))) + '"'
+                yield f"{self.name}_bucket{label_text(self.labels, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{label_text(self.labels, labels)} {number(round(state[-1], 6))}"
+            yield f"{self.name}_count{label_text(self.labels, labels)} {cumulative}"
+
+
+class Gauge(Metric):
+    """Computed at scrape time by `collect()`, which returns {label values: value}"""
+
+    kind = "gauge"
+
+    def __init__(self, name, help, labels=(), collect=dict):
+        super().__init__(name, help, labels)
+        self.collect = collect
+
+    def samples(self):
+        for labels, value in sorted(self.collect().items()):
+            yield f"{self.name}{label_text(self.labels, labels)} {number(value)}"
+
+
+def render():
+    """Every registered metric in the Prometheus text format"""
+    lines = []
+    for metric in registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ─── Metrics ─────────────────────────────────────────────────────────────────
+
+request_seconds = Histogram(
+    "prepmate_http_request_duration_seconds", "HTTP request latency by route.", ("route", "method", "status"))
+stage_seconds = Histogram(
+    "prepmate_stage_duration_seconds", "Time spent in each stage of a request.", ("route", "stage"))
+
+llm_seconds = Histogram(
+    "prepmate_llm_request_duration_seconds", "LLM call latency by provider and model.",
+    ("provider", "model", "outcome"), LLM_BUCKETS)
+llm_retries = Counter(
+    "prepmate_llm_retries_total", "LLM attempts retried, by cause (503, 429, invalid_json, error).",
+    ("provider", "cause"))
+llm_wait_seconds = Histogram(
+    "prepmate_llm_rate_limit_wait_seconds", "Time spent waiting for a rate-limiter slot.", ("provider",))
+prompt_chars = Histogram(
+    "prepmate_llm_prompt_chars", "Prompt size sent to the LLM, in characters.", ("provider",), SIZE_BUCKETS)
+completion_chars = Histogram(
+    "prepmate_llm_completion_chars", "Completion size returned by the LLM, in characters.", ("provider",),
+    SIZE_BUCKETS)
+llm_hedges = Counter(
+    "prepmate_llm_hedge_total",
+    "Hedging decisions per LLM call (request, hedged, hedge_won, skipped_no_budget).", ("provider", "event"))
+json_repairs = Counter(
+    "prepmate_json_repair_total",
+    "Model output parsed, by the repair stage that produced the result (clean, truncated, rescanned, failed, empty).",
+    ("stage",))
+
+resume_parse_seconds = Histogram(
+    "prepmate_resume_parse_duration_seconds", "Uploaded resume text extraction time by format.", ("format",))
+
+cache_requests = Counter(
+    "prepmate_cache_requests_total", "Cache lookups by cache and result (hit, miss).", ("cache", "result"))
+
+
+def cache_hit_ratios():
+    totals = {}
+    for (cache, result), count in cache_requests.values().items():
+        hits, lookups = totals.get(cache, (0, 0))
+        totals[cache] = (hits + (count if result == "hit" else 0), lookups + count)
+    return {(cache,): round(hits / lookups, 4) for cache, (hits, lookups) in totals.items() if lookups}
+
+
+cache_hit_ratio = Gauge(
+    "prepmate_cache_hit_ratio", "Share of cache lookups that hit, since the process started.", ("cache",),
+    cache_hit_ratios)
+
+log_dropped = Counter(
+    "prepmate_log_dropped_total", "Log records dropped because the log queue was full.")
@@ -0,0 +1,222 @@
+# backend/promptBudget.py
+# Token budgets for prompt inputs, replacing fixed character cut-offs.
+#
+# Routes used to slice inputs at arbitrary lengths (job_description[:2500],
+# resume_text[:3000], answer[:1200]) and guess max_tokens per call. Here each
+# endpoint has an input budget in tokens, split across its fields so a short
+# job description leaves room for a longer resume, and an output budget.
+# Text is compacted first (whitespace, bullets, page numbers, EEO-style
+# boilerplate); only if it still does not fit is it split into blocks, and
+# the blocks most relevant to the other input (JD terms for a resume,
+# requirement words for a JD) are kept, in their original order.
+#
+# Token counts are a local heuristic shaped like the Llama 3 tokenizer: one
+# token per common word, long words and digit runs split, punctuation and
+# runs of newlines or spaces separate. No tokenizer download or extra dependency.
+
+import os
+import re
+from logger import get_logger
+
+log = get_logger("promptBudget")
+
+PIECE       = re.compile(r"[A-Za-z]+|\d+|\n+|[ \t]{2,}|[^\sA-Za-z\d]")
+TERM        = re.compile(r"[a-z][a-z0-9+#.]*[a-z0-9+#]|[a-z]")
+SPACES      = re.compile(r"[ \t ]+")
+BLANK_LINES = re.compile(r"\n{3,}")
+BULLET      = re.compile(r"^[•●▪◦■□►➢✓✔*·–—-]+\s*", re.MULTILINE)
+PAGE_MARK   = re.compile(r"^(page\s*\d+(\s*(of|/)\s*\d+)?|\d+\s*(of|/)\s*\d+)$", re.IGNORECASE)
+SENTENCE    = re.compile(r"(?<=[.!?;])\s+")
+BOILERPLATE = re.compile(
+    r"equal opportunity|without regard to|reasonable accommodation|e-verify|"
+    r"privacy (policy|notice)|all rights reserved|apply now|click here|follow us on|"
+    r"background check|drug[- ]free", re.IGNORECASE)
+
+# Scored against a job description when nothing more specific is available
+JD_FOCUS = ("requirements responsibilities qualifications skills experience required "
+            "preferred must proficiency proficient knowledge familiarity degree years")
+
+STOPWORDS = {
+    "the", "and", "for", "with", "you", "our", "are", "will", "your", "this", "that",
+    "from", "have", "has", "who", "all", "can", "not", "but", "was", "were", "their",
+    "they", "its", "into", "about", "more", "any", "been", "also", "such", "etc",
+}
+
+# Input tokens for the variable parts of each prompt (the template itself is
+# fixed) and max_tokens for the response; batch output grows per answer.
+# Input budgets match the old character caps at ~4-5 chars/token, so the
+# ceiling is unchanged and savings come from what is kept under it.
+BUDGETS = {
+    "extract_skills":  {"input": 600,  "output": 1024},
+    "generate_questions": {"output": 256, "per_item": 400, "max_output": 3072},
+    "analyze_answer":  {"input": 300,  "output": 600},
+    "batch_analyze":   {"input": 480,  "output": 200, "per_item": 130, "max_output": 2400},
+    "analyze_resume":  {"input": 1050, "output": 1200},
+    "rewrite_resume":  {"input": 600,  "output": 1800},
+    "skill_gap":       {"input": 1150, "output": 2000},
+}
+
+
+def input_budget(endpoint):
+    """Input tokens for an endpoint; PROMPT_TOKENS_<ENDPOINT> overrides the table"""
+    override = os.getenv(f"PROMPT_TOKENS_{endpoint.upper()}")
+    if override is not None:
+        return int(override)
+    return BUDGETS[endpoint]["input"]
+
+
+def output_budget(endpoint, items=0):
+    """max_tokens for an endpoint's response, for `items` answers where that applies"""
+    budget = BUDGETS[endpoint]
+    tokens = budget["output"] + items * budget.get("per_item", 0)
+    return min(tokens, budget.get("max_output", tokens))
+
+
+def piece_cost(piece):
+    ch = piece[0]
+    if ch.isalpha():
+        return 1 + len(piece) // 10
+    if ch.isdigit():
+        return (len(piece) + 2) // 3
+    return 1
+
+
+def estimate_tokens(text):
+    """Approximate Llama 3 token count"""
+    return sum(map(piece_cost, PIECE.findall(text or "")))
+
+
+def compact(text):
+    """Whitespace, bullets, page numbers and boilerplate lines removed"""
+    if not text:
+        return ""
+    text = SPACES.sub(" ", text.replace("\r\n", "\n").replace("\r", "\n"))
+    text = BULLET.sub("- ", text)
+    lines = []
+    for line in text.split("\n"):
+        line = line.strip()
+        if line and (PAGE_MARK.match(line) or BOILERPLATE.search(line)):
+            continue
+        lines.append(line)
+    return BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def terms_of(text):
+    return {t for t in TERM.findall((text or "").lower()) if len(t) > 2 and t not in STOPWORDS}
+
+
+def is_heading(line):
+    """A short line with no sentence punctuation reads as a section heading"""
+    return len(line.split()) <= 4 and not line.endswith((".", ",", ";"))
+
+
+def split_blocks(text, size):
+    """Runs of consecutive lines of about `size` tokens, breaking at blank lines and headings"""
+    blocks, current, used = [], [], 0
+    for line in text.split("\n") + [""]:
+        if not line or (is_heading(line) and current and not is_heading(current[-1])):
+            if current:
+                blocks.append("\n".join(current))
+            current, used = [], 0
+            if not line:
+                continue
+        pieces = [line] if estimate_tokens(line) <= size else [s for s in SENTENCE.split(line) if s]
+        for piece in pieces:
+            cost = estimate_tokens(piece) + 1
+            # Headings stay with the text under them
+            if current and used + cost > size and not is_heading(current[-1]):
+                blocks.append("\n".join(current))
+                current, used = [], 0
+            current.append(piece)
+            used += cost
+    return blocks
+
+
+def truncate(text, budget):
+    """Longest prefix of `text` within `budget` tokens, cut between words"""
+    tokens = 0
+    for m in PIECE.finditer(text):
+        cost = piece_cost(m.group())
+        if tokens + cost > budget:
+            return text[:m.start()].rstrip()
+        tokens += cost
+    return text
+
+
+def fit(text, budget, query=None, compacted=False):
+    """
+    `text` within `budget` tokens. Compaction alone usually suffices; otherwise
+    the blocks sharing most terms with `query` are kept (earlier blocks win
+    ties), in document order, and leftover budget is filled from the best
+    block that did not fit.
+    """
+    if not compacted:
+        text = compact(text)
+    if budget <= 0:
+        return ""
+    if estimate_tokens(text) <= budget:
+        return text
+
+    blocks = split_blocks(text, max(budget // 6, 24))
+    terms = terms_of(query)
+    costs = [estimate_tokens(b) + 1 for b in blocks]
+
+    def score(i):
+        words = TERM.findall(blocks[i].lower())
+        density = sum(1 for w in words if w in terms) / len(words) if words and terms else 0.0
+        return density + 0.1 * (1 - i / len(blocks))
+
+    keep, used, partial = {}, 0, None
+    for i in sorted(range(len(blocks)), key=score, reverse=True):
+        if used + costs[i] <= budget:
+            keep[i] = blocks[i]
+            used += costs[i]
+        elif partial is None:
+            partial = i
+    if partial is not None and budget - used > 20:
+        keep[partial] = truncate(blocks[partial], budget - used - 1)
+    return "\n".join(keep[i] for i in sorted(keep))
+
+
+def allocate(costs, total, weights=None):
+    """
+    Split `total` tokens across inputs needing `costs`: inputs under their
+    weighted share get all they need and the rest is re-split among the others.
+    """
+    weights = weights or [1] * len(costs)
+    shares = [0] * len(costs)
+    open_ = set(range(len(costs)))
+    remaining = total
+    while open_:
+        weight_sum = sum(weights[i] for i in open_)
+        fair = {i: remaining * weights[i] / weight_sum for i in open_}
+        small = [i for i in open_ if costs[i] <= fair[i]]
+        if not small:
+            for i in open_:
+                shares[i] = int(fair[i])
+            break
+        for i in small:
+            shares[i] = costs[i]
+            remaining -= costs[i]
+            open_.discard(i)
+    return shares
+
+
+def fit_fields(endpoint, fields, weights=None, queries=None, budget=None, fitters=None):
+    """
+    Split an endpoint's input budget across named text fields and fit each
+    one, with fitters[name] (same signature as fit) in place of fit if given
+    """
+    weights, queries, fitters = weights or {}, queries or {}, fitters or {}
+    names = list(fields)
+    texts = [compact(fields[name]) for name in names]
+    costs = [estimate_tokens(t) for t in texts]
+    total = input_budget(endpoint) if budget is None else budget
+    shares = allocate(costs, total, [weights.get(name, 1) for name in names])
+
+    fitted = {}
+    for name, text, cost, share in zip(names, texts, costs, shares):
+        fitted[name] = fitters.get(name, fit)(text, share, queries.get(name), compacted=True)
+        if cost > share:
+            log.info("✂️  %s.%s: %s → %s tokens", endpoint, name, cost, estimate_tokens(fitted[name]))
+    return fitted
@@ -0,0 +1,231 @@
+# backend/questionBank.py
+# Persistent bank of generated interview questions, so create-interview
+# only asks the LLM for the questions the bank cannot supply.
+#
+# Every validated generated question is stored in SQLite with its focusArea,
+# difficulty, interview type, level and the skills it was generated for.
+# Each worker keeps a BM25 index over those fields in memory and pulls in
+# rows added by other workers before each search. search() scores stored
+# questions against the extracted skills, filters by interview type, level
+# and requested difficulty, and picks a diverse set: one question per focus
+# area first, no near-duplicates, with a little jitter so repeat interviews
+# for the same role differ.
+
+import os
+import re
+import json
+import math
+import time
+import random
+import sqlite3
+import tempfile
+import threading
+from collections import Counter, defaultdict
+from logger import get_logger
+
+log = get_logger("questionBank")
+
+BANK_BACKEND   = os.getenv("QUESTION_BANK", "off")      # sqlite | off (opt-in: questions are shared across candidates)
+BANK_DB_PATH   = os.getenv("QUESTION_BANK_PATH", os.path.join(tempfile.gettempdir(), "prepmate-questions.db"))
+BANK_MIN_SCORE = float(os.getenv("QUESTION_BANK_MIN_SCORE", 0.3))   # 0-1 share of the query matched
+BANK_MAX_SHARE = float(os.getenv("QUESTION_BANK_MAX_SHARE", 0.5))   # most of an interview served from the bank
+
+WORD = re.compile(r"[a-z][a-z0-9+#.]*[a-z0-9+#]|[a-z]")
+STOPWORDS = {"and", "the", "for", "with", "of", "in", "to", "a", "an", "on", "how", "what", "you", "your",
+             "would", "describe", "explain", "time", "when", "tell", "me", "about", "is", "are", "do"}
+
+# Requested difficulty -> question difficulties it may serve
+DIFFICULTIES = {"easy": {"easy"}, "hard": {"medium", "hard"}}
+
+K1, B = 1.2, 0.75          # BM25 term-frequency saturation and length normalisation
+DUPLICATE_OVERLAP = 0.6   # Jaccard overlap of question words that counts as the same question
+
+
+def text_field(value):
+    """A stripped string, or None for missing or non-string values"""
+    return (value.strip() or None) if isinstance(value, str) else None
+
+
+def tokens(text):
+    return [t.rstrip(".") for t in WORD.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+class QuestionBank:
+    """SQLite-backed question store with an in-memory BM25 index"""
+
+    backend = "sqlite"
+
+    def __init__(self, path=BANK_DB_PATH, min_score=BANK_MIN_SCORE):
+        self.path = path
+        self.min_score = min_score
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.docs = []                     # (row, length in terms, question word set)
+        self.postings = defaultdict(list)  # term -> [(doc index, tf)]
+        self.total_length = 0
+        self.last_id = 0
+        self.counters = {"served": 0, "generated": 0, "stored": 0}
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS questions ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, question TEXT NOT NULL UNIQUE, "
+                "focus_area TEXT NOT NULL, difficulty TEXT NOT NULL, interview_type TEXT NOT NULL, "
+                "experience_level TEXT NOT NULL, job_title TEXT NOT NULL, skills TEXT NOT NULL, "
+                "created_at REAL NOT NULL)"
+            )
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _refresh(self):
+        """Index rows added since the last search (by this or any other worker)"""
+        try:
+            rows = self._conn().execute(
+                "SELECT id, question, focus_area, difficulty, interview_type, experience_level, "
+                "job_title, skills FROM questions WHERE id > ? ORDER BY id", (self.last_id,)
+            ).fetchall()
+        except sqlite3.Error as e:
+            log.warning("⚠️  Question bank read failed: %s", e)
+            return
+        for row_id, question, focus, difficulty, kind, level, title, skills in rows:
+            # The focus area is the strongest signal, so it counts twice
+            terms = Counter(tokens(focus) * 2 + tokens(" ".join(json.loads(skills))) + tokens(title)
+                            + tokens(question))
+            index, length = len(self.docs), sum(terms.values())
+            self.docs.append(({"question": question, "focusArea": focus, "difficulty": difficulty,
+                               "interviewType": kind, "experienceLevel": level}, length, set(tokens(question))))
+            for term, tf in terms.items():
+                self.postings[term].append((index, tf))
+            self.total_length += length
+            self.last_id = row_id
+
+    def add(self, questions, params, skills):
+        """Store validated generated questions; returns how many were new"""
+        kind, level, title = (text_field(params.get(k)) for k in ("interview_type", "experience_level", "job_title"))
+        if not (kind and level and title):
+            return 0
+        technical = skills.get("technicalSkills") if isinstance(skills, dict) else None
+        skill_names = [s for s in technical[:10] if isinstance(s, str)] if isinstance(technical, list) else []
+        rows = []
+        for q in questions:
+            if not isinstance(q, dict):
+                continue
+            question, focus, difficulty = (text_field(q.get(k)) for k in ("question", "focusArea", "difficulty"))
+            if question and focus and difficulty:
+                rows.append((question, focus, difficulty.lower(), kind.lower(), level.lower(), title,
+                             json.dumps(skill_names), time.time()))
+        if not rows:
+            return 0
+        try:
+            with self._conn() as conn:
+                before = conn.total_changes
+                conn.executemany(
+                    "INSERT OR IGNORE INTO questions (question, focus_area, difficulty, interview_type, "
+                    "experience_level, job_title, skills, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+                )
+                stored = conn.total_changes - before
+        except sqlite3.Error as e:
+            log.warning("⚠️  Question bank write failed: %s", e)
+            return 0
+        with self._lock:
+            self.counters["generated"] += len(rows)
+            self.counters["stored"] += stored
+        return stored
+
+    def _scores(self, query_terms):
+        """
+        {doc index: BM25 score / the query's total IDF}, i.e. roughly the share
+        of the query a question matches (each term once, at average length)
+        """
+        n = len(self.docs)
+        avg_length = self.total_length / n
+        scores = defaultdict(float)
+        ceiling = 0.0
+        for term in query_terms:
+            postings = self.postings.get(term, ())
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            ceiling += idf
+            for index, tf in postings:
+                length = self.docs[index][1]
+                scores[index] += idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / avg_length))
+        return {index: score / ceiling for index, score in scores.items()} if ceiling else {}
+
+    def search(self, skills, params, limit):
+        """Up to `limit` stored questions for this interview, most relevant and varied first"""
+        if limit <= 0:
+            return []
+        # The same fields questions are indexed on
+        query = [params["job_title"], *params.get("focus_areas", []), *(skills.get("technicalSkills") or [])[:10]]
+        query_terms = set(tokens(" ".join(map(str, query))))
+
+        kind = params["interview_type"].lower()
+        level = params["experience_level"].lower()
+        allowed = DIFFICULTIES.get(params.get("difficulty", "mixed"))
+
+        with self._lock:
+            self._refresh()
+            if not self.docs or not query_terms:
+                return []
+            candidates = []
+            for index, score in self._scores(query_terms).items():
+                row, _, words = self.docs[index]
+                if score < self.min_score or row["experienceLevel"] != level:
+                    continue
+                if kind != "mixed" and row["interviewType"] != kind:
+                    continue
+                if allowed and row["difficulty"] not in allowed:
+                    continue
+                candidates.append((score + random.uniform(0, 0.05), row, words))
+
+        picked, focus_seen = [], set()
+        candidates.sort(key=lambda c: c[0], reverse=True)
+        # First pass: one question per focus area; second: fill from what is left
+        for distinct_focus in (True, False):
+            for score, row, words in candidates:
+                if len(picked) >= limit:
+                    break
+                if any(row is p[0] for p in picked):
+                    continue
+                if distinct_focus and row["focusArea"].lower() in focus_seen:
+                    continue
+                if any(len(words & w) / (len(words | w) or 1) > DUPLICATE_OVERLAP for _, w in picked):
+                    continue
+                picked.append((row, words))
+                focus_seen.add(row["focusArea"].lower())
+
+        served = [{"question": r["question"], "difficulty": r["difficulty"].capitalize(),
+                   "focusArea": r["focusArea"]} for r, _ in picked]
+        with self._lock:
+            self.counters["served"] += len(served)
+        return served
+
+    def take(self, skills, params):
+        """Banked questions for an interview, capped by QUESTION_BANK_MAX_SHARE"""
+        limit = int(params["questions_count"] * BANK_MAX_SHARE)
+        try:
+            return self.search(skills, params, limit)
+        except Exception as e:
+            log.warning("⚠️  Question bank search failed: %s", e)
+            return []
+
+    def stats(self):
+        with self._lock:
+            return {"backend": self.backend, "questions": len(self.docs), **self.counters}
+
+
+def create_question_bank():
+    if BANK_BACKEND == "off":
+        return None
+    try:
+        return QuestionBank()
+    except sqlite3.Error as e:
+        log.warning("⚠️  Question bank unavailable (%s), generating every question", e)
+        return None
+
+
+question_bank = create_question_bank()
@@ -0,0 +1,122 @@
+# backend/rateLimiter.py
+# Token-bucket scheduler shared by the LLM providers.
+#
+# The old limiter kept one `last_request_time` per module and slept inside the
+# request thread, so every gunicorn thread queued behind a fixed gap. A token
+# bucket lets a burst through immediately, spaces the rest at the configured
+# rate, and rejects a call up front when its queue wait would exceed the
+# caller's deadline (the routes turn that into a 429 with Retry-After).
+
+import os
+import json
+import time
+import threading
+import tempfile
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: file backend falls back to memory
+    fcntl = None
+
+# memory = per-process bucket, file = one bucket shared by every worker on the host
+RATE_LIMIT_BACKEND = os.getenv("LLM_RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_DIR     = os.getenv("LLM_RATE_LIMIT_DIR", tempfile.gettempdir())
+QUEUE_DEADLINE     = float(os.getenv("LLM_QUEUE_DEADLINE", 30))  # max seconds a call may queue
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a call would have to queue longer than its deadline"""
+
+    def __init__(self, name, retry_after):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(
+            f"{name} rate limit reached. Please retry in {int(retry_after) + 1} seconds."
+        )
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` calls/sec on average, up to `burst` at once"""
+
+    def __init__(self, name, rate, burst, deadline=QUEUE_DEADLINE):
+        self.name = name
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.deadline = deadline
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = time.time()
+
+    def _take(self, tokens, updated, now, max_wait):
+        """Refill, then take one token. Returns (tokens, wait); tokens is None if rejected"""
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        # A negative balance means callers already queued ahead of us
+        wait = 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+        if wait > max_wait:
+            return None, wait
+        return tokens - 1, wait
+
+    def _reserve(self, max_wait):
+        with self._lock:
+            now = time.time()
+            tokens, wait = self._take(self._tokens, self._updated, now, max_wait)
+            if tokens is not None:
+                self._tokens, self._updated = tokens, now
+            return tokens is not None, wait
+
+    def reserve(self, deadline=None):
+        """Book a slot and return how long the caller must wait before using it"""
+        max_wait = self.deadline if deadline is None else deadline
+        ok, wait = self._reserve(max_wait)
+        if not ok:
+            raise RateLimitExceeded(self.name, wait)
+        return wait
+
+    def try_acquire(self):
+        """Take a slot only if one is free right now (for optional extra calls like hedges)"""
+        ok, _ = self._reserve(0.0)
+        return ok
+
+    def acquire(self, deadline=None):
+        """Block until a slot is available; raises RateLimitExceeded past the deadline"""
+        wait = self.reserve(deadline)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class FileTokenBucket(TokenBucket):
+    """Token bucket whose state lives in a flock-protected file shared across workers"""
+
+    def __init__(self, name, rate, burst, deadline=QUEUE_DEADLINE, path=None):
+        super().__init__(name, rate, burst, deadline)
+        self.path = path or os.path.join(RATE_LIMIT_DIR, f"prepmate-ratelimit-{name.lower()}.json")
+
+    def _reserve(self, max_wait):
+        with self._lock, open(self.path, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    state = json.loads(f.read() or "{}")
+                except ValueError:
+                    state = {}
+                now = time.time()
+                tokens, wait = self._take(
+                    state.get("tokens", self.burst), state.get("updated", now), now, max_wait
+                )
+                if tokens is not None:
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps({"tokens": tokens, "updated": now}))
+                    f.flush()
+                return tokens is not None, wait
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def create_bucket(name, rate, burst, deadline=QUEUE_DEADLINE):
+    """Build the bucket for a provider using the configured backend"""
+    if RATE_LIMIT_BACKEND == "file" and fcntl is not None:
+        return FileTokenBucket(name, rate, burst, deadline)
+    return TokenBucket(name, rate, burst, deadline)
@@ -0,0 +1,213 @@
+# backend/responseCache.py
+# Content-addressed cache for LLM responses.
+#
+# Keys are a SHA-256 of everything that determines the completion (model,
+# system message, prompt, max_tokens, temperature), so the same job
+# description pasted by many candidates costs one model call per TTL.
+# The in-memory tier is a bounded LRU; with LLM_CACHE_BACKEND=sqlite a shared
+# on-disk tier sits behind it so every gunicorn worker sees the same entries.
+
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+from metrics import cache_requests
+from logger import get_logger
+
+log = get_logger("responseCache")
+
+CACHE_BACKEND     = os.getenv("LLM_CACHE_BACKEND", "memory")   # memory | sqlite | off
+CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 512))
+CACHE_DB_PATH     = os.getenv("LLM_CACHE_PATH", os.path.join(tempfile.gettempdir(), "prepmate-llm-cache.db"))
+DEFAULT_TTL       = int(os.getenv("LLM_CACHE_TTL", 3600))
+
+# Seconds to keep a response, per endpoint. Skills for a given JD are stable,
+# so they live longest; 0 disables caching for that endpoint.
+ENDPOINT_TTLS = {
+    "extract_skills":     86400,
+    "generate_questions": 3600,
+    "analyze_answer":     3600,
+    "batch_analyze":      3600,
+    "analyze_resume":     3600,
+    "rewrite_resume":     3600,
+    "skill_gap":          3600,
+}
+
+
+def get_ttl(endpoint):
+    """TTL for an endpoint; LLM_CACHE_TTL_<ENDPOINT> overrides the table"""
+    if endpoint is None:
+        return 0
+    override = os.getenv(f"LLM_CACHE_TTL_{endpoint.upper()}")
+    if override is not None:
+        return int(override)
+    return ENDPOINT_TTLS.get(endpoint, DEFAULT_TTL)
+
+
+def make_key(model, system_message, prompt, max_tokens, temperature):
+    """Hash every input that affects the completion"""
+    raw = json.dumps([model, system_message, prompt, max_tokens, temperature], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe LRU with per-entry expiry"""
+
+    backend = "memory"
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, name="llm"):
+        self.name = name   # the `cache` label on prepmate_cache_requests_total
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _load(self, key):
+        return None
+
+    def _store(self, key, value, expires_at):
+        pass
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                cache_requests.inc(self.name, "hit")
+                return entry[1]
+            if entry:
+                del self._entries[key]
+
+        stored = self._load(key)
+        with self._lock:
+            if stored is None:
+                self.misses += 1
+                cache_requests.inc(self.name, "miss")
+                return None
+            self.hits += 1
+            cache_requests.inc(self.name, "hit")
+            self._put(key, stored[1], stored[0])
+            return stored[1]
+
+    def set(self, key, value, ttl):
+        if ttl <= 0:
+            return
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._put(key, value, expires_at)
+        self._store(key, value, expires_at)
+
+    async def get_async(self, key):
+        """get() for coroutines on the event loop"""
+        return self.get(key)
+
+    async def set_async(self, key, value, ttl):
+        self.set(key, value, ttl)
+
+    def _put(self, key, value, expires_at):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "backend":   self.backend,
+                "entries":   len(self._entries),
+                "hits":      self.hits,
+                "misses":    self.misses,
+                "evictions": self.evictions,
+                "hitRatio":  round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+class SQLiteResponseCache(ResponseCache):
+    """LRU memory tier in front of a SQLite file shared by all workers"""
+
+    backend = "sqlite"
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, path=CACHE_DB_PATH, max_rows=None, name="llm"):
+        super().__init__(max_entries, name)
+        self.path = path
+        self.max_rows = max_rows or max_entries * 20
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    # Disk reads and writes (up to the 5 s busy timeout) run on a worker
+    # thread, so they never block the event loop shared by every request
+    async def get_async(self, key):
+        return await asyncio.to_thread(self.get, key)
+
+    async def set_async(self, key, value, ttl):
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    def _load(self, key):
+        try:
+            conn = self._conn()
+            now = time.time()
+            row = conn.execute(
+                "SELECT expires_at, value FROM responses WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row:
+                with conn:
+                    conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            return row
+        except sqlite3.Error as e:
+            log.warning("⚠️  Cache read failed: %s", e)
+            return None
+
+    def _store(self, key, value, expires_at):
+        try:
+            now = time.time()
+            with self._conn() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                    (key, value, expires_at, now)
+                )
+                conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_rows,)
+                )
+        except sqlite3.Error as e:
+            log.warning("⚠️  Cache write failed: %s", e)
+
+
+def create_cache():
+    """Build the response cache for the configured backend (None when disabled)"""
+    if CACHE_BACKEND == "off":
+        return None
+    if CACHE_BACKEND == "sqlite":
+        return SQLiteResponseCache()
+    return ResponseCache()
+
+
+# Shared by every provider; keys include the model, so entries never collide
+response_cache = create_cache()
@@ -0,0 +1,102 @@
+# backend/resumeCache.py
+# Extracted resume text and call-1 analyses, keyed by the SHA-256 of the
+# uploaded file.
+#
+# Candidates upload the same resume to /api/analyze-resume and /api/skill-gap
+# minutes apart, often more than once. The text cache skips re-parsing the
+# file; the analysis cache (keyed by file hash and job description) skips
+# the analysis LLM call, after which the rewrite prompt is identical too and
+# is answered by the response cache. Storage reuses responseCache's bounded
+# LRU, with the same optional SQLite tier shared by all workers.
+
+import io
+import os
+import json
+import hashlib
+import tempfile
+import threading
+
+from responseCache import ResponseCache, SQLiteResponseCache
+from resumeExtractor import extract_resume_text, read_source
+from logger import get_logger
+
+log = get_logger("resumeCache")
+
+RESUME_CACHE_BACKEND     = os.getenv("RESUME_CACHE", "memory")   # memory | sqlite | off
+RESUME_CACHE_MAX_ENTRIES = int(os.getenv("RESUME_CACHE_MAX_ENTRIES", 256))
+RESUME_CACHE_PATH        = os.getenv("RESUME_CACHE_PATH", os.path.join(tempfile.gettempdir(), "prepmate-resumes.db"))
+RESUME_CACHE_TTL         = int(os.getenv("RESUME_CACHE_TTL", 86400))
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def analysis_key(digest, job_description):
+    raw = json.dumps([digest, (job_description or "").strip()], ensure_ascii=False)
+    return "analysis:" + hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResumeCache:
+    """Resume text and analysis JSON in a ResponseCache, keyed by file content"""
+
+    def __init__(self, store, ttl=RESUME_CACHE_TTL):
+        self.store = store
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.counters = {"textHits": 0, "textMisses": 0, "analysisHits": 0, "analysisMisses": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def get_text(self, digest, filename):
+        # The extension picks the parser, so the same bytes as .doc and .txt differ
+        text = self.store.get(f"text:{filename.rsplit('.', 1)[-1].lower()}:{digest}")
+        self._count("textHits" if text is not None else "textMisses")
+        return text
+
+    def set_text(self, digest, filename, text):
+        self.store.set(f"text:{filename.rsplit('.', 1)[-1].lower()}:{digest}", text, self.ttl)
+
+    def get_analysis(self, digest, job_description):
+        raw = self.store.get(analysis_key(digest, job_description))
+        self._count("analysisHits" if raw is not None else "analysisMisses")
+        return json.loads(raw) if raw is not None else None
+
+    def set_analysis(self, digest, job_description, analysis):
+        self.store.set(analysis_key(digest, job_description), json.dumps(analysis, ensure_ascii=False), self.ttl)
+
+    def stats(self):
+        with self._lock:
+            return {**self.store.stats(), **self.counters}
+
+
+def create_resume_cache():
+    """Build the resume cache for the configured backend (None when disabled)"""
+    if RESUME_CACHE_BACKEND == "off" or RESUME_CACHE_TTL <= 0:
+        return None
+    if RESUME_CACHE_BACKEND == "sqlite":
+        return ResumeCache(SQLiteResponseCache(RESUME_CACHE_MAX_ENTRIES, path=RESUME_CACHE_PATH, name="resume"))
+    return ResumeCache(ResponseCache(RESUME_CACHE_MAX_ENTRIES, name="resume"))
+
+
+resume_cache = create_resume_cache()
+
+
+def read_resume(source, filename):
+    """(text, content hash) of an uploaded resume, reusing text extracted from the same bytes"""
+    try:
+        data = read_source(source)
+    except (OSError, ValueError) as e:
+        log.warning("Resume read error: %s", e)
+        return None, None
+    digest = content_hash(data)
+    text = resume_cache.get_text(digest, filename) if resume_cache else None
+    if text is not None:
+        log.info("♻️  Resume text cache hit (%s)", digest[:12])
+        return text, digest
+    text = extract_resume_text(io.BytesIO(data), filename)
+    if text and resume_cache:
+        resume_cache.set_text(digest, filename, text)
+    return text, digest
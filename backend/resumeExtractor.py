@@ -0,0 +1,311 @@
+# backend/resumeExtractor.py
+# Resume text extraction (PDF, DOCX, DOC, TXT) with size, page and time limits.
+#
+# Uploads are read straight from the request's in-memory stream (werkzeug
+# spools parts over 500 KB to a temporary file), never saved under a
+# user-supplied filename.
+#
+# Pages and paragraphs are read lazily and collected in a list, so reading
+# stops as soon as RESUME_MAX_CHARS is reached (no quadratic `text +=`) and
+# pages past RESUME_MAX_PAGES are never parsed. A typical resume (under
+# RESUME_INLINE_MAX_BYTES, fewer than RESUME_PARALLEL_MIN_PAGES pages) is
+# parsed in the calling thread, which app.py already runs off the event loop
+# with asyncio.to_thread. Only large files, long PDFs and PDFs whose pages
+# read slower than RESUME_INLINE_SECONDS go to worker processes that are
+# killed at RESUME_EXTRACT_TIMEOUT: a large DOCX in one worker, PDF page
+# ranges spread over several.
+
+import io
+import os
+import time
+import multiprocessing
+from multiprocessing.connection import wait
+
+from metrics import resume_parse_seconds
+from logger import get_logger
+
+log = get_logger("resumeExtractor")
+
+MAX_CHARS          = int(os.getenv("RESUME_MAX_CHARS", 20000))     # the prompts use far less
+MAX_PAGES          = int(os.getenv("RESUME_MAX_PAGES", 20))
+EXTRACT_TIMEOUT    = float(os.getenv("RESUME_EXTRACT_TIMEOUT", 10))  # seconds per file
+PARALLEL_MIN_PAGES = int(os.getenv("RESUME_PARALLEL_MIN_PAGES", 6))
+EXTRACT_WORKERS    = int(os.getenv("RESUME_EXTRACT_WORKERS", min(4, os.cpu_count() or 1)))
+INLINE_MAX_BYTES   = int(os.getenv("RESUME_INLINE_MAX_BYTES", 256 * 1024))
+INLINE_SECONDS     = float(os.getenv("RESUME_INLINE_SECONDS", 2))
+
+
+def take_text(pieces, max_chars=MAX_CHARS, sep="\n"):
+    """Join text pieces, stopping once max_chars is reached"""
+    parts, size = [], 0
+    for piece in pieces:
+        if not piece:
+            continue
+        parts.append(piece)
+        size += len(piece) + len(sep)
+        if size >= max_chars:
+            break
+    return sep.join(parts)[:max_chars]
+
+
+def pdf_reader(data):
+    import PyPDF2
+    return PyPDF2.PdfReader(io.BytesIO(data))
+
+
+def pdf_pages(reader, start, stop):
+    """Text of each page in [start, stop), parsed one page at a time"""
+    for number in range(start, min(stop, len(reader.pages))):
+        yield reader.pages[number].extract_text() or ""
+
+
+def _extract_range(data, start, stop, max_chars, conn):
+    """Worker process: streams the text of pages [start, stop) over `conn`, then None"""
+    try:
+        size = 0
+        for text in pdf_pages(pdf_reader(data), start, stop):
+            conn.send(text)
+            size += len(text)
+            if size >= max_chars:
+                break
+        conn.send(None)
+    except Exception as e:
+        conn.send(e)
+    finally:
+        conn.close()
+
+
+_context = None
+
+
+def process_context():
+    # forkserver (spawn where it is unavailable), not fork: this process runs
+    # request threads, the event loop and the log listener, and a forked child
+    # can deadlock on a lock one of them held. The fork server is a fresh,
+    # single-threaded process that imports this module and the parsers once;
+    # workers are forked from it and so skip those imports. The main module is
+    # not preloaded, so each worker still imports it (and scripts need an
+    # `if __name__ == "__main__"` guard), one more reason only large or slow
+    # files get a worker.
+    global _context
+    if _context is None:
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            ctx = multiprocessing.get_context("forkserver")
+            ctx.set_forkserver_preload(["resumeExtractor", "PyPDF2", "docx"])
+        else:
+            ctx = multiprocessing.get_context("spawn")
+        _context = ctx
+    return _context
+
+
+def _run(func, args, conn):
+    """Worker process: sends func(*args), or the exception it raised"""
+    try:
+        conn.send(func(*args))
+    except Exception as e:
+        conn.send(e)
+    finally:
+        conn.close()
+
+
+def run_isolated(func, *args, timeout=EXTRACT_TIMEOUT):
+    """func(*args) in a worker process that is killed at `timeout` (raises TimeoutError)"""
+    ctx = process_context()
+    receiver, sender = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_run, args=(func, args, sender), daemon=True)
+    proc.start()
+    sender.close()
+    try:
+        if not receiver.poll(max(timeout, 0)):
+            raise TimeoutError(f"extraction timed out after {timeout:g}s")
+        result = receiver.recv()
+    except EOFError:
+        raise RuntimeError("extraction worker exited without a result") from None
+    finally:
+        if proc.is_alive():
+            proc.kill()
+        proc.join(1)
+        receiver.close()
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def extract_pdf_parallel(data, pages, max_chars=MAX_CHARS, timeout=EXTRACT_TIMEOUT, workers=EXTRACT_WORKERS,
+                         first=0):
+    """
+    Split pages [first, pages) into ranges read by worker processes. Pages
+    stream back as they are read, so once the leading pages fill `max_chars`
+    the remaining workers are killed, and at the deadline whatever arrived is
+    returned.
+    """
+    ctx = process_context()
+    size = -(-(pages - first) // max(1, workers))
+    ranges = [(start, min(start + size, pages)) for start in range(first, pages, size)]
+    received = [[] for _ in ranges]
+    finished, running = set(), {}
+    deadline = time.monotonic() + timeout
+
+    for i, (start, stop) in enumerate(ranges):
+        receiver, sender = ctx.Pipe(duplex=False)
+        proc = ctx.Process(target=_extract_range, args=(data, start, stop, max_chars, sender), daemon=True)
+        proc.start()
+        sender.close()
+        running[receiver] = (i, proc)
+
+    def leading_chars():
+        total = 0
+        for i in range(len(ranges)):
+            total += sum(map(len, received[i]))
+            if i not in finished:
+                break
+        return total
+
+    try:
+        while running and leading_chars() < max_chars:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                log.warning("⏱️  PDF extraction timed out after %gs (%d of %d page ranges unfinished)",
+                            timeout, len(running), len(ranges))
+                break
+            for receiver in wait(list(running), timeout=remaining):
+                i, proc = running[receiver]
+                try:
+                    message = receiver.recv()
+                except EOFError:
+                    message = None
+                if isinstance(message, str):
+                    received[i].append(message)
+                    continue
+                if isinstance(message, Exception):
+                    log.warning("PDF extraction error (pages %s-%s): %s", ranges[i][0] + 1, ranges[i][1], message)
+                finished.add(i)
+                del running[receiver]
+                receiver.close()
+                proc.join()
+    finally:
+        for receiver, (_, proc) in running.items():
+            proc.kill()
+            receiver.close()
+        for _, proc in running.values():
+            proc.join(1)
+
+    return take_text((text for texts in received for text in texts), max_chars)
+
+
+def count_pdf_pages(data):
+    """Worker process: page count of a PDF too large to open in the calling thread"""
+    return len(pdf_reader(data).pages)
+
+
+def read_pages_inline(reader, pages, max_chars, budget):
+    """
+    Texts of pages read in the calling thread, and the first page left unread:
+    `pages` once they are all read or `max_chars` is reached, earlier if
+    reading takes longer than `budget` seconds.
+    """
+    texts, size, start = [], 0, time.monotonic()
+    for number, text in enumerate(pdf_pages(reader, 0, pages)):
+        texts.append(text)
+        size += len(text)
+        if size >= max_chars:
+            break
+        if time.monotonic() - start >= budget and number + 1 < pages:
+            return texts, number + 1
+    return texts, pages
+
+
+def extract_text_from_pdf(data, max_chars=MAX_CHARS, timeout=EXTRACT_TIMEOUT):
+    deadline = time.monotonic() + timeout
+    try:
+        reader = pdf_reader(data) if len(data) < INLINE_MAX_BYTES else None
+        total = len(reader.pages) if reader else run_isolated(count_pdf_pages, data, timeout=timeout)
+        pages = min(total, MAX_PAGES)
+        if total > pages:
+            log.info("📄 Reading the first %s of %s PDF pages", pages, total)
+
+        texts, first = [], 0
+        if reader and pages < PARALLEL_MIN_PAGES:
+            texts, first = read_pages_inline(reader, pages, max_chars, min(INLINE_SECONDS, timeout))
+            if first < pages:
+                log.info("🐢 PDF pages are slow to read; pages %s-%s go to worker processes", first + 1, pages)
+        if first < pages:
+            texts.append(extract_pdf_parallel(data, pages, max_chars, deadline - time.monotonic(), first=first))
+        return take_text(texts, max_chars)
+    except Exception as e:
+        log.warning("PDF extraction error: %s", e)
+        return None
+
+
+def docx_paragraphs(data):
+    import docx
+    return (p.text for p in docx.Document(io.BytesIO(data)).paragraphs)
+
+
+def read_docx(data, max_chars):
+    return take_text(docx_paragraphs(data), max_chars)
+
+
+def parse_docx(data, max_chars):
+    """Small files in the calling thread, large ones in a worker process"""
+    if len(data) < INLINE_MAX_BYTES:
+        return read_docx(data, max_chars)
+    return run_isolated(read_docx, data, max_chars)
+
+
+def extract_text_from_docx(data, max_chars=MAX_CHARS):
+    try:
+        return parse_docx(data, max_chars)
+    except Exception as e:
+        log.warning("DOCX extraction error: %s", e)
+        return None
+
+
+def extract_text_from_doc(data, max_chars=MAX_CHARS):
+    try:
+        text = parse_docx(data, max_chars)
+        return text if text.strip() else None
+    except TimeoutError as e:
+        log.warning("DOC extraction error: %s", e)
+        return None
+    except Exception as e:
+        # Legacy binary .doc is not a zip: keep whatever text it holds as-is
+        log.warning("DOC extraction error, using the raw text: %s", e)
+        return data[:max_chars * 4].decode('utf-8', errors='ignore')[:max_chars] or None
+
+
+def read_source(source):
+    """Bytes of a path or of a binary file-like object (an upload's BytesIO / SpooledTemporaryFile)"""
+    if hasattr(source, "read"):
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return source.read()
+    with open(source, 'rb') as f:
+        return f.read()
+
+
+def extract_resume_text(source, filename, max_chars=MAX_CHARS):
+    """Text of a resume given as a path or file-like object; `filename` picks the format"""
+    ext = filename.rsplit('.', 1)[1].lower()
+    try:
+        data = read_source(source)
+    except (OSError, ValueError) as e:
+        log.warning("Resume read error: %s", e)
+        return None
+
+    start = time.perf_counter()
+    text = parse_resume(data, ext, max_chars)
+    resume_parse_seconds.observe(time.perf_counter() - start, ext)
+    return text
+
+
+def parse_resume(data, ext, max_chars=MAX_CHARS):
+    if ext == 'pdf':
+        return extract_text_from_pdf(data, max_chars)
+    elif ext == 'docx':
+        return extract_text_from_docx(data, max_chars)
+    elif ext == 'doc':
+        return extract_text_from_doc(data, max_chars)
+    elif ext == 'txt':
+        return data[:max_chars * 4].decode('utf-8', errors='ignore')[:max_chars]
+    return None
@@ -0,0 +1,125 @@
+# backend/resumeSections.py
+# Resume section segmenter, so prompts carry the most informative sections
+# rather than whatever PyPDF2 returned first.
+#
+# segment() splits extracted text into sections at recognised headings
+# (SUMMARY, EXPERIENCE, EDUCATION, SKILLS, PROJECTS… and their common
+# variants, including letter-spaced "E X P E R I E N C E"), with the lines
+# above the first heading as the contact block. fit_resume() is a drop-in
+# for promptBudget.fit on resumes: it splits the token budget across
+# sections by weight (experience and skills first, references never) and by
+# overlap with the job description, fits each section on its own and keeps
+# the sections in their original order under their headings. Text with no
+# recognisable structure falls back to fit().
+
+import re
+
+from promptBudget import fit, compact, allocate, estimate_tokens, terms_of
+
+HEADINGS = {
+    "summary":        ("summary", "professional summary", "career summary", "profile", "professional profile",
+                       "objective", "career objective", "about me"),
+    "experience":     ("experience", "work experience", "professional experience", "relevant experience",
+                       "employment", "employment history", "work history", "career history", "internships"),
+    "education":      ("education", "academic background", "academics", "education and training",
+                       "academic qualifications", "qualifications"),
+    "skills":         ("skills", "technical skills", "key skills", "core skills", "core competencies",
+                       "competencies", "technologies", "tech stack", "tools", "skills and tools",
+                       "tools and technologies", "skills and technologies"),
+    "projects":       ("projects", "personal projects", "key projects", "selected projects", "side projects",
+                       "academic projects"),
+    "certifications": ("certifications", "certificates", "licenses", "licenses and certifications",
+                       "certifications and licenses", "courses"),
+    "achievements":   ("achievements", "awards", "honors", "honours", "accomplishments", "awards and honors",
+                       "awards and achievements"),
+    "publications":   ("publications", "research experience", "patents"),
+    "volunteering":   ("volunteering", "volunteer experience", "leadership experience", "activities",
+                       "extracurricular activities"),
+    "languages":      ("languages",),
+    "interests":      ("interests", "hobbies", "hobbies and interests"),
+    "references":     ("references",),
+}
+ALIASES = {alias: name for name, aliases in HEADINGS.items() for alias in aliases}
+
+# Share of the budget each section asks for, before JD relevance
+SECTION_WEIGHTS = {
+    "experience": 4, "skills": 3, "projects": 2, "summary": 1.5, "education": 1, "certifications": 1,
+    "achievements": 1, "publications": 0.5, "volunteering": 0.5, "other": 0.5, "contact": 0.3,
+    "languages": 0.3, "interests": 0.1, "references": 0,
+}
+
+SPACED   = re.compile(r"^(?:[A-Za-z&] ){3,}[A-Za-z]$")
+NON_WORD = re.compile(r"[^a-z ]+")
+
+
+def heading_of(line):
+    """Canonical section name if `line` is a section heading, else None"""
+    line = line.strip().rstrip(":").strip()
+    if not line or len(line) > 40:
+        return None
+    if SPACED.match(line):
+        line = line.replace(" ", "")
+    key = " ".join(NON_WORD.sub(" ", line.lower().replace("&", " and ")).split())
+    return ALIASES.get(key)
+
+
+def is_caps_heading(line):
+    """A 2-4 word all-caps line with no digits, e.g. OPEN SOURCE (one word may be a listed skill)"""
+    return (2 <= len(line.split()) <= 4 and line.upper() == line and any(c.isalpha() for c in line)
+            and not any(c.isdigit() for c in line))
+
+
+def segment(text):
+    """
+    [{"section", "heading", "lines"}] in document order. Lines above the first
+    heading form "contact"; unknown all-caps headings after it form "other".
+    """
+    sections = [{"section": "contact", "heading": "", "lines": []}]
+    found = False
+    for line in text.split("\n"):
+        stripped = line.strip()
+        name = heading_of(stripped)
+        if name is None and found and is_caps_heading(stripped):
+            name = "other"
+        if name:
+            found = found or name != "other"
+            sections.append({"section": name, "heading": stripped.rstrip(":"), "lines": []})
+        elif stripped:
+            sections[-1]["lines"].append(stripped)
+    return [s for s in sections if s["lines"]] if found else []
+
+
+def fit_resume(text, budget, query=None, compacted=False, weights=SECTION_WEIGHTS):
+    """
+    Resume text within `budget` tokens, packed section by section. Same
+    signature as promptBudget.fit, so it can be passed to fit_fields.
+    """
+    if not compacted:
+        text = compact(text)
+    if budget <= 0:
+        return ""
+    if estimate_tokens(text) <= budget:
+        return text
+    sections = [s for s in segment(text) if weights.get(s["section"], 0.5) > 0]
+    if len(sections) < 2:
+        return fit(text, budget, query, compacted=True)
+
+    query_terms = terms_of(query)
+    bodies, heads, shares_weights = [], [], []
+    for s in sections:
+        body = "\n".join(s["lines"])
+        # Sections that mention more of the JD get a larger share
+        overlap = len(terms_of(body) & query_terms) / len(query_terms) if query_terms else 0.0
+        bodies.append(body)
+        heads.append(estimate_tokens(s["heading"]) + 2 if s["heading"] else 1)
+        shares_weights.append(weights.get(s["section"], 0.5) * (1 + 2 * overlap))
+
+    costs = [estimate_tokens(b) for b in bodies]
+    shares = allocate(costs, budget - sum(heads), shares_weights)
+
+    packed = []
+    for s, body, share in zip(sections, bodies, shares):
+        body = fit(body, share, query, compacted=True)
+        if body:
+            packed.append(f"{s['heading']}\n{body}" if s["heading"] else body)
+    return "\n\n".join(packed)
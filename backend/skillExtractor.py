@@ -0,0 +1,346 @@
+# backend/skillExtractor.py
+# Local skill extraction for job descriptions, so create-interview can skip
+# the extract_skills LLM call for the common roles most JDs are for.
+#
+# A curated taxonomy (canonical skill -> aliases, e.g. "JS" -> JavaScript,
+# "k8s" -> Kubernetes) is compiled once into an Aho-Corasick automaton that
+# finds every alias in one pass over the JD. Matches are normalised to the
+# canonical name, ranked by frequency and first position, and returned in
+# the same technicalSkills / softSkills / requiredCompetencies / primaryFocus
+# shape as the LLM. When too few skills are found to be confident (non-tech
+# roles, unusual stacks), None is returned and the caller asks the LLM.
+
+import os
+import re
+import threading
+from collections import deque
+from logger import get_logger
+
+log = get_logger("skillExtractor")
+
+LOCAL_SKILLS   = os.getenv("LOCAL_SKILLS", "on").lower() not in ("0", "off", "false")
+MIN_CONFIDENCE = float(os.getenv("LOCAL_SKILLS_MIN_CONFIDENCE", 0.75))
+MAX_TECHNICAL  = 8
+MAX_SOFT       = 4
+
+# Canonical name -> (category, aliases). Aliases are matched case-insensitively
+# on word boundaries; those in EXACT_ALIASES only in exactly that case.
+TECHNICAL = {
+    "Python":           ("language", ["python", "python3"]),
+    "Java":             ("language", ["java", "java 8", "java 11", "java 17"]),
+    "JavaScript":       ("language", ["javascript", "js", "ecmascript", "es6"]),
+    "TypeScript":       ("language", ["typescript"]),
+    "Go":               ("language", ["golang", "Go"]),
+    "Rust":             ("language", ["rust"]),
+    "C++":              ("language", ["c++", "cpp"]),
+    "C#":               ("language", ["c#", "csharp", "c sharp"]),
+    "Kotlin":           ("language", ["kotlin"]),
+    "Swift":            ("language", ["swiftui"]),
+    "Ruby":             ("language", ["ruby"]),
+    "PHP":              ("language", ["php"]),
+    "Scala":            ("language", ["scala"]),
+    "R":                ("language", ["R", "r programming", "rstudio"]),
+    "SQL":              ("database", ["sql", "t-sql", "pl/sql"]),
+    "Bash":             ("devops",   ["bash", "shell scripting", "shell script"]),
+    "React":            ("frontend", ["react", "react.js", "reactjs"]),
+    "Angular":          ("frontend", ["angular", "angularjs"]),
+    "Vue.js":           ("frontend", ["vue", "vue.js", "vuejs"]),
+    "Next.js":          ("frontend", ["next.js", "nextjs"]),
+    "HTML":             ("frontend", ["html", "html5"]),
+    "CSS":              ("frontend", ["css", "css3", "sass", "scss", "tailwind", "tailwindcss"]),
+    "Redux":            ("frontend", ["redux"]),
+    "Webpack":          ("frontend", ["webpack", "vite"]),
+    "Node.js":          ("backend",  ["node.js", "nodejs"]),
+    "Express":          ("backend",  ["express.js", "expressjs"]),
+    "Django":           ("backend",  ["django"]),
+    "Flask":            ("backend",  ["flask"]),
+    "FastAPI":          ("backend",  ["fastapi"]),
+    "Spring Boot":      ("backend",  ["spring", "spring boot", "springboot"]),
+    ".NET":             ("backend",  [".net", "asp.net", "dotnet", ".net core"]),
+    "Ruby on Rails":    ("backend",  ["rails", "ruby on rails", "ror"]),
+    "REST APIs":        ("backend",  ["restful", "rest api", "rest apis", "restful apis"]),
+    "GraphQL":          ("backend",  ["graphql"]),
+    "gRPC":             ("backend",  ["grpc"]),
+    "Microservices":    ("backend",  ["microservices", "microservice", "service-oriented architecture", "soa"]),
+    "System Design":    ("backend",  ["system design", "distributed systems", "scalable systems"]),
+    "PostgreSQL":       ("database", ["postgresql", "postgres", "psql"]),
+    "MySQL":            ("database", ["mysql", "mariadb"]),
+    "MongoDB":          ("database", ["mongodb", "mongo"]),
+    "Redis":            ("database", ["redis"]),
+    "Elasticsearch":    ("database", ["elasticsearch", "elastic search", "opensearch"]),
+    "Cassandra":        ("database", ["cassandra"]),
+    "DynamoDB":         ("database", ["dynamodb"]),
+    "NoSQL":            ("database", ["nosql"]),
+    "AWS":              ("cloud",    ["aws", "amazon web services", "ec2", "s3", "aws lambda"]),
+    "Azure":            ("cloud",    ["azure", "microsoft azure"]),
+    "GCP":              ("cloud",    ["gcp", "google cloud", "google cloud platform", "bigquery"]),
+    "Docker":           ("devops",   ["docker", "containers", "containerization"]),
+    "Kubernetes":       ("devops",   ["kubernetes", "k8s", "eks", "gke", "aks", "helm"]),
+    "Terraform":        ("devops",   ["terraform", "infrastructure as code", "iac"]),
+    "Ansible":          ("devops",   ["ansible"]),
+    "CI/CD":            ("devops",   ["ci/cd", "ci cd", "continuous integration", "continuous delivery",
+                                      "continuous deployment", "jenkins", "github actions", "gitlab ci"]),
+    "Linux":            ("devops",   ["linux", "unix"]),
+    "Git":              ("devops",   ["git", "github", "gitlab", "version control"]),
+    "Prometheus":       ("devops",   ["prometheus", "grafana", "observability", "datadog"]),
+    "Kafka":            ("data",     ["kafka", "apache kafka"]),
+    "RabbitMQ":         ("data",     ["rabbitmq", "message queues", "message queue"]),
+    "Spark":            ("data",     ["spark", "apache spark", "pyspark"]),
+    "Airflow":          ("data",     ["airflow", "apache airflow"]),
+    "Hadoop":           ("data",     ["hadoop", "hdfs", "hive"]),
+    "ETL":              ("data",     ["etl", "elt", "data pipelines", "data pipeline"]),
+    "Snowflake":        ("data",     ["snowflake"]),
+    "dbt":              ("data",     ["dbt"]),
+    "Pandas":           ("data",     ["pandas"]),
+    "NumPy":            ("data",     ["numpy"]),
+    "Excel":            ("data",     ["microsoft excel", "ms excel", "spreadsheets"]),
+    "Tableau":          ("data",     ["tableau"]),
+    "Power BI":         ("data",     ["power bi", "powerbi"]),
+    "Statistics":       ("data",     ["statistics", "statistical analysis", "a/b testing", "hypothesis testing"]),
+    "Machine Learning": ("ml",       ["machine learning", "ml"]),
+    "Deep Learning":    ("ml",       ["deep learning", "neural networks", "neural network"]),
+    "TensorFlow":       ("ml",       ["tensorflow", "keras"]),
+    "PyTorch":          ("ml",       ["pytorch", "torch"]),
+    "scikit-learn":     ("ml",       ["scikit-learn", "sklearn", "scikit learn"]),
+    "NLP":              ("ml",       ["nlp", "natural language processing"]),
+    "Computer Vision":  ("ml",       ["computer vision", "opencv"]),
+    "LLMs":             ("ml",       ["llm", "llms", "large language models", "generative ai", "genai"]),
+    "MLOps":            ("ml",       ["mlops", "mlflow", "kubeflow"]),
+    "Android":          ("mobile",   ["android", "android sdk", "jetpack compose"]),
+    "iOS":              ("mobile",   ["ios", "uikit", "xcode"]),
+    "React Native":     ("mobile",   ["react native"]),
+    "Flutter":          ("mobile",   ["flutter", "dart"]),
+    "Unit Testing":     ("testing",  ["unit testing", "unit tests", "tdd", "test-driven development",
+                                      "pytest", "junit", "jest"]),
+    "Test Automation":  ("testing",  ["test automation", "automated testing", "selenium", "cypress",
+                                      "playwright", "qa automation"]),
+    "Security":         ("security", ["application security", "appsec", "owasp", "penetration testing",
+                                      "security best practices", "oauth", "iam"]),
+    "Agile":            ("process",  ["agile", "scrum", "kanban", "sprint planning"]),
+    "Jira":             ("process",  ["jira", "confluence"]),
+    "Figma":            ("design",   ["figma", "wireframing", "prototyping"]),
+}
+
+SOFT = {
+    "Communication":          ["communication", "communicate", "communicator", "written and verbal"],
+    "Teamwork":               ["teamwork", "team player", "collaboration", "collaborate", "collaborative",
+                               "cross-functional"],
+    "Leadership":             ["leadership", "lead a team", "leading teams", "technical leadership"],
+    "Problem Solving":        ["problem solving", "problem-solving", "problem solver", "troubleshooting"],
+    "Mentoring":              ["mentoring", "mentor", "coaching"],
+    "Ownership":              ["ownership", "accountability", "self-starter", "self-motivated", "proactive"],
+    "Attention to Detail":    ["attention to detail", "detail-oriented", "detail oriented"],
+    "Time Management":        ["time management", "prioritization", "prioritisation", "multitasking",
+                               "meet deadlines"],
+    "Stakeholder Management": ["stakeholder management", "stakeholders", "client-facing", "customer-facing"],
+    "Adaptability":           ["adaptability", "adaptable", "fast-paced", "ambiguity"],
+    "Critical Thinking":      ["critical thinking", "analytical skills", "analytical thinking", "analytical"],
+}
+
+# Aliases that are also common words only count in this exact case ("Go", not "go")
+EXACT_ALIASES = {"Go", "R", "Swift", "Excel"}
+
+COMPETENCIES = {
+    "frontend": "Frontend development",
+    "backend":  "Backend and API design",
+    "database": "Database design",
+    "cloud":    "Cloud infrastructure",
+    "devops":   "CI/CD and automation",
+    "data":     "Data engineering",
+    "ml":       "Machine learning",
+    "mobile":   "Mobile development",
+    "testing":  "Software testing",
+    "security": "Application security",
+}
+
+# Title keywords -> (primaryFocus, core competencies, typical soft skills)
+ROLES = [
+    (("full stack", "fullstack", "full-stack"),
+     ("Full-stack web development", ["Frontend development", "Backend and API design"], ["Communication", "Teamwork"])),
+    (("frontend", "front-end", "front end", "ui engineer", "ui developer", "web developer"),
+     ("Frontend web development", ["Frontend development", "UI performance"], ["Communication", "Attention to Detail"])),
+    (("backend", "back-end", "back end", "api engineer"),
+     ("Backend services and APIs", ["Backend and API design", "Database design"], ["Problem Solving", "Teamwork"])),
+    (("data scientist", "data science"),
+     ("Statistical modelling and machine learning", ["Machine learning", "Data analysis"], ["Communication", "Critical Thinking"])),
+    (("machine learning", "ml engineer", "ai engineer", "mlops"),
+     ("Building and deploying ML models", ["Machine learning", "Model deployment"], ["Problem Solving", "Teamwork"])),
+    (("data engineer", "etl", "analytics engineer"),
+     ("Data pipelines and warehousing", ["Data engineering", "Database design"], ["Problem Solving", "Teamwork"])),
+    (("data analyst", "business analyst", "bi analyst", "bi developer"),
+     ("Data analysis and reporting", ["Data analysis", "Reporting and visualisation"], ["Communication", "Attention to Detail"])),
+    (("devops", "site reliability", "sre", "platform engineer", "infrastructure engineer", "cloud engineer"),
+     ("Infrastructure, automation and reliability", ["CI/CD and automation", "Cloud infrastructure"], ["Problem Solving", "Ownership"])),
+    (("android", "ios", "mobile"),
+     ("Mobile app development", ["Mobile development", "UI performance"], ["Attention to Detail", "Teamwork"])),
+    (("qa", "quality assurance", "test engineer", "sdet", "tester"),
+     ("Software quality and test automation", ["Software testing", "Test automation"], ["Attention to Detail", "Communication"])),
+    (("security", "appsec", "penetration"),
+     ("Application and infrastructure security", ["Application security", "Threat modelling"], ["Attention to Detail", "Critical Thinking"])),
+    (("software engineer", "software developer", "developer", "programmer", "swe", "engineer"),
+     ("Software engineering", ["Software design", "Code quality"], ["Problem Solving", "Teamwork"])),
+]
+
+SENIOR_LEVELS = ("senior", "lead", "staff", "principal", "manager", "architect")
+
+stats = {"local": 0, "fallback": 0}
+stats_lock = threading.Lock()
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over every alias; find() is one pass over the text"""
+
+    def __init__(self, patterns):
+        # patterns: alias -> payload; matching is on the lower-cased alias
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        for alias, payload in patterns.items():
+            state = 0
+            for ch in alias.lower():
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                state = nxt
+            self.out[state].append((alias, payload))
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def find(self, text):
+        """[(start, end, payload)] for whole-word matches, leftmost-longest, non-overlapping"""
+        lower = text.lower()
+        goto, fail, out = self.goto, self.fail, self.out
+        matches = []
+        state = 0
+        for i, ch in enumerate(lower):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for alias, payload in out[state]:
+                start, end = i + 1 - len(alias), i + 1
+                if not is_boundary(lower, start, end):
+                    continue
+                if alias in EXACT_ALIASES and (text[start:end] != alias or lower[end:end + 1] == "-"):
+                    continue
+                matches.append((start, end, payload))
+
+        matches.sort(key=lambda m: (m[0], m[0] - m[1]))
+        kept, last_end = [], -1
+        for start, end, payload in matches:
+            if start >= last_end:
+                kept.append((start, end, payload))
+                last_end = end
+        return kept
+
+
+def is_boundary(text, start, end):
+    before = text[start - 1] if start > 0 else " "
+    after = text[end] if end < len(text) else " "
+    # "Java" is not in "JavaScript", nor "C" in "C++"
+    return not (before.isalnum() or before in "_+#.") and not (after.isalnum() or after in "_+#")
+
+
+def build_matcher():
+    patterns = {}
+    for name, (category, aliases) in TECHNICAL.items():
+        for alias in [name, *aliases]:
+            patterns[alias if alias in EXACT_ALIASES else alias.lower()] = ("technical", name, category)
+    for name, aliases in SOFT.items():
+        for alias in [name, *aliases]:
+            patterns.setdefault(alias.lower(), ("soft", name, None))
+    return SkillMatcher(patterns)
+
+
+matcher = build_matcher()
+
+
+def match_role(job_title):
+    title = (job_title or "").lower()
+    for keywords, profile in ROLES:
+        if any(re.search(rf"(?<![a-z]){re.escape(k)}(?![a-z])", title) for k in keywords):
+            return profile
+    return None
+
+
+def ranked(counter):
+    """Names by mention count, then first position"""
+    return [name for name, _ in sorted(counter.items(), key=lambda kv: (-kv[1][0], kv[1][1]))]
+
+
+def confidence(technical, soft, role):
+    """0-1: mostly how many distinct technical skills the JD names"""
+    return (0.7 * min(len(technical) / 5, 1.0)
+            + 0.15 * min(len(soft) / 2, 1.0)
+            + (0.15 if role else 0.0))
+
+
+def extract_skills_local(job_title, job_description, experience_level=""):
+    """Skills dict in the LLM's shape, or None when coverage is too low to trust"""
+    if not LOCAL_SKILLS:
+        return None
+
+    technical, soft, categories = {}, {}, {}
+    for start, _, (kind, name, category) in matcher.find(f"{job_title}\n{job_description}"):
+        bucket = technical if kind == "technical" else soft
+        count, first = bucket.get(name, (0, start))
+        bucket[name] = (count + 1, first)
+        if category:
+            categories[category] = categories.get(category, 0) + 1
+
+    role = match_role(job_title)
+    score = confidence(technical, soft, role)
+    if score < MIN_CONFIDENCE:
+        with stats_lock:
+            stats["fallback"] += 1
+        log.info("🔎 Local skills not confident (%.2f: %s technical) — using the LLM", score, len(technical))
+        return None
+
+    top_categories = [c for c in sorted(categories, key=categories.get, reverse=True) if c in COMPETENCIES]
+    focus, core, typical_soft = role or (None, [], ["Problem Solving", "Communication"])
+
+    competencies = list(core)
+    for category in top_categories:
+        if COMPETENCIES[category] not in competencies:
+            competencies.append(COMPETENCIES[category])
+    if any(level in (experience_level or "").lower() for level in SENIOR_LEVELS):
+        competencies.append("Technical leadership")
+
+    soft_skills = ranked(soft)[:MAX_SOFT]
+    for name in typical_soft:
+        if len(soft_skills) >= 2:
+            break
+        if name not in soft_skills:
+            soft_skills.append(name)
+
+    if not focus:
+        focus = " and ".join(COMPETENCIES[c] for c in top_categories[:2]) or "Software engineering"
+
+    with stats_lock:
+        stats["local"] += 1
+    log.info("⚡ Skills matched locally (%.2f: %s technical, %s soft)", score, len(technical), len(soft))
+    return {
+        "technicalSkills":      ranked(technical)[:MAX_TECHNICAL],
+        "softSkills":           soft_skills,
+        "requiredCompetencies": competencies[:4],
+        "primaryFocus":         focus,
+    }
+
+
+def skill_stats():
+    with stats_lock:
+        total = stats["local"] + stats["fallback"]
+        return {**stats, "localRate": round(stats["local"] / total, 3) if total else 0.0,
+                "enabled": LOCAL_SKILLS, "minConfidence": MIN_CONFIDENCE}
@@ -0,0 +1,300 @@
+# backend/stubServer.py
+# Local stand-in for the LLM HTTP APIs, so transport and throughput
+# benchmarks run without network access or API keys.
+#
+# Speaks both providers' protocols: Gemini's generateContent (any other POST
+# path) and the OpenAI-style /v1/chat/completions the Hugging Face client
+# uses, streamed or not. Latency can be fixed or drawn from a distribution,
+# and a share of calls can be failed with 503 / 429 or have their reply cut
+# short, the way a loaded inference API misbehaves.
+#
+#   server = start_stub_server(latency=parse_latency("lognormal:0.3,0.5"), truncate_rate=0.05,
+#                              error_rates={503: 0.02, 429: 0.02}, reply=llm_reply)
+#   os.environ["GEMINI_API_URL"] = server.url + "/v1/models/stub:generateContent"
+#   os.environ["HF_BASE_URL"]    = server.url
+
+import re
+import json
+import time
+import uuid
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_REPLY = json.dumps({
+    "technicalSkills":      ["Python", "SQL", "REST APIs"],
+    "softSkills":           ["Communication", "Teamwork"],
+    "requiredCompetencies": ["Problem solving"],
+    "primaryFocus":         "Backend development",
+})
+
+ERROR_BODIES = {
+    503: {"error": "Model is currently loading", "estimated_time": 20.0},
+    429: {"error": "Rate limit reached. Please retry later."},
+}
+
+COUNTERS = ("connections", "requests", "truncated", "503", "429")
+
+FIRST_TOKEN_SHARE  = 0.3   # streamed replies: share of the latency spent before the first chunk
+STREAM_CHUNK_CHARS = 24
+
+
+def parse_latency(spec):
+    """Latency in seconds from "0.05", "fixed:0.05", "uniform:LOW,HIGH", "lognormal:MEDIAN,SIGMA" or "exp:MEAN"
+
+    Returns a number (fixed) or a zero-argument callable drawing one sample.
+    """
+    kind, _, params = str(spec).partition(":")
+    if not params:
+        return float(kind)
+    values = [float(v) for v in params.split(",")]
+    if kind == "fixed":
+        return values[0]
+    if kind == "uniform":
+        return lambda: random.uniform(values[0], values[1])
+    if kind == "lognormal":
+        # Parameterised by the median, so "lognormal:0.3,0.5" centres on 300 ms with a long tail
+        median, sigma = values
+        return lambda: median * random.lognormvariate(0, sigma)
+    if kind == "exp":
+        return lambda: random.expovariate(1 / values[0])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+# ─── Endpoint-shaped replies ────────────────────────────────────────────────
+
+def questions_reply(count):
+    levels = ["Easy", "Medium", "Medium", "Hard"]
+    return json.dumps({"questions": [
+        {"id": i + 1, "question": f"Walk me through how you would approach problem {i + 1} in this role.",
+         "difficulty": levels[i % len(levels)], "focusArea": "System design"}
+        for i in range(count)
+    ]})
+
+
+def answer_result(index=None):
+    result = {
+        "score":        7,
+        "feedback":     ["Clear structure", "Relevant to the question"],
+        "strengths":    ["Concrete example", "Good communication"],
+        "improvements": ["Quantify the outcome", "Mention trade-offs"],
+        "hasExamples":  True,
+    }
+    return {"index": index, **result} if index else result
+
+
+def review_reply(prompt):
+    sections = re.findall(r"^- ([^:\n]+): \d+", prompt, re.MULTILINE) or ["Work Experience", "Skills"]
+    return json.dumps({
+        "atsScore":        72,
+        "sectionFeedback": [{"section": s, "score": 70, "feedback": f"{s} is clear; add measurable results."}
+                            for s in sections],
+        "keywordGaps":     ["Kubernetes", "CI/CD", "Terraform", "GraphQL", "Agile"],
+        "strengths":       ["Clear career progression", "Relevant technical skills", "Good education"],
+        "improvements":    ["Add quantifiable achievements", "Use stronger action verbs", "Group the skills"],
+    })
+
+
+SKILL_GAP_REPLY = json.dumps({
+    "presentSkills":  ["Python", "SQL", "REST APIs"],
+    "missingSkills":  ["Kubernetes", "Terraform"],
+    "partialSkills":  ["AWS"],
+    "summary":        "Strong backend fundamentals. The main gaps are container orchestration and infrastructure as code.",
+    "totalTimeframe": "8-10 weeks",
+    "roadmap": [
+        {"skill": skill, "priority": priority, "timeframe": "3-4 weeks", "matchScore": 40,
+         "description": f"{skill} is required for deploying the team's services.",
+         "resources": [{"name": f"{skill} documentation", "url": "https://example.com"}],
+         "subtasks": ["Read the basics", "Build a small project", "Apply it at work"]}
+        for skill, priority in [("Kubernetes", "high"), ("Terraform", "medium")]
+    ],
+})
+
+RESUME_REPLY = """PROFESSIONAL SUMMARY
+Backend engineer with 5 years of experience building Python services.
+
+WORK EXPERIENCE
+Senior Software Engineer, Acme Corp (2021-Present)
+- Cut API latency by 40% by introducing Redis caching
+
+EDUCATION
+B.Sc. Computer Science
+
+SKILLS
+Python, SQL, Docker, Kubernetes, AWS"""
+
+
+def llm_reply(prompt):
+    """A plausible reply for each of app.py's prompts, recognised by their wording"""
+    if match := re.search(r"Score ALL (\d+) answers", prompt):
+        return json.dumps({"results": [answer_result(i + 1) for i in range(int(match.group(1)))]})
+    if "Score this candidate answer" in prompt:
+        return json.dumps(answer_result())
+    if match := re.search(r"Generate exactly (\d+)", prompt):
+        return questions_reply(int(match.group(1)))
+    if "Rewrite this resume" in prompt:
+        return RESUME_REPLY
+    if "ATS resume reviewer" in prompt:
+        return review_reply(prompt)
+    if "Compare the resume against the job description" in prompt:
+        return SKILL_GAP_REPLY
+    return DEFAULT_REPLY
+
+
+# ─── Server ──────────────────────────────────────────────────────────────────
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers POSTs in the Gemini or the OpenAI chat-completions shape, depending on the path"""
+
+    protocol_version = "HTTP/1.1"   # keep connections open between requests
+    disable_nagle_algorithm = True   # no delayed-ACK stalls on reused connections
+
+    def setup(self):
+        super().setup()
+        self.server.count("connections")
+        # Stands in for the TCP + TLS handshake a real API costs per new connection
+        if self.server.connect_delay:
+            time.sleep(self.server.connect_delay)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length)
+        self.server.count("requests")
+        delay = self.server.next_latency()
+
+        status = self.server.next_error()
+        if status:
+            self.server.count(str(status))
+            time.sleep(delay * FIRST_TOKEN_SHARE)   # errors come back quicker than completions
+            return self.send_json(ERROR_BODIES[status], status)
+
+        try:
+            request = json.loads(raw or b"{}")
+        except ValueError:
+            request = {}
+        chat = self.path.rstrip("/").endswith("/chat/completions")
+        text, truncated = self.server.make_reply(prompt_of(request, chat))
+
+        if chat and request.get("stream"):
+            return self.send_stream(text, truncated, request.get("model", "stub"), delay)
+        if delay:
+            time.sleep(delay)
+        if chat:
+            return self.send_json({
+                "id": f"chatcmpl-{uuid.uuid4().hex[:12]}", "object": "chat.completion",
+                "created": int(time.time()), "model": request.get("model", "stub"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text},
+                             "finish_reason": "length" if truncated else "stop"}],
+                "usage": {"prompt_tokens": length // 4, "completion_tokens": len(text) // 4,
+                          "total_tokens": (length + len(text)) // 4},
+            })
+        self.send_json({"candidates": [{"content": {"parts": [{"text": text}]}}]})
+
+    def send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_stream(self, text, truncated, model, delay):
+        """Server-sent events, one chunk per STREAM_CHUNK_CHARS, spread over the latency"""
+        time.sleep(delay * FIRST_TOKEN_SHARE)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        pieces = [text[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(text), STREAM_CHUNK_CHARS)] or [""]
+        gap = delay * (1 - FIRST_TOKEN_SHARE) / len(pieces)
+        chunk_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        for i, piece in enumerate(pieces):
+            last = i == len(pieces) - 1
+            self.write_chunk("data: " + json.dumps({
+                "id": chunk_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "delta": {"role": "assistant", "content": piece},
+                             "finish_reason": ("length" if truncated else "stop") if last else None}],
+            }) + "\n\n")
+            if gap and not last:
+                time.sleep(gap)
+        self.write_chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def write_chunk(self, data):
+        data = data.encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def prompt_of(request, chat):
+    """The prompt text of a chat-completions or generateContent request body"""
+    try:
+        if chat:
+            return request["messages"][-1]["content"]
+        return request["contents"][-1]["parts"][0]["text"]
+    except (KeyError, IndexError, TypeError):
+        return ""
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.0, connect_delay=0.0, reply=DEFAULT_REPLY,
+                 truncate_rate=0.0, error_rates=None):
+        super().__init__(address, StubHandler)
+        self.latency = latency
+        self.connect_delay = connect_delay
+        self.reply = reply
+        self.truncate_rate = truncate_rate
+        self.error_rates = dict(error_rates or {})
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def reset(self):
+        with self._lock:
+            self.counters = dict.fromkeys(COUNTERS, 0)
+
+    def next_latency(self):
+        return self.latency() if callable(self.latency) else self.latency
+
+    def next_error(self):
+        """503 / 429 for this call, or None, drawn from error_rates"""
+        draw = random.random()
+        for status, rate in self.error_rates.items():
+            if draw < rate:
+                return status
+            draw -= rate
+        return None
+
+    def make_reply(self, prompt):
+        """(text, truncated): the reply, cut short at a random point for truncate_rate of calls"""
+        text = self.reply(prompt) if callable(self.reply) else self.reply
+        if len(text) > 1 and random.random() < self.truncate_rate:
+            self.count("truncated")
+            return text[:random.randint(len(text) // 3, len(text) - 1)], True
+        return text, False
+
+
+def start_stub_server(latency=0.0, connect_delay=0.0, reply=DEFAULT_REPLY, port=0,
+                      truncate_rate=0.0, error_rates=None):
+    """Start a stub server on a background thread; call .shutdown() when done
+
+    `latency` is seconds or a callable (see parse_latency); `reply` a string or
+    a function of the prompt (see llm_reply); `error_rates` maps 503 / 429 to
+    the share of calls that fail with it.
+    """
+    server = StubServer(("127.0.0.1", port), latency, connect_delay, reply, truncate_rate, error_rates)
+    threading.Thread(target=server.serve_forever, name="stub-llm-server", daemon=True).start()
+    return server
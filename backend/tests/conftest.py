@@ -0,0 +1,74 @@
+# backend/tests/conftest.py
+# Shared pytest setup: backend modules on the path, no network, API keys or
+# shared caches, and a stub LLM server (stubServer.py) for transport tests.
+#
+#   cd backend && python -m pytest
+
+import os
+import sys
+import weakref
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Read by the modules at import time, so set before any test module imports them
+os.environ.update({
+    "LOG_LEVEL": "CRITICAL",
+    "LLM_CACHE_BACKEND": "off",
+    "RESUME_CACHE": "off",
+    "QUESTION_BANK": "off",
+    "LLM_RATE_LIMIT_BACKEND": "memory",
+})
+
+from stubServer import start_stub_server  # noqa: E402
+from rateLimiter import TokenBucket  # noqa: E402
+
+
+@pytest.fixture
+def stub():
+    """Stub LLM server answering every call instantly with its default JSON reply"""
+    server = start_stub_server()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def gemini(stub, monkeypatch):
+    """geminiService pointed at the stub, with fresh pools and no rate limit"""
+    import geminiService
+    monkeypatch.setattr(geminiService, "GEMINI_API_KEY", "stub")
+    monkeypatch.setattr(geminiService, "GEMINI_API_URL", stub.url + "/v1/models/stub:generateContent")
+    monkeypatch.setattr(geminiService, "rate_limiter", TokenBucket("Gemini", 1000, 1000))
+    monkeypatch.setattr(geminiService, "session", None)
+    monkeypatch.setattr(geminiService, "async_clients", geminiService.weakref.WeakKeyDictionary())
+    monkeypatch.setattr(geminiService, "pool_counters",
+                        {"sync": {"requests": 0}, "async": {"requests": 0, "connections": 0}})
+    yield geminiService
+    if geminiService.session is not None:
+        geminiService.session.close()
+
+
+@pytest.fixture
+def huggingface(stub, monkeypatch):
+    """huggingfaceService pointed at the stub (as HF_BASE_URL does), with no rate limit"""
+    import huggingfaceService
+    monkeypatch.setattr(huggingfaceService, "HF_API_KEY", "stub")
+    monkeypatch.setattr(huggingfaceService, "HF_BASE_URL", stub.url)
+    monkeypatch.setattr(huggingfaceService, "clients", weakref.WeakKeyDictionary())
+    monkeypatch.setattr(huggingfaceService, "rate_limiter", TokenBucket("HuggingFace", 1000, 1000))
+    return huggingfaceService
+
+
+def pytest_terminal_summary(terminalreporter):
+    """bench_json_parsers' results table, after a `-m bench` run"""
+    rows = [dict(report.user_properties)["bench"] for report in terminalreporter.stats.get("passed", [])
+            if "bench" in dict(report.user_properties)]
+    if not rows:
+        return
+    from bench_json_parsers import HEADER, table_row
+    terminalreporter.section("JSON parser benchmarks")
+    terminalreporter.write_line(HEADER)
+    for row in rows:
+        terminalreporter.write_line(table_row(*row))
@@ -0,0 +1,65 @@
+# backend/tests/test_analyze_answer.py
+# /api/analyze-answer: request validation, the local fallback when the LLM
+# call fails, and local scoring only where its result is used.
+
+import pytest
+
+import app as app_module
+from stubServer import answer_result
+
+ANSWER = {"question": "How would you design a rate limiter?", "mode": "full",
+          "answer": "At my last job I built a token bucket in Redis that cut 429s by 40% during launches."}
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+
+@pytest.mark.parametrize("body", ["not json", "[1, 2]", "{}"])
+def test_malformed_body_is_rejected(client, body):
+    r = client.post("/api/analyze-answer", data=body, content_type="application/json")
+    assert r.status_code == 400 and r.get_json() == {"error": "No data provided"}
+
+
+def test_llm_failure_falls_back_to_the_local_score(client, monkeypatch):
+    async def failing(*args, **kwargs):
+        raise Exception("provider down")
+
+    monkeypatch.setattr(app_module, "call_llm_json_async", failing)
+    r = client.post("/api/analyze-answer", json=ANSWER)
+    assert r.status_code == 200
+    assert r.get_json()["scoredBy"] == "local" and 0 <= r.get_json()["score"] <= 10
+
+
+@pytest.fixture
+def local_scores(monkeypatch):
+    """Record each call to the local answer scorer"""
+    calls = []
+    score = app_module.score_answer_local
+
+    def recording(*args):
+        calls.append(args)
+        return score(*args)
+
+    monkeypatch.setattr(app_module, "score_answer_local", recording)
+    return calls
+
+
+def test_llm_score_skips_the_local_scorer(client, monkeypatch, local_scores):
+    async def scored(*args, **kwargs):
+        return answer_result()
+
+    monkeypatch.setattr(app_module, "call_llm_json_async", scored)
+    r = client.post("/api/analyze-answer", json=ANSWER)
+    assert r.get_json()["scoredBy"] == "llm" and r.get_json()["score"] == 7
+    assert local_scores == []
+
+
+def test_local_mode_scores_without_the_llm(client, monkeypatch, local_scores):
+    async def unexpected(*args, **kwargs):
+        raise AssertionError("called the LLM")
+
+    monkeypatch.setattr(app_module, "call_llm_json_async", unexpected)
+    r = client.post("/api/analyze-answer", json={**ANSWER, "mode": "local"})
+    assert r.get_json()["scoredBy"] == "local" and len(local_scores) == 1
@@ -0,0 +1,46 @@
+# backend/tests/test_async_runtime.py
+# asyncRuntime: sync callers share one background loop, and must not call in
+# from a coroutine already running on a loop.
+
+import asyncio
+import threading
+
+import pytest
+
+from asyncRuntime import get_loop, run_sync, iterate_sync
+
+
+async def loop_thread():
+    await asyncio.sleep(0)
+    return threading.current_thread().name
+
+
+def test_run_sync_runs_every_call_on_the_one_background_loop():
+    assert run_sync(loop_thread()) == run_sync(loop_thread()) == "llm-event-loop"
+    assert get_loop() is get_loop()
+
+
+def test_run_sync_from_a_running_loop_is_refused():
+    async def nested():
+        run_sync(loop_thread())
+
+    with pytest.raises(RuntimeError, match="await the coroutine instead"):
+        asyncio.run(nested())
+
+
+def test_iterate_sync_drives_an_async_generator_and_closes_it():
+    closed = []
+
+    async def count():
+        try:
+            for i in range(3):
+                await asyncio.sleep(0)
+                yield i
+        finally:
+            closed.append(True)
+
+    items = iterate_sync(count())
+    assert next(items) == 0
+    items.close()
+    assert closed == [True]
+    assert list(iterate_sync(count())) == [0, 1, 2]
@@ -0,0 +1,40 @@
+# backend/tests/test_chunk_answers.py
+# Packing of batch-analyze-answers input into per-prompt chunks.
+
+from app import chunk_answers, answer_cost, BATCH_CHUNK_TOKENS, BATCH_CHUNK_MAX
+
+
+def answers(count, words=100):
+    return [{"questionId": i + 1, "question": f"Question {i + 1}?", "answer": "word " * words}
+            for i in range(count)]
+
+
+def test_every_answer_is_kept_once_in_order():
+    batch = answers(17, words=40)
+    chunks = chunk_answers(batch)
+    assert [a for chunk in chunks for a in chunk] == batch
+
+
+def test_chunks_respect_the_token_budget_and_size_cap():
+    for words in (5, 60, 400):
+        for chunk in chunk_answers(answers(20, words)):
+            assert len(chunk) <= BATCH_CHUNK_MAX
+            assert len(chunk) == 1 or sum(map(answer_cost, chunk)) <= BATCH_CHUNK_TOKENS
+
+
+def test_short_answers_fill_a_chunk_up_to_the_size_cap():
+    assert [len(c) for c in chunk_answers(answers(BATCH_CHUNK_MAX + 1, words=5))] == [BATCH_CHUNK_MAX, 1]
+
+
+def test_budget_splits_before_the_size_cap():
+    assert [len(c) for c in chunk_answers(answers(4, words=100), budget=200, max_size=10)] == [2, 2]
+
+
+def test_an_answer_over_budget_gets_a_chunk_of_its_own():
+    huge = {"questionId": 1, "question": "Tell me everything.", "answer": "word " * 5000}
+    assert chunk_answers([huge, *answers(2, words=5)], budget=50) == [[huge], answers(2, words=5)]
+
+
+def test_missing_fields_cost_nothing():
+    assert answer_cost({}) == 0
+    assert chunk_answers([]) == []
@@ -0,0 +1,41 @@
+# backend/tests/test_gemini_pool.py
+# Gemini keep-alive transports against the stub server: one connection is
+# reused across calls, and pool_stats() reports it.
+
+import asyncio
+
+import pytest
+
+
+def test_sync_session_reuses_one_connection(gemini, stub):
+    for _ in range(5):
+        assert gemini.parse_gemini_json(gemini.call_gemini("prompt"))["primaryFocus"] == "Backend development"
+    assert stub.counters["connections"] == 1
+    stats = gemini.pool_stats()["sync"]
+    assert stats["requests"] == 5 and stats["connections"] == 1
+    assert stats["reused"] == 4 and stats["reuseRatio"] == 0.8
+
+
+def test_async_client_reuses_one_connection(gemini, stub):
+    async def calls():
+        for _ in range(5):
+            await gemini.call_gemini_async("prompt")
+        await gemini.get_async_client().aclose()
+
+    asyncio.run(calls())
+    assert stub.counters["connections"] == 1
+    stats = gemini.pool_stats()["async"]
+    assert stats["requests"] == 5 and stats["connections"] == 1 and stats["reused"] == 4
+
+
+def test_error_statuses_become_readable_errors(gemini, stub):
+    stub.error_rates = {429: 1.0}
+    with pytest.raises(Exception, match="Rate limit exceeded"):
+        gemini.call_gemini("prompt")
+
+
+def test_unreachable_api_is_a_connection_error(gemini, stub):
+    stub.shutdown()
+    stub.server_close()
+    with pytest.raises(Exception, match="Cannot connect to Gemini API"):
+        gemini.call_gemini("prompt")
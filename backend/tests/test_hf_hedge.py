@@ -0,0 +1,81 @@
+# backend/tests/test_hf_hedge.py
+# huggingfaceService.chat_completion_hedged against the stub server: a stalled
+# primary is raced by a hedge, the loser is cancelled, and errors surface.
+
+import asyncio
+from collections import deque
+
+import pytest
+
+from metrics import llm_hedges
+
+HEDGE_AFTER = 0.1
+
+
+@pytest.fixture
+def hedging(huggingface, monkeypatch):
+    """Enough recent latencies that the hedge fires after HEDGE_AFTER seconds"""
+    monkeypatch.setattr(huggingface, "latencies", deque([HEDGE_AFTER] * huggingface.HEDGE_MIN_SAMPLES, maxlen=200))
+    monkeypatch.setattr(huggingface, "HEDGE_MIN_DELAY", HEDGE_AFTER)
+    monkeypatch.setattr(huggingface, "hedge_counters", dict.fromkeys(huggingface.hedge_counters, 0))
+    return huggingface
+
+
+class TrackedClient:
+    """The real client, remembering the task behind each chat_completion call"""
+
+    def __init__(self, client):
+        self.client = client
+        self.tasks = []
+
+    async def chat_completion(self, **request):
+        self.tasks.append(asyncio.current_task())
+        return await self.client.chat_completion(**request)
+
+
+def hedged_call(hf):
+    async def call():
+        client = TrackedClient(hf.get_client())
+        try:
+            return await hf.chat_completion_hedged(client, True, model=hf.MODEL, max_tokens=64,
+                                                   messages=hf.build_messages("prompt")), client
+        except Exception as e:
+            return e, client
+
+    return asyncio.run(call())
+
+
+def test_stalled_primary_loses_to_the_hedge(hedging, stub):
+    delays = [1.0, 0.0]
+    stub.latency = lambda: delays.pop(0)
+    wins_before = llm_hedges.values().get(("huggingface", "hedge_won"), 0)
+    response, client = hedged_call(hedging)
+    assert response.choices[0].message.content == stub.reply
+    assert hedging.hedge_counters == {"requests": 1, "hedged": 1, "hedgeWins": 1, "skippedNoBudget": 0}
+    assert llm_hedges.values()[("huggingface", "hedge_won")] == wins_before + 1
+    # The stalled primary was cancelled, not left running in the background
+    primary, hedge = client.tasks
+    assert primary.cancelled() and not hedge.cancelled()
+
+
+def test_fast_primary_is_not_hedged(hedging, stub):
+    response, client = hedged_call(hedging)
+    assert response.choices[0].message.content == stub.reply
+    assert len(client.tasks) == 1 and hedging.hedge_counters["hedged"] == 0
+
+
+def test_both_failing_raises_the_first_error(hedging, stub):
+    delays = [0.3, 0.0]
+    stub.latency = lambda: delays.pop(0)
+    stub.error_rates = {503: 1.0}
+    error, client = hedged_call(hedging)
+    assert "503" in str(error)
+    assert len(client.tasks) == 2 and stub.counters["503"] == 2
+
+
+def test_no_hedge_without_a_free_rate_limit_token(hedging, stub, monkeypatch):
+    monkeypatch.setattr(hedging.rate_limiter, "try_acquire", lambda: False)
+    stub.latency = 2 * HEDGE_AFTER
+    response, client = hedged_call(hedging)
+    assert response.choices[0].message.content == stub.reply
+    assert len(client.tasks) == 1 and hedging.hedge_counters["skippedNoBudget"] == 1
@@ -0,0 +1,144 @@
+# backend/tests/test_jobs.py
+# Background jobs: the memory and SQLite stores, expiry, ?async=1 polling
+# through GET /api/jobs/<id>, and analyze-resume's deferred rewrite.
+
+import io
+import time
+import random
+import asyncio
+import threading
+
+import pytest
+
+import app as app_module
+from jobs import JobStore, SQLiteJobStore, JobError
+from rateLimiter import RateLimitExceeded
+from asyncRuntime import run_sync
+from stubServer import llm_reply, RESUME_REPLY
+from bench_resume_extract import make_docx
+
+INTERVIEW = {"jobTitle": "Backend Engineer", "experienceLevel": "mid-level", "interviewType": "technical",
+             "questionsCount": 3, "jobDescription": "We need Python, Django, PostgreSQL and Docker."}
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        return SQLiteJobStore(workers=2, ttl=60, path=str(tmp_path / "jobs.db"))
+    return JobStore(workers=2, ttl=60)
+
+
+@pytest.fixture
+def sqlite_jobs(tmp_path, monkeypatch):
+    """The app on a SQLite job store that notes which thread each write ran on"""
+    store = SQLiteJobStore(path=str(tmp_path / "jobs.db"))
+    save, store.write_threads = store._save, []
+
+    def recording_save(job_id, job):
+        store.write_threads.append(threading.current_thread().name)
+        save(job_id, job)
+
+    monkeypatch.setattr(store, "_save", recording_save)
+    monkeypatch.setattr(app_module, "job_store", store)
+    return store
+
+
+def wait_for(get, timeout=10):
+    """Poll `get()` until the job it returns has finished"""
+    deadline = time.monotonic() + timeout
+    while True:
+        job = get()
+        if job["status"] in ("done", "error") or time.monotonic() > deadline:
+            return job
+        time.sleep(0.02)
+
+
+async def answer(value):
+    await asyncio.sleep(0)
+    return value
+
+
+async def fail(error):
+    raise error
+
+
+def test_job_result_is_stored(store):
+    job_id = store.submit(answer({"ok": True}), kind="test")
+    job = wait_for(lambda: store.get(job_id))
+    assert job["status"] == "done" and job["result"] == {"ok": True}
+    assert job["id"] == job_id and job["kind"] == "test"
+
+
+@pytest.mark.parametrize("error, expected", [
+    (JobError("Missing required fields", 400), {"httpStatus": 400, "error": "Missing required fields"}),
+    (RateLimitExceeded("huggingface", 4.26), {"httpStatus": 429, "retryAfter": 4.3}),
+    (ValueError("boom"), {"httpStatus": 500, "error": "boom"}),
+])
+def test_job_errors_keep_their_status(store, error, expected):
+    job_id = store.submit(fail(error))
+    job = wait_for(lambda: store.get(job_id))
+    assert job["status"] == "error"
+    assert expected.items() <= job.items()
+
+
+def test_submit_async_from_the_loop(store):
+    async def submit():
+        return await store.submit_async(answer(42))
+
+    job_id = run_sync(submit())
+    assert wait_for(lambda: store.get(job_id))["result"] == 42
+
+
+def test_sqlite_jobs_are_visible_to_every_worker(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    job_id = SQLiteJobStore(path=path).submit(answer("shared"))
+    other_worker = SQLiteJobStore(path=path)
+    assert wait_for(lambda: other_worker.get(job_id))["result"] == "shared"
+    assert other_worker.stats()["done"] == 1
+
+
+def test_expired_jobs_are_hidden_then_purged(store):
+    job_id = store.submit(answer(1))
+    job = wait_for(lambda: store.get(job_id))
+    store._save(job_id, dict(job, updatedAt=time.time() - 61))
+    assert store.get(job_id) is None
+    assert store.cleanup() == 0              # at most once a minute...
+    assert store.cleanup(force=True) == 1    # ...unless forced
+    assert store._load(job_id) is None
+
+
+def test_async_query_returns_a_job_to_poll(huggingface, stub):
+    stub.reply = llm_reply
+    client = app_module.app.test_client()
+    r = client.post("/api/create-interview?async=1", json=INTERVIEW)
+    assert r.status_code == 202
+    body = r.get_json()
+    assert body["status"] == "pending" and body["statusUrl"] == f"/api/jobs/{body['jobId']}"
+    job = wait_for(lambda: client.get(body["statusUrl"]).get_json())
+    assert job["status"] == "done" and len(job["result"]["questions"]) == 3
+    assert job["kind"] == "/api/create-interview"
+
+
+def test_async_query_surfaces_the_route_error(huggingface, stub):
+    client = app_module.app.test_client()
+    job_id = client.post("/api/create-interview?async=1", json={"jobTitle": "x"}).get_json()["jobId"]
+    job = wait_for(lambda: client.get(f"/api/jobs/{job_id}").get_json())
+    assert job["status"] == "error" and job["httpStatus"] == 400
+    assert client.get("/api/jobs/unknown").status_code == 404
+
+
+def test_deferred_resume_rewrite_runs_as_a_job(huggingface, stub, sqlite_jobs):
+    stub.reply = llm_reply
+    client = app_module.app.test_client()
+    resume = io.BytesIO(make_docx(30, random.Random(7)))
+    r = client.post("/api/analyze-resume", content_type="multipart/form-data", data={
+        "resume": (resume, "resume.docx"), "mode": "deferred",
+        "jobDescription": "Backend engineer: Python, Kubernetes, Terraform.",
+    })
+    assert r.status_code == 200
+    result = r.get_json()
+    assert result["mode"] == "deferred" and result["improvedResume"] == ""
+    job = wait_for(lambda: client.get(f"/api/jobs/{result['improvedResumeJobId']}").get_json())
+    assert job["status"] == "done" and job["result"]["improvedResume"] == RESUME_REPLY
+    # Every SQLite write, including the one submit_async made from the handler, ran off the event loop
+    assert sqlite_jobs.write_threads and "llm-event-loop" not in sqlite_jobs.write_threads
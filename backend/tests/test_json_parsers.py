@@ -0,0 +1,50 @@
+# backend/tests/test_json_parsers.py
+# The JSON parsers on bench_json_parsers' corpus of model-shaped outputs
+# (clean, fenced, leading prose, truncated mid-string and mid-array, a
+# 20-answer batch). Every run checks what each parser recovers; with
+# `python -m pytest -m bench` each one is also timed and its allocations
+# counted, and the table is printed in the test summary.
+
+import pytest
+
+from jsonRepair import repair
+from bench_json_parsers import (
+    build_corpus, parsers, stream_items, try_call, ops_per_second, allocations, allocation_overhead,
+)
+
+CORPUS = {case: (text, key) for case, text, key in build_corpus()}
+RUNS = [(case, name) for case, (text, key) in CORPUS.items() for name, _ in parsers(text, key)]
+
+
+@pytest.mark.parametrize("case", CORPUS)
+def test_repair_recovers_every_case(case):
+    text, key = CORPUS[case]
+    result = repair(text)
+    assert result.value
+    assert result.complete == (not case.startswith("truncated"))
+    if key:
+        # The streaming parser yields exactly the array items repair keeps
+        assert stream_items(key)(text) == result.value[key]
+
+
+@pytest.mark.parametrize("case", ["clean", "batch of 20"])
+def test_legacy_baseline_agrees_on_clean_json(case):
+    runs = dict(parsers(*CORPUS[case]))
+    assert runs["legacy repair_json"](CORPUS[case][0]) == runs["repair"](CORPUS[case][0])
+
+
+@pytest.fixture(scope="module")
+def overhead():
+    return allocation_overhead()
+
+
+@pytest.mark.bench
+@pytest.mark.parametrize("case, name", RUNS, ids=[f"{case}-{name}" for case, name in RUNS])
+def test_parser_throughput_and_allocations(case, name, overhead, record_property):
+    text, key = CORPUS[case]
+    fn = dict(parsers(text, key))[name]
+    ops = ops_per_second(fn, text, repeat=3)
+    peak, blocks = allocations(fn, text)
+    record_property("bench", (case, name, len(text), ops, peak, max(0, blocks - overhead),
+                              bool(try_call(fn, text))))
+    assert ops > 0
@@ -0,0 +1,61 @@
+# backend/tests/test_json_repair.py
+# jsonRepair.repair on clean, wrapped and truncated model output, inline
+# and offloaded to a thread.
+
+import json
+import asyncio
+
+import pytest
+
+import jsonRepair
+from jsonRepair import repair, repair_async
+from stubServer import questions_reply, answer_result
+
+
+def test_clean_json_parses_without_repair():
+    result = repair(json.dumps(answer_result()))
+    assert result.value == answer_result()
+    assert result.complete and not result.repaired
+
+
+@pytest.mark.parametrize("text", [
+    '```json\n{"score": 7, "strengths": ["a", "b",]}\n```',
+    'Here is the analysis you asked for:\n{"score": 7, "strengths": ["a", "b"]} Hope it helps!',
+])
+def test_fences_prose_and_trailing_commas_are_removed(text):
+    result = repair(text)
+    assert result.value == {"score": 7, "strengths": ["a", "b"]}
+    assert result.complete and result.repaired
+
+
+def test_no_json_gives_empty_result():
+    result = repair("I cannot help with that.")
+    assert result.value is None and not result
+
+
+def test_truncated_mid_string_drops_the_unfinished_element():
+    text = questions_reply(3)
+    cut = text[:text.index("problem 3") + 4]
+    result = repair(cut)
+    assert [q["id"] for q in result.value["questions"]] == [1, 2]
+    assert result.repaired and not result.complete
+    assert result.cut_at is not None
+
+
+def test_truncated_inside_nested_array_drops_the_whole_element():
+    result = repair('{"results": [{"index": 1, "score": 7}, {"index": 2, "strengths": ["Concrete",')
+    assert result.value == {"results": [{"index": 1, "score": 7}]}
+
+
+def test_truncated_scalar_array_keeps_only_finished_values():
+    # "2" may be the start of "25", so it is not kept
+    assert repair('{"a": "x", "b": [1, 2').value == {"a": "x", "b": [1]}
+
+
+def test_repair_async_gives_the_same_result_inline_and_offloaded(monkeypatch):
+    text = questions_reply(3)[:-30]
+    inline = asyncio.run(repair_async(text))
+    monkeypatch.setattr(jsonRepair, "OFFLOAD_CHARS", 1)
+    offloaded = asyncio.run(repair_async(text))
+    assert offloaded.value == inline.value == repair(text).value
+    assert offloaded.cut_at == inline.cut_at
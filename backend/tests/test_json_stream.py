@@ -0,0 +1,73 @@
+# backend/tests/test_json_stream.py
+# jsonStream.ArrayItemStream on streamed model output, and the
+# create-interview Server-Sent Events route built on it.
+
+import json
+
+import pytest
+
+import app as app_module
+from jsonStream import ArrayItemStream
+from stubServer import questions_reply, llm_reply, STREAM_CHUNK_CHARS
+
+INTERVIEW = {"jobTitle": "Backend Engineer", "experienceLevel": "mid-level", "interviewType": "technical",
+             "questionsCount": 4,
+             "jobDescription": "We need Python, Django, PostgreSQL, Docker, Kubernetes and AWS. "
+                               "Strong communication and teamwork."}
+
+
+def feed_in_chunks(parser, text, size=STREAM_CHUNK_CHARS):
+    items = []
+    for i in range(0, len(text), size):
+        items.extend(parser.feed(text[i:i + size]))
+    return items
+
+
+def sse_events(body):
+    """[(event, data)] from a text/event-stream body"""
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line)
+        events.append((fields.get("event"), json.loads(fields["data"])))
+    return events
+
+
+def test_stream_yields_every_item_across_chunk_boundaries():
+    text = questions_reply(5)
+    parser = ArrayItemStream("questions")
+    assert feed_in_chunks(parser, text, size=7) == json.loads(text)["questions"]
+    assert parser.done
+
+
+def test_stream_cut_short_yields_only_complete_items():
+    text = questions_reply(3)
+    parser = ArrayItemStream("questions")
+    items = feed_in_chunks(parser, text[:text.index('"id": 3') + 10])
+    assert [q["id"] for q in items] == [1, 2]
+    assert not parser.done
+
+
+def test_stream_only_reads_the_top_level_key():
+    parser = ArrayItemStream("questions")
+    text = ('{"note": "the questions: [1]", "x": {"questions": [9]}, '
+            '"questions": [1, "a]", {"b": [2]}], "after": [3]}')
+    assert parser.feed(text) == [1, "a]", {"b": [2]}]
+    assert parser.done
+
+
+def test_create_interview_streams_skills_then_each_question(huggingface, stub):
+    stub.reply = llm_reply
+    r = app_module.app.test_client().post("/api/create-interview?stream=1", json=INTERVIEW)
+    assert r.status_code == 200 and r.mimetype == "text/event-stream"
+    events = sse_events(r.get_data(as_text=True))
+    names = [name for name, _ in events]
+    assert names == ["skills"] + ["question"] * 4 + ["done"]
+    assert events[-1][1]["questions"] == [data for name, data in events if name == "question"]
+    assert "Python" in events[0][1]["technicalSkills"]
+
+
+def test_create_interview_stream_reports_bad_input_as_an_event(huggingface, stub):
+    r = app_module.app.test_client().post("/api/create-interview?stream=1", json={"jobTitle": "x"})
+    [(name, data)] = sse_events(r.get_data(as_text=True))
+    assert name == "error" and "Missing required fields" in data["error"]
+    assert stub.counters["requests"] == 0
@@ -0,0 +1,169 @@
+# backend/tests/test_llm_router.py
+# LLMRouter failover and the per-provider circuit breaker, with scripted
+# providers and with the real Gemini client against the stub server.
+
+import json
+import asyncio
+
+import pytest
+
+import llmRouter
+from llmRouter import LLMRouter, Provider, CLOSED, OPEN, HALF_OPEN
+from jsonRepair import repair
+from rateLimiter import RateLimitExceeded
+
+
+def scripted(*outcomes):
+    """A provider complete() that plays back outcomes: an exception to raise, or reply text"""
+    calls = []
+
+    async def complete(prompt, fail_fast=True, **kwargs):
+        calls.append(fail_fast)
+        outcome = outcomes[min(len(calls), len(outcomes)) - 1]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome, repair(outcome)
+
+    complete.calls = calls
+    return complete
+
+
+def slow(delay, text):
+    """A provider complete() that answers `text` after `delay` seconds, noting cancellation"""
+    async def complete(prompt, fail_fast=True, **kwargs):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            complete.cancelled = True
+            raise
+        return text, repair(text)
+
+    complete.cancelled = False
+    return complete
+
+
+def route(router, prompt="prompt"):
+    return asyncio.run(router.complete(prompt))
+
+
+def test_fails_over_when_the_first_provider_errors():
+    primary = Provider("primary", scripted(Exception("503 Service Unavailable")))
+    backup = Provider("backup", scripted('{"ok": true}'))
+    text, result = route(LLMRouter([primary, backup], hedge_delay=0))
+    assert result.value == {"ok": True}
+    assert primary.outcomes[-1] is False and primary.consecutive_failures == 1
+    assert backup.outcomes[-1] is True
+    # Only the provider with someone behind it skips its retry sleeps
+    assert primary.complete.calls == [True] and backup.complete.calls == [False]
+
+
+def test_every_provider_failing_raises_the_last_error():
+    router = LLMRouter([Provider("a", scripted(Exception("a down"))),
+                        Provider("b", scripted(Exception("b down")))], hedge_delay=0)
+    with pytest.raises(Exception, match="b down"):
+        route(router)
+
+
+def test_unusable_json_fails_over_without_tripping_the_circuit():
+    rambling = Provider("rambling", scripted("Sorry, I can only answer in prose."))
+    backup = Provider("backup", scripted('{"ok": true}'))
+    _, result = route(LLMRouter([rambling, backup], hedge_delay=0))
+    assert result.value == {"ok": True}
+    assert rambling.consecutive_failures == 0 and rambling.state == CLOSED
+
+
+def test_unusable_json_everywhere_returns_the_last_answer():
+    router = LLMRouter([Provider("a", scripted("no json")), Provider("b", scripted("still none"))], hedge_delay=0)
+    text, result = route(router)
+    assert text == "still none" and not result
+
+
+def test_slow_primary_is_hedged_and_the_backup_wins_the_race():
+    primary = Provider("primary", slow(5, '{"from": "primary"}'))
+    backup = Provider("backup", slow(0, '{"from": "backup"}'))
+    router = LLMRouter([primary, backup], hedge_delay=0.05)
+    _, result = route(router)
+    assert result.value == {"from": "backup"}
+    assert router.hedges == 1 and backup.races_won == 1
+    # The loser is cancelled, and its time so far counts as a latency lower bound
+    assert primary.complete.cancelled
+    assert not primary.outcomes and primary.latencies[-1] >= 0.05
+
+
+def test_primary_inside_the_hedge_delay_is_not_raced():
+    primary = Provider("primary", slow(0, '{"from": "primary"}'))
+    backup = Provider("backup", scripted('{"from": "backup"}'))
+    router = LLMRouter([primary, backup], hedge_delay=5)
+    _, result = route(router)
+    assert result.value == {"from": "primary"}
+    assert router.hedges == 0 and backup.complete.calls == []
+
+
+def test_rate_limited_call_does_not_count_as_a_failure():
+    limited = Provider("limited", scripted(RateLimitExceeded("limited", 5)))
+    backup = Provider("backup", scripted('{"ok": true}'))
+    route(LLMRouter([limited, backup], hedge_delay=0))
+    assert not limited.outcomes and limited.state == CLOSED
+
+
+def test_circuit_opens_after_consecutive_failures_and_is_skipped():
+    flaky = Provider("flaky", scripted(Exception("down")))
+    backup = Provider("backup", scripted('{"ok": true}'))
+    router = LLMRouter([flaky, backup], hedge_delay=0)
+    for _ in range(llmRouter.CIRCUIT_FAILURES):
+        flaky.record(False)
+    assert flaky.state == OPEN
+    assert router.ranked() == [backup]
+    route(router)
+    assert flaky.complete.calls == []
+
+
+def test_no_provider_available_is_an_error():
+    only = Provider("only", scripted('{"ok": true}'))
+    for _ in range(llmRouter.CIRCUIT_FAILURES):
+        only.record(False)
+    with pytest.raises(Exception, match="circuit open"):
+        route(LLMRouter([only], hedge_delay=0))
+
+
+def test_half_open_trial_closes_the_circuit_on_success():
+    provider = Provider("recovering", scripted('{"ok": true}'))
+    for _ in range(llmRouter.CIRCUIT_FAILURES):
+        provider.record(False)
+    provider.opened_at -= llmRouter.CIRCUIT_COOLDOWN
+    assert provider.available() and provider.state == HALF_OPEN
+    assert not provider.available()   # one trial at a time
+    provider.release()
+    route(LLMRouter([provider], hedge_delay=0))
+    assert provider.state == CLOSED and provider.consecutive_failures == 0
+
+
+def test_half_open_trial_failure_reopens_the_circuit():
+    provider = Provider("still-down", scripted(Exception("down")))
+    for _ in range(llmRouter.CIRCUIT_FAILURES):
+        provider.record(False)
+    provider.opened_at -= llmRouter.CIRCUIT_COOLDOWN
+    with pytest.raises(Exception, match="down"):
+        route(LLMRouter([provider], hedge_delay=0))
+    assert provider.state == OPEN and not provider.available()
+
+
+def test_gemini_answers_through_the_router(gemini, stub):
+    router = LLMRouter([Provider("gemini", gemini.complete_gemini_async)], hedge_delay=0)
+    _, result = route(router)
+    assert result.value == json.loads(stub.reply)
+    assert stub.counters["requests"] == 1
+
+
+def test_gemini_503_fails_over_and_the_backup_is_ranked_first(gemini, stub):
+    stub.error_rates = {503: 1.0}
+    primary = Provider("gemini", gemini.complete_gemini_async)
+    backup = Provider("backup", scripted('{"ok": true}'))
+    router = LLMRouter([primary, backup], hedge_delay=0)
+    _, result = route(router)
+    assert result.value == {"ok": True}
+    assert stub.counters["503"] == 1 and primary.consecutive_failures == 1
+    # The error rate now outweighs the untried latency, so the next call skips Gemini
+    assert router.ranked() == [backup, primary]
+    route(router)
+    assert stub.counters["requests"] == 1
@@ -0,0 +1,70 @@
+# backend/tests/test_metrics.py
+# GET /metrics through the Flask test client: counters and histograms keep
+# the updates of threads that have exited, in the Prometheus text format.
+
+import gc
+import threading
+
+import pytest
+
+import app as app_module
+from metrics import Counter, Histogram, registry, CONTENT_TYPE
+
+
+@pytest.fixture
+def series():
+    """A counter and a histogram registered for this test only"""
+    counter = Counter("prepmate_test_events_total", "Test events.", ("kind",))
+    histogram = Histogram("prepmate_test_duration_seconds", "Test durations.", ("kind",), buckets=(0.1, 1))
+    yield counter, histogram
+    registry.remove(counter)
+    registry.remove(histogram)
+
+
+def scrape():
+    r = app_module.app.test_client().get("/metrics")
+    assert r.status_code == 200 and r.headers["Content-Type"] == CONTENT_TYPE
+    return r.get_data(as_text=True).splitlines()
+
+
+def test_scrape_includes_updates_from_retired_threads(series):
+    counter, histogram = series
+
+    def work(value):
+        counter.inc("job")
+        histogram.observe(value, "job")
+
+    threads = [threading.Thread(target=work, args=(value,)) for value in (0.05, 0.5, 5)]
+    for thread in threads:
+        thread.start()
+        thread.join()
+    del threads, thread
+    gc.collect()
+    # Each exited thread's shard was folded into the retired totals and dropped
+    assert not counter._shards and not histogram._shards
+    counter.inc("job", amount=2)     # plus a live shard on this thread
+
+    lines = scrape()
+    assert "# TYPE prepmate_test_events_total counter" in lines
+    assert 'prepmate_test_events_total{kind="job"} 5' in lines
+    assert "# TYPE prepmate_test_duration_seconds histogram" in lines
+    assert lines[lines.index("# TYPE prepmate_test_duration_seconds histogram") + 1:][:5] == [
+        'prepmate_test_duration_seconds_bucket{kind="job",le="0.1"} 1',
+        'prepmate_test_duration_seconds_bucket{kind="job",le="1"} 2',
+        'prepmate_test_duration_seconds_bucket{kind="job",le="+Inf"} 3',
+        'prepmate_test_duration_seconds_sum{kind="job"} 5.55',
+        'prepmate_test_duration_seconds_count{kind="job"} 3',
+    ]
+
+
+def test_requests_are_timed_by_route():
+    client = app_module.app.test_client()
+    client.get("/api/health")
+    count = [line for line in scrape()
+             if line.startswith('prepmate_http_request_duration_seconds_count{route="/api/health",method="GET"')]
+    assert len(count) == 1 and int(count[0].rsplit(" ", 1)[1]) >= 1
+
+
+def test_metrics_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(app_module, "METRICS", False)
+    assert app_module.app.test_client().get("/metrics").status_code == 404
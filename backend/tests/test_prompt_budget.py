@@ -0,0 +1,104 @@
+# backend/tests/test_prompt_budget.py
+# promptBudget: splitting an input budget across fields, and fitting text
+# into its share at and around the limits.
+
+import pytest
+
+from promptBudget import (
+    allocate, fit, fit_fields, truncate, compact, estimate_tokens, input_budget, output_budget, BUDGETS,
+)
+
+SKILLS = ["python", "kafka", "kubernetes", "postgres", "terraform", "react", "graphql", "spark"]
+
+
+def resume(sections=8, lines=6):
+    """One section per skill, each a heading plus bullet lines naming it"""
+    out = []
+    for i in range(sections):
+        skill = SKILLS[i % len(SKILLS)]
+        out.append(f"Project {i + 1}")
+        out += [f"- Built {skill} services for team {i} and cut latency by {j + 10}% in production."
+                for j in range(lines)]
+        out.append("")
+    return "\n".join(out)
+
+
+def test_allocate_splits_evenly_when_every_input_is_large():
+    assert allocate([500, 500], 300) == [150, 150]
+    assert allocate([500, 500], 300, [2, 1]) == [200, 100]
+
+
+def test_allocate_gives_small_inputs_what_they_need_and_the_rest_to_others():
+    assert allocate([40, 900], 300) == [40, 260]
+    assert allocate([40, 90, 900], 300, [1, 1, 1]) == [40, 90, 170]
+    assert allocate([10, 20], 300) == [10, 20]
+
+
+def test_allocate_never_exceeds_the_total():
+    for costs, weights in [([333, 333, 333], [1, 2, 3]), ([7, 1000, 1000], [5, 1, 1])]:
+        assert sum(allocate(costs, 301, weights)) <= 301
+
+
+def test_text_within_budget_is_only_compacted():
+    text = "Page 1 of 2\n•  Python   and Kafka\n\n\n\nWe are an equal opportunity employer."
+    assert fit(text, 100) == compact(text) == "- Python and Kafka"
+
+
+@pytest.mark.parametrize("budget", [25, 60, 120, 240])
+def test_fit_stays_within_the_budget(budget):
+    text = resume()
+    fitted = fit(text, budget)
+    assert estimate_tokens(fitted) <= budget
+    # Kept lines are whole lines of the original (only the last one may be cut)
+    assert all(line in text for line in fitted.split("\n")[:-1])
+
+
+def test_fit_keeps_the_blocks_matching_the_query_in_document_order():
+    text = resume(lines=4)
+    fitted = fit(text, 150, query="terraform graphql")
+    assert fitted.split("\n")[::5] == ["Project 5", "Project 7"]
+    assert "python" not in fitted and fitted.count("terraform") == fitted.count("graphql") == 4
+    # Leftover budget goes to the earliest block, still in document order
+    roomier = fit(text, 180, query="terraform graphql")
+    assert roomier.startswith("Project 1\n- Built python") and roomier.endswith(fitted)
+
+
+def test_zero_budget_gives_empty_text():
+    assert fit(resume(), 0) == ""
+    assert truncate("one two three", 0) == ""
+
+
+def test_truncate_cuts_between_words_at_the_limit():
+    assert truncate("alpha beta gamma delta", 2) == "alpha beta"
+    assert truncate("alpha, beta", 2) == "alpha,"
+    assert truncate("alpha beta", 100) == "alpha beta"
+    assert estimate_tokens(truncate(resume(), 50)) <= 50
+
+
+def test_fit_fields_shares_the_endpoint_budget():
+    fields = {"resume": resume(), "jobDescription": "Python, Kafka and Terraform engineer."}
+    fitted = fit_fields("analyze_resume", fields, {"resume": 3, "jobDescription": 1})
+    assert fitted["jobDescription"] == fields["jobDescription"]
+    assert estimate_tokens(fitted["resume"]) + estimate_tokens(fitted["jobDescription"]) <= BUDGETS[
+        "analyze_resume"]["input"]
+
+
+def test_fit_fields_uses_the_given_fitter():
+    calls = []
+
+    def fitter(text, budget, query=None, compacted=False):
+        calls.append((budget, query, compacted))
+        return text[:10]
+
+    fitted = fit_fields("analyze_answer", {"answer": resume()}, queries={"answer": "kafka"}, budget=40,
+                        fitters={"answer": fitter})
+    assert calls == [(40, "kafka", True)] and len(fitted["answer"]) == 10
+
+
+def test_budgets_and_env_overrides(monkeypatch):
+    assert input_budget("analyze_answer") == BUDGETS["analyze_answer"]["input"]
+    monkeypatch.setenv("PROMPT_TOKENS_ANALYZE_ANSWER", "123")
+    assert input_budget("analyze_answer") == 123
+    batch = BUDGETS["batch_analyze"]
+    assert output_budget("batch_analyze", 2) == batch["output"] + 2 * batch["per_item"]
+    assert output_budget("batch_analyze", 1000) == batch["max_output"]
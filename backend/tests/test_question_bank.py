@@ -0,0 +1,74 @@
+# backend/tests/test_question_bank.py
+# QuestionBank: validation on add, BM25 retrieval and the filters on search.
+
+import pytest
+
+import questionBank
+from questionBank import QuestionBank
+
+PARAMS = {"interview_type": "technical", "experience_level": "mid-level", "job_title": "Backend Engineer",
+          "questions_count": 6}
+SKILLS = {"technicalSkills": ["Python", "PostgreSQL", "Kubernetes"]}
+
+QUESTIONS = [
+    {"question": "How would you tune a slow PostgreSQL query?", "focusArea": "PostgreSQL", "difficulty": "Medium"},
+    {"question": "How do Kubernetes readiness probes differ from liveness probes?", "focusArea": "Kubernetes",
+     "difficulty": "Hard"},
+    {"question": "When would you reach for a Python generator?", "focusArea": "Python", "difficulty": "Easy"},
+]
+
+
+@pytest.fixture
+def bank(tmp_path):
+    return QuestionBank(path=str(tmp_path / "questions.db"), min_score=0.1)
+
+
+def test_add_stores_valid_questions_once(bank):
+    assert bank.add(QUESTIONS, PARAMS, SKILLS) == 3
+    assert bank.add(QUESTIONS, PARAMS, SKILLS) == 0
+    assert bank.stats()["stored"] == 3
+
+
+@pytest.mark.parametrize("bad", [
+    None, "How?", {"question": "How?"}, {"question": "  ", "focusArea": "Python", "difficulty": "Easy"},
+    {"question": 42, "focusArea": "Python", "difficulty": "Easy"},
+    {"question": "How?", "focusArea": ["Python"], "difficulty": "Easy"},
+])
+def test_add_skips_malformed_questions(bank, bad):
+    assert bank.add([bad], PARAMS, SKILLS) == 0
+
+
+def test_add_skips_malformed_params_and_skills(bank):
+    assert bank.add(QUESTIONS, {**PARAMS, "job_title": None}, SKILLS) == 0
+    assert bank.add(QUESTIONS, {**PARAMS, "interview_type": 3}, SKILLS) == 0
+    assert bank.add(QUESTIONS[:1], PARAMS, {"technicalSkills": ["Python", None, 7]}) == 1
+    assert bank.add(QUESTIONS[1:2], PARAMS, {"technicalSkills": "Python"}) == 1
+
+
+def test_search_ranks_by_the_requested_skills(bank):
+    bank.add(QUESTIONS, PARAMS, {"technicalSkills": []})
+    found = bank.search({"technicalSkills": ["PostgreSQL"]}, PARAMS, limit=1)
+    assert found == [{"question": QUESTIONS[0]["question"], "difficulty": "Medium", "focusArea": "PostgreSQL"}]
+
+
+def test_search_filters_by_level_type_and_difficulty(bank):
+    bank.add(QUESTIONS, PARAMS, SKILLS)
+    assert bank.search(SKILLS, {**PARAMS, "experience_level": "senior"}, limit=5) == []
+    assert bank.search(SKILLS, {**PARAMS, "interview_type": "behavioral"}, limit=5) == []
+    assert len(bank.search(SKILLS, {**PARAMS, "interview_type": "mixed"}, limit=5)) == 3
+    easy = bank.search(SKILLS, {**PARAMS, "difficulty": "easy"}, limit=5)
+    assert [q["focusArea"] for q in easy] == ["Python"]
+
+
+def test_search_sees_questions_added_by_another_worker(bank):
+    other = QuestionBank(path=bank.path, min_score=0.1)
+    assert bank.search(SKILLS, PARAMS, limit=5) == []
+    other.add(QUESTIONS, PARAMS, SKILLS)
+    assert len(bank.search(SKILLS, PARAMS, limit=5)) == 3
+
+
+def test_take_serves_at_most_the_configured_share(bank, monkeypatch):
+    bank.add(QUESTIONS, PARAMS, SKILLS)
+    monkeypatch.setattr(questionBank, "BANK_MAX_SHARE", 0.5)
+    assert len(bank.take(SKILLS, {**PARAMS, "questions_count": 4})) == 2
+    assert bank.take(SKILLS, {**PARAMS, "questions_count": 1}) == []
@@ -0,0 +1,67 @@
+# backend/tests/test_rate_limiter.py
+# Token bucket: burst, spacing, deadline rejection and the shared file backend.
+
+import pytest
+
+import rateLimiter
+from rateLimiter import TokenBucket, FileTokenBucket, RateLimitExceeded
+
+
+class Clock:
+    """Stands in for time.time so refills are deterministic"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rateLimiter.time, "time", clock)
+    return clock
+
+
+def test_burst_passes_then_calls_are_spaced_at_the_rate(clock):
+    bucket = TokenBucket("test", rate=2, burst=3, deadline=10)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # Each queued caller waits one more interval than the one ahead of it
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_tokens_refill_over_time_up_to_the_burst(clock):
+    bucket = TokenBucket("test", rate=1, burst=2, deadline=0)
+    bucket.reserve()
+    bucket.reserve()
+    assert not bucket.try_acquire()
+    clock.now += 1
+    assert bucket.try_acquire()
+    clock.now += 60
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+
+def test_wait_past_the_deadline_is_rejected_with_retry_after(clock):
+    bucket = TokenBucket("Gemini", rate=0.25, burst=1, deadline=1)
+    bucket.reserve()
+    with pytest.raises(RateLimitExceeded) as info:
+        bucket.reserve()
+    assert info.value.retry_after == pytest.approx(4.0)
+    assert "Gemini" in str(info.value)
+    # A rejected call does not take a slot, and a per-call deadline overrides the default
+    assert bucket.reserve(deadline=5) == pytest.approx(4.0)
+
+
+@pytest.mark.skipif(rateLimiter.fcntl is None, reason="file backend needs fcntl")
+def test_file_buckets_share_one_budget(clock, tmp_path):
+    path = str(tmp_path / "bucket.json")
+    first = FileTokenBucket("test", rate=1, burst=2, deadline=0, path=path)
+    second = FileTokenBucket("test", rate=1, burst=2, deadline=0, path=path)
+    assert first.try_acquire()
+    assert second.try_acquire()
+    assert not first.try_acquire() and not second.try_acquire()
+    clock.now += 1
+    assert second.try_acquire()
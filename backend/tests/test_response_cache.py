@@ -0,0 +1,122 @@
+# backend/tests/test_response_cache.py
+# responseCache: LRU eviction and expiry, the SQLite tier shared across
+# processes, and the providers caching only complete JSON.
+
+import os
+import sys
+import json
+import time
+import asyncio
+import subprocess
+
+import pytest
+
+from responseCache import ResponseCache, SQLiteResponseCache, make_key
+from stubServer import answer_result
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = ResponseCache(max_entries=2, name="test")
+    cache.set("a", "1", 60)
+    cache.set("b", "2", 60)
+    assert cache.get("a") == "1"      # a is now more recent than b
+    cache.set("c", "3", 60)
+    assert cache.get("b") is None
+    assert cache.get("a") == "1" and cache.get("c") == "3"
+    assert cache.stats()["evictions"] == 1 and cache.stats()["entries"] == 2
+
+
+def test_entries_expire_and_zero_ttl_is_not_stored():
+    cache = ResponseCache(name="test")
+    cache.set("short", "v", 0.05)
+    cache.set("never", "v", 0)
+    assert cache.get("short") == "v" and cache.get("never") is None
+    time.sleep(0.1)
+    assert cache.get("short") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_key_covers_every_completion_input():
+    base = make_key("model", "system", "prompt", 256, 0.7)
+    assert base == make_key("model", "system", "prompt", 256, 0.7)
+    assert len({base, make_key("other", "system", "prompt", 256, 0.7), make_key("model", "system", "prompt", 512, 0.7),
+                make_key("model", "system", "prompt!", 256, 0.7), make_key("model", "system", "prompt", 256, 0.2)}) == 5
+
+
+def test_sqlite_tier_prunes_the_least_recently_used_rows(tmp_path):
+    cache = SQLiteResponseCache(max_entries=1, path=str(tmp_path / "llm.db"), max_rows=2, name="test")
+    cache.set("a", "1", 60)
+    cache.set("b", "2", 60)
+    assert cache.get("a") == "1"      # from disk (the memory tier only holds b), which refreshes last_used
+    cache.set("c", "3", 60)
+    fresh = SQLiteResponseCache(path=cache.path, name="test")
+    assert fresh.get("b") is None and fresh.get("a") == "1" and fresh.get("c") == "3"
+
+
+def test_sqlite_entries_are_shared_across_processes(tmp_path):
+    path = str(tmp_path / "llm.db")
+    SQLiteResponseCache(path=path, name="test").set("from-parent", "parent value", 60)
+    script = (
+        "import sys; from responseCache import SQLiteResponseCache\n"
+        "cache = SQLiteResponseCache(path=sys.argv[1], name='test')\n"
+        "print(cache.get('from-parent'))\n"
+        "cache.set('from-child', 'child value', 60)\n"
+    )
+    out = subprocess.run([sys.executable, "-c", script, path], cwd=BACKEND, capture_output=True, text=True,
+                         check=True, timeout=60)
+    assert out.stdout.strip() == "parent value"
+    assert SQLiteResponseCache(path=path, name="test").get("from-child") == "child value"
+
+
+def test_expired_sqlite_rows_are_not_served(tmp_path):
+    path = str(tmp_path / "llm.db")
+    SQLiteResponseCache(path=path, name="test").set("k", "v", 0.05)
+    time.sleep(0.1)
+    assert SQLiteResponseCache(path=path, name="test").get("k") is None
+
+
+@pytest.fixture
+def hf_cache(huggingface, monkeypatch):
+    cache = ResponseCache(name="test")
+    monkeypatch.setattr(huggingface, "response_cache", cache)
+    return cache
+
+
+def complete(hf, **kwargs):
+    return asyncio.run(hf.complete_huggingface_async("prompt", retry_count=1, cache_endpoint="analyze_answer",
+                                                      **kwargs))
+
+
+def test_only_complete_json_is_cached(huggingface, hf_cache, stub):
+    stub.reply = json.dumps(answer_result())[:-20]
+    _, result = complete(huggingface)
+    assert not result.complete and hf_cache.stats()["entries"] == 0
+
+    stub.reply = json.dumps(answer_result())
+    complete(huggingface)
+    _, result = complete(huggingface)
+    assert result.value == answer_result() and hf_cache.stats()["hits"] == 1
+    assert stub.counters["requests"] == 2
+
+
+def test_plain_text_is_cached_unless_empty(huggingface, hf_cache, stub):
+    stub.reply = "   "
+    complete(huggingface, expect_json=False)
+    assert hf_cache.stats()["entries"] == 0
+    stub.reply = "An improved resume"
+    complete(huggingface, expect_json=False)
+    assert complete(huggingface, expect_json=False) == ("An improved resume", None)
+    assert stub.counters["requests"] == 2
+
+
+def test_gemini_caches_only_complete_json(gemini, stub, monkeypatch):
+    cache = ResponseCache(name="test")
+    monkeypatch.setattr(gemini, "response_cache", cache)
+    stub.reply = '{"score": 7, "feedback": ["cut'
+    asyncio.run(gemini.complete_gemini_async("prompt", cache_endpoint="analyze_answer"))
+    assert cache.stats()["entries"] == 0
+    stub.reply = '{"score": 7}'
+    asyncio.run(gemini.complete_gemini_async("prompt", cache_endpoint="analyze_answer"))
+    assert cache.stats()["entries"] == 1
@@ -0,0 +1,87 @@
+# backend/tests/test_resume_cache.py
+# resumeCache: text and analyses keyed by the file's hash, the TTL, and
+# analyze-resume caching only analyses the LLM actually reviewed.
+
+import io
+import time
+import random
+
+import pytest
+
+import app as app_module
+import resumeCache
+from resumeCache import ResumeCache, content_hash, read_resume
+from responseCache import ResponseCache
+from stubServer import llm_reply
+from bench_resume_extract import make_docx
+
+RESUME = make_docx(30, random.Random(18))
+JOB = "Backend engineer: Python, Kubernetes, Terraform."
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """A fresh in-memory resume cache, installed where the app and read_resume look for it"""
+    cache = ResumeCache(ResponseCache(16, name="resume-test"))
+    monkeypatch.setattr(resumeCache, "resume_cache", cache)
+    monkeypatch.setattr(app_module, "resume_cache", cache)
+    return cache
+
+
+def test_text_is_keyed_by_content_and_extension(cache, monkeypatch):
+    parsed = []
+    extract = resumeCache.extract_resume_text
+    monkeypatch.setattr(resumeCache, "extract_resume_text", lambda *args: parsed.append(args[1]) or extract(*args))
+
+    text, digest = read_resume(io.BytesIO(RESUME), "resume.docx")
+    assert digest == content_hash(RESUME) and text
+    # Same bytes under another name: no re-parse; another extension: a different parser
+    assert read_resume(io.BytesIO(RESUME), "copy.DOCX") == (text, digest)
+    read_resume(io.BytesIO(RESUME), "resume.txt")
+    assert parsed == ["resume.docx", "resume.txt"]
+    assert cache.counters["textHits"] == 1 and cache.counters["textMisses"] == 2
+
+
+def test_analysis_is_keyed_by_file_and_job_description(cache):
+    digest = content_hash(RESUME)
+    cache.set_analysis(digest, JOB, {"atsScore": 80})
+    assert cache.get_analysis(digest, f"  {JOB}\n") == {"atsScore": 80}
+    assert cache.get_analysis(digest, "Frontend engineer") is None
+    assert cache.get_analysis(content_hash(RESUME + b"x"), JOB) is None
+
+
+def test_entries_expire_after_the_ttl():
+    cache = ResumeCache(ResponseCache(16, name="resume-test"), ttl=0.05)
+    cache.set_text("abc", "resume.pdf", "text")
+    assert cache.get_text("abc", "resume.pdf") == "text"
+    time.sleep(0.1)
+    assert cache.get_text("abc", "resume.pdf") is None
+
+
+def analyze(client):
+    return client.post("/api/analyze-resume", content_type="multipart/form-data", data={
+        "resume": (io.BytesIO(RESUME), "resume.docx"), "jobDescription": JOB,
+    })
+
+
+def test_reviewed_analysis_is_cached(huggingface, stub, cache):
+    stub.reply = llm_reply
+    client = app_module.app.test_client()
+    first = analyze(client).get_json()
+    assert first["strengths"] and cache.get_analysis(content_hash(RESUME), JOB) is not None
+    requests = stub.counters["requests"]
+    second = analyze(client).get_json()
+    assert second["atsScore"] == first["atsScore"] and second["strengths"] == first["strengths"]
+    # Only the rewrite goes upstream again (and the response cache is off here)
+    assert stub.counters["requests"] == requests + 1
+
+
+def test_local_scores_without_a_review_are_not_cached(huggingface, stub, cache, monkeypatch):
+    async def unparseable(*args, **kwargs):
+        return None
+
+    stub.reply = llm_reply
+    monkeypatch.setattr(app_module, "call_llm_json_async", unparseable)
+    r = analyze(app_module.app.test_client())
+    assert r.status_code == 200 and r.get_json()["strengths"] == []
+    assert cache.get_analysis(content_hash(RESUME), JOB) is None
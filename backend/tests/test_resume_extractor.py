@@ -0,0 +1,96 @@
+# backend/tests/test_resume_extractor.py
+# resumeExtractor: small files parsed in-thread, the page and character
+# limits, the worker timeout, and PDFs split into page ranges.
+
+import time
+import random
+import multiprocessing
+
+import pytest
+
+import resumeExtractor
+from resumeExtractor import (
+    extract_text_from_pdf, extract_text_from_docx, extract_text_from_doc, extract_pdf_parallel,
+    run_isolated, pdf_reader, pdf_pages, take_text,
+)
+from bench_resume_extract import make_pdf, make_docx
+
+
+def pdf_text(data, pages):
+    """Reference text: the first `pages` pages read one by one"""
+    return take_text(pdf_pages(pdf_reader(data), 0, pages), 10 ** 9)
+
+
+@pytest.fixture
+def no_workers(monkeypatch):
+    """Fail the test if a worker process is started"""
+    def refuse():
+        raise AssertionError("started a worker process")
+
+    monkeypatch.setattr(resumeExtractor, "process_context", refuse)
+
+
+def test_small_files_are_parsed_in_thread(no_workers):
+    data = make_pdf(2, 20, random.Random(1))
+    assert extract_text_from_pdf(data) == pdf_text(data, 2)
+    text = extract_text_from_docx(make_docx(20, random.Random(1)))
+    assert text.count("\n") == 19
+
+
+def test_pages_past_max_pages_are_never_read(no_workers, monkeypatch):
+    monkeypatch.setattr(resumeExtractor, "MAX_PAGES", 3)
+    data = make_pdf(5, 20, random.Random(2))
+    assert extract_text_from_pdf(data) == pdf_text(data, 3)
+
+
+def test_text_stops_at_max_chars():
+    pdf = make_pdf(4, 40, random.Random(3))
+    assert extract_text_from_pdf(pdf, max_chars=500) == pdf_text(pdf, 4)[:500]
+    assert len(extract_text_from_docx(make_docx(400, random.Random(3)), max_chars=500)) == 500
+
+
+def test_large_files_are_parsed_in_a_worker(monkeypatch):
+    monkeypatch.setattr(resumeExtractor, "INLINE_MAX_BYTES", 0)
+    docx = make_docx(30, random.Random(4))
+    inline = resumeExtractor.read_docx(docx, 10 ** 9)
+    assert extract_text_from_docx(docx) == inline
+    pdf = make_pdf(3, 20, random.Random(4))
+    assert extract_text_from_pdf(pdf) == pdf_text(pdf, 3)
+
+
+def test_long_pdfs_are_split_into_page_ranges():
+    data = make_pdf(12, 20, random.Random(5))
+    assert extract_text_from_pdf(data) == pdf_text(data, 12)
+    assert extract_pdf_parallel(data, 12, workers=4, first=5) == take_text(pdf_pages(pdf_reader(data), 5, 12))
+
+
+def test_parallel_read_stops_once_the_leading_pages_fill_max_chars():
+    data = make_pdf(12, 40, random.Random(6))
+    assert extract_pdf_parallel(data, 12, max_chars=300, workers=3) == pdf_text(data, 12)[:300]
+
+
+def test_slow_inline_read_hands_the_remaining_pages_to_workers(monkeypatch):
+    monkeypatch.setattr(resumeExtractor, "INLINE_SECONDS", 0)
+    data = make_pdf(4, 20, random.Random(7))
+    assert extract_text_from_pdf(data) == pdf_text(data, 4)
+
+
+def test_worker_is_killed_at_the_timeout():
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        run_isolated(time.sleep, 30, timeout=0.5)
+    assert time.monotonic() - start < 5
+    assert not multiprocessing.active_children()
+
+
+def test_doc_timeout_gives_no_text(monkeypatch):
+    def timed_out(*args, **kwargs):
+        raise TimeoutError("extraction timed out after 10s")
+
+    monkeypatch.setattr(resumeExtractor, "INLINE_MAX_BYTES", 0)
+    monkeypatch.setattr(resumeExtractor, "run_isolated", timed_out)
+    assert extract_text_from_doc(b"Jane Doe\nBackend engineer") is None
+
+
+def test_legacy_doc_falls_back_to_its_raw_text(no_workers):
+    assert extract_text_from_doc(b"Jane Doe\nBackend engineer") == "Jane Doe\nBackend engineer"
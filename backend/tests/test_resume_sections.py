@@ -0,0 +1,81 @@
+# backend/tests/test_resume_sections.py
+# resumeSections: headings and their variants, the contact block, and
+# fit_resume packing sections by weight and job-description overlap.
+
+from resumeSections import heading_of, segment, fit_resume
+from promptBudget import fit, estimate_tokens
+
+RESUME = """Jane Doe
+jane@example.com | +1 555 010 2000
+
+PROFESSIONAL SUMMARY
+Backend engineer with six years of Python and Kafka experience.
+
+E X P E R I E N C E
+Senior Engineer, Acme (2021-Present)
+- Led the migration of billing services to Kubernetes, cutting costs 30%.
+- Built Kafka pipelines processing 2M events per day.
+Engineer, Initech (2018-2021)
+- Maintained Django services and PostgreSQL schemas for the payments team.
+
+Skills & Tools:
+Python, Kafka, Kubernetes, Terraform, PostgreSQL
+
+OPEN SOURCE
+Maintainer of a small Terraform provider.
+
+Education
+B.Sc. Computer Science, State University
+
+Hobbies and Interests
+Chess, climbing, amateur astronomy and long-distance cycling.
+
+References
+Available on request."""
+
+
+def test_headings_and_their_variants():
+    assert heading_of("WORK EXPERIENCE") == "experience"
+    assert heading_of("E X P E R I E N C E") == "experience"
+    assert heading_of("Skills & Tools:") == "skills"
+    assert heading_of("Hobbies and Interests") == "interests"
+    assert heading_of("Senior Engineer, Acme (2021-Present)") is None
+    assert heading_of("x" * 41) is None
+
+
+def test_segment_splits_at_headings_in_document_order():
+    sections = segment(RESUME)
+    assert [s["section"] for s in sections] == [
+        "contact", "summary", "experience", "skills", "other", "education", "interests", "references"]
+    assert sections[0]["lines"] == ["Jane Doe", "jane@example.com | +1 555 010 2000"]
+    assert sections[3]["heading"] == "Skills & Tools"
+    assert sections[4]["heading"] == "OPEN SOURCE"
+
+
+def test_text_without_headings_has_no_sections():
+    assert segment("Just a paragraph about me.\nAnd another line.") == []
+
+
+def test_resume_within_budget_is_unchanged():
+    assert fit_resume(RESUME, 1000) == fit(RESUME, 1000)
+
+
+def test_fit_resume_keeps_sections_in_order_and_drops_references():
+    fitted = fit_resume(RESUME, 110, query="Kubernetes Kafka Terraform engineer")
+    assert estimate_tokens(fitted) <= 110
+    headings = [line for line in fitted.split("\n") if line in (
+        "PROFESSIONAL SUMMARY", "E X P E R I E N C E", "Skills & Tools", "Education", "References")]
+    assert headings[:3] == ["PROFESSIONAL SUMMARY", "E X P E R I E N C E", "Skills & Tools"]
+    assert "References" not in headings and "Available on request." not in fitted
+    assert "Kubernetes" in fitted and "Python, Kafka, Kubernetes, Terraform, PostgreSQL" in fitted
+
+
+def test_a_tight_budget_goes_to_the_heaviest_sections():
+    fitted = fit_resume(RESUME, 90)
+    assert [block.split("\n")[0] for block in fitted.split("\n\n")] == ["E X P E R I E N C E", "Skills & Tools"]
+    assert "Jane Doe" not in fitted and "cycling" not in fitted
+
+
+def test_unstructured_text_falls_back_to_fit():
+    text = " ".join(["Python Kafka engineer building services."] * 60)
+    assert fit_resume(text, 50, query="kafka") == fit(text, 50, query="kafka")
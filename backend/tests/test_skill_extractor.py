@@ -0,0 +1,41 @@
+# backend/tests/test_skill_extractor.py
+# Local skill matching: whole-word aliases and the confidence cut-off.
+
+from skillExtractor import matcher, extract_skills_local, SkillMatcher
+
+
+def names(text):
+    return [payload[1] for _, _, payload in matcher.find(text)]
+
+
+def test_aliases_only_match_whole_words():
+    assert names("JavaScript and Java, then C++") == ["JavaScript", "Java", "C++"]
+
+
+def test_aliases_map_to_one_canonical_name():
+    assert names("golang, React.js and react") == ["Go", "React", "React"]
+
+
+def test_short_exact_aliases_are_case_sensitive():
+    assert names("we go to Go meetups") == ["Go"]
+
+
+def test_longest_match_wins_at_the_same_position():
+    found = SkillMatcher({"machine": "short", "machine learning": "long"}).find("Machine learning models")
+    assert [payload for _, _, payload in found] == ["long"]
+
+
+def test_detailed_job_description_is_matched_locally():
+    skills = extract_skills_local(
+        "Backend Engineer",
+        "We need Python, Django, PostgreSQL, Docker, Kubernetes and AWS. "
+        "Strong communication and teamwork. Python is used everywhere.",
+        "Senior",
+    )
+    assert skills["technicalSkills"] == ["Python", "Django", "PostgreSQL", "Docker", "Kubernetes", "AWS"]
+    assert skills["softSkills"] == ["Communication", "Teamwork"]
+    assert skills["primaryFocus"] and 0 < len(skills["requiredCompetencies"]) <= 4
+
+
+def test_vague_job_description_falls_back_to_the_llm():
+    assert extract_skills_local("Manager", "Help the team do great things.") is None